@@ -1,4 +1,7 @@
 import unittest
+
+from Money import Money
+
 # Red Phase
 
 class TestAdvancedPaymentOptions(unittest.TestCase):
@@ -25,12 +28,11 @@ class PaymentProcessor1:
 # Refactor Phase
 class PaymentProcessor2:
     def split_payment(self, total, split):
-        if split <= 0:
-            raise ValueError("Split must be greater than zero")
-        share = total / split
-        return [share] * split
+        # Exact shares in cents that add up to the total; leftover cents go to the first shares.
+        return Money.from_amount(total).split(split)
 
     def gift_card_payment(self, total, gift_card_balance):
+        total, gift_card_balance = Money.from_amount(total), Money.from_amount(gift_card_balance)
         if gift_card_balance < total:
             raise ValueError("Insufficient gift card balance")
         return gift_card_balance - total
\ No newline at end of file
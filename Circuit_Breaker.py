@@ -0,0 +1,281 @@
+import asyncio
+import math
+import threading
+import time
+from collections import deque
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised instead of making a call while the circuit breaker is open.
+    """
+    pass
+
+
+# CircuitBreaker Class
+class CircuitBreaker:
+    """
+    Guards calls to a remote service, failing fast while the service is failing or slow.
+
+    The breaker keeps a rolling window of the most recent calls. A call fails if it raises or takes
+    longer than the current timeout, which is derived from the p99 latency of recent successful
+    calls. When at least min_calls calls are in the window and the failure rate reaches
+    failure_rate_threshold, the breaker opens and rejects calls with CircuitOpenError for
+    open_seconds. It then turns half-open and lets half_open_probes trial calls through, held to the
+    same timeout: if they all succeed it closes again, and if any fails it reopens.
+
+    A call cut off by the timeout may still have taken effect at the remote end. Because the timeout
+    tracks the p99 latency, a small share of calls hits it even while the service is healthy, so for
+    calls that must not be repeated, such as charges, a TimeoutError means the outcome is unknown,
+    not that the call failed. Such calls should carry an idempotency key and be retried with it, as
+    PaymentProcessing does.
+
+    Attributes:
+        state (str): "closed", "open" or "half_open".
+        calls (int): Calls made through the breaker.
+        failures (int): Calls that raised or were too slow.
+        timeouts (int): Failures caused by slowness.
+        rejected (int): Calls refused while the breaker was open.
+        opened (int): Times the breaker has opened.
+    """
+    def __init__(self, window=200, min_calls=20, failure_rate_threshold=0.5, open_seconds=5.0, half_open_probes=3,
+                 timeout_multiplier=2.0, min_timeout=0.05, max_timeout=5.0, clock=time.monotonic):
+        """
+        Initializes a closed CircuitBreaker.
+
+        Args:
+            window (int): How many recent calls the failure rate and latency percentiles are computed over.
+            min_calls (int): Calls needed in the window before the breaker can open.
+            failure_rate_threshold (float): The failure rate, from 0 to 1, at which the breaker opens.
+            open_seconds (float): Seconds to reject calls before probing.
+            half_open_probes (int): Trial calls that must succeed to close the breaker.
+            timeout_multiplier (float): The timeout is this multiple of the p99 latency.
+            min_timeout (float): The shortest timeout, in seconds.
+            max_timeout (float): The longest timeout, in seconds, used until there are min_calls successes.
+            clock (callable): Returns the current time in seconds; injectable for tests.
+
+        Raises:
+            ValueError: If a setting is out of range.
+        """
+        if window <= 0 or min_calls <= 0 or half_open_probes <= 0:
+            raise ValueError("Window, minimum calls and half-open probes must be greater than 0.")
+        if not 0 < failure_rate_threshold <= 1:
+            raise ValueError("Failure rate threshold must be between 0 and 1.")
+        if not 0 < min_timeout <= max_timeout:
+            raise ValueError("Timeouts must be greater than 0, with min_timeout no greater than max_timeout.")
+        self.window = window
+        self.min_calls = min_calls
+        self.failure_rate_threshold = failure_rate_threshold
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+        self.timeout_multiplier = timeout_multiplier
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._outcomes = deque(maxlen=window)  # True for each recent success, False for each failure.
+        self._latencies = deque(maxlen=window)  # Seconds taken by each recent success.
+        self._failures_in_window = 0
+        self._sorted_latencies = None
+        self._opened_at = None
+        self._probes_started = 0
+        self._probes_succeeded = 0
+        self.state = CLOSED
+        self.calls = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.rejected = 0
+        self.opened = 0
+
+    @property
+    def timeout(self):
+        """
+        float: Seconds a call may take: timeout_multiplier times the recent p99 latency, within
+        [min_timeout, max_timeout].
+        """
+        with self._lock:
+            return self._timeout()
+
+    def call(self, function, *args, pass_timeout=False, **kwargs):
+        """
+        Calls function through the breaker, timing it. The breaker cannot interrupt a blocking call,
+        so a call that returns after the timeout still returns its result, but counts as a failure.
+        With pass_timeout, function is given the timeout this call was admitted with, so it can give
+        up itself; a TimeoutError it raises counts as a timeout.
+
+        Args:
+            function (callable): The call to guard.
+            *args: Positional arguments for function.
+            pass_timeout (bool): Pass the timeout to function as its timeout keyword argument.
+            **kwargs: Keyword arguments for function.
+
+        Returns:
+            Whatever function returns.
+
+        Raises:
+            CircuitOpenError: If the breaker is open.
+        """
+        timeout = self._admit()
+        if pass_timeout:
+            kwargs["timeout"] = timeout
+        start = self._clock()
+        try:
+            result = function(*args, **kwargs)
+        except BaseException as error:
+            timed_out = isinstance(error, (TimeoutError, asyncio.TimeoutError))
+            self._record(False, self._clock() - start, timed_out=timed_out)
+            raise
+        elapsed = self._clock() - start
+        self._record(elapsed <= timeout, elapsed, timed_out=elapsed > timeout)
+        return result
+
+    async def call_async(self, function, *args, **kwargs):
+        """
+        Awaits function(*args, **kwargs) through the breaker, cancelling it after the timeout.
+
+        Args:
+            function (callable): Returns the awaitable to guard.
+            *args: Positional arguments for function.
+            **kwargs: Keyword arguments for function.
+
+        Returns:
+            Whatever the awaitable returns.
+
+        Raises:
+            CircuitOpenError: If the breaker is open.
+            TimeoutError: If the call takes longer than the timeout.
+        """
+        timeout = self._admit()
+        start = self._clock()
+        try:
+            result = await asyncio.wait_for(function(*args, **kwargs), timeout)
+        except asyncio.TimeoutError:
+            self._record(False, self._clock() - start, timed_out=True)
+            raise TimeoutError(f"Call did not complete within {timeout:.3f} seconds.") from None
+        except BaseException:
+            self._record(False, self._clock() - start, timed_out=False)
+            raise
+        self._record(True, self._clock() - start, timed_out=False)
+        return result
+
+    def percentile(self, fraction):
+        """
+        Returns a percentile of the latency of recent successful calls.
+
+        Args:
+            fraction (float): The percentile as a fraction, e.g. 0.99 for p99.
+
+        Returns:
+            float: The latency in seconds, or None if there have been no successful calls.
+        """
+        with self._lock:
+            return self._percentile(fraction)
+
+    def stats(self):
+        """
+        Report the breaker's state and counters, for metrics scraping.
+
+        Returns:
+            dict: The state, the call, failure, timeout, rejection and opening counts, the failure rate
+                and latency percentiles over the window, and the current timeout.
+        """
+        with self._lock:
+            self._refresh_state()
+            return {"state": self.state, "calls": self.calls, "failures": self.failures, "timeouts": self.timeouts,
+                    "rejected": self.rejected, "opened": self.opened, "failure_rate": self._failure_rate(),
+                    "p50": self._percentile(0.50), "p95": self._percentile(0.95), "p99": self._percentile(0.99),
+                    "timeout": self._timeout()}
+
+    def _admit(self):
+        """
+        Lets a call through or raises CircuitOpenError, returning the timeout the call must meet.
+        """
+        with self._lock:
+            self._refresh_state()
+            if self.state == OPEN or (self.state == HALF_OPEN and self._probes_started >= self.half_open_probes):
+                self.rejected += 1
+                retry_in = max(0.0, self._opened_at + self.open_seconds - self._clock())
+                raise CircuitOpenError(f"Payment gateway is unavailable; try again in {retry_in:.1f} seconds.")
+            self.calls += 1
+            if self.state == HALF_OPEN:
+                self._probes_started += 1
+            return self._timeout()
+
+    def _record(self, success, elapsed, timed_out):
+        """
+        Adds a finished call to the window and moves between states.
+        """
+        with self._lock:
+            if not success:
+                self.failures += 1
+                self.timeouts += timed_out
+            if self.state == HALF_OPEN:
+                if not success:
+                    self._open()
+                    return
+                self._probes_succeeded += 1
+                self._latencies.append(elapsed)
+                self._sorted_latencies = None
+                if self._probes_succeeded >= self.half_open_probes:
+                    self.state = CLOSED
+                    self._outcomes.clear()
+                    self._failures_in_window = 0
+                return
+            if self.state == OPEN:
+                return  # A call admitted before the breaker opened; its outcome is stale.
+            if len(self._outcomes) == self._outcomes.maxlen and not self._outcomes[0]:
+                self._failures_in_window -= 1
+            self._outcomes.append(success)
+            if success:
+                self._latencies.append(elapsed)
+                self._sorted_latencies = None
+            else:
+                self._failures_in_window += 1
+                if len(self._outcomes) >= self.min_calls and self._failure_rate() >= self.failure_rate_threshold:
+                    self._open()
+
+    def _open(self):
+        """
+        Opens the breaker.
+        """
+        self.state = OPEN
+        self.opened += 1
+        self._opened_at = self._clock()
+
+    def _refresh_state(self):
+        """
+        Turns an open breaker half-open once open_seconds have passed.
+        """
+        if self.state == OPEN and self._clock() - self._opened_at >= self.open_seconds:
+            self.state = HALF_OPEN
+            self._probes_started = 0
+            self._probes_succeeded = 0
+
+    def _failure_rate(self):
+        """
+        Returns the fraction of calls in the window that failed.
+        """
+        return self._failures_in_window / len(self._outcomes) if self._outcomes else 0.0
+
+    def _percentile(self, fraction):
+        """
+        Returns a nearest-rank latency percentile, sorting the window only after it has changed.
+        """
+        if not self._latencies:
+            return None
+        if self._sorted_latencies is None:
+            self._sorted_latencies = sorted(self._latencies)
+        ranked = self._sorted_latencies
+        return ranked[min(len(ranked) - 1, max(0, math.ceil(fraction * len(ranked)) - 1))]
+
+    def _timeout(self):
+        """
+        Derives the timeout from the p99 latency, or returns max_timeout while there is too little data.
+        """
+        if len(self._latencies) < self.min_calls:
+            return self.max_timeout
+        return min(self.max_timeout, max(self.min_timeout, self._percentile(0.99) * self.timeout_multiplier))
@@ -0,0 +1,456 @@
+from array import array
+import heapq
+
+from Geospatial_Restaurant_Search import GeoGridIndex, validate_coordinates
+from Restaurant_Browsing import Vocabulary
+from Restaurant_Name_Search import RestaurantTextIndex
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; predicates fall back to plain Python loops.
+    np = None
+
+
+class DictionaryColumn:
+    """
+    A dictionary-encoded text column: each distinct value is stored once and rows hold small integer codes.
+
+    Attributes:
+        values (list): The distinct values, indexed by code.
+        codes (array): The per-row codes.
+    """
+
+    def __init__(self, typecode):
+        """
+        Initialize an empty column.
+
+        Args:
+            typecode (str): The array typecode used for the codes (e.g. 'H' for up to 65536 values).
+        """
+        self.values = []
+        self.codes = array(typecode)
+        self._code_of = {}
+        self._codes_by_key = {}
+        self._max_code = 2 ** (8 * self.codes.itemsize) - 1
+
+    def encode(self, value):
+        """
+        Return the code of a value, assigning a new one if it has not been seen before.
+
+        Raises:
+            ValueError: If the column has run out of codes.
+        """
+        code = self._code_of.get(value)
+        if code is None:
+            code = len(self.values)
+            if code > self._max_code:
+                raise ValueError(f"Too many distinct values for column: {value}")
+            self.values.append(value)
+            self._code_of[value] = code
+            self._codes_by_key.setdefault(value.casefold(), []).append(code)
+        return code
+
+    def codes_matching(self, value):
+        """
+        Return the codes of every stored value equal to `value` ignoring case.
+        """
+        return self._codes_by_key.get(value.casefold(), [])
+
+
+class ColumnarRestaurantDatabase:
+    """
+    An in-memory restaurant database that stores each field in its own compact column.
+
+    Ratings live in an array('d'), cuisine, location and price range are dictionary-encoded into
+    small integer codes, and delivery and liveness are bitmaps. A restaurant's id is its row
+    position. When NumPy is installed, `find` evaluates predicates as vectorized masks over the
+    column buffers without copying them. The public interface mirrors RestaurantDatabase, so it
+    can be passed to RestaurantBrowsing unchanged.
+
+    Attributes:
+        names (list): The restaurant names, indexed by id.
+        ratings (array): The restaurant ratings, indexed by id.
+        cuisines (DictionaryColumn): The dictionary-encoded cuisines.
+        locations (DictionaryColumn): The dictionary-encoded locations.
+        price_ranges (DictionaryColumn): The dictionary-encoded price ranges.
+        cuisine_vocabulary (Vocabulary): The distinct live cuisines with restaurant counts.
+        location_vocabulary (Vocabulary): The distinct live locations with restaurant counts.
+        geo_index (GeoGridIndex): Positions of the restaurants that have "latitude" and "longitude" fields.
+        text_index (RestaurantTextIndex): Trigram and prefix indexes over names and "menu" item names.
+        version (int): A generation counter incremented by every insert, update and delete.
+    """
+
+    COLUMNS = ("name", "cuisine", "location", "rating", "price_range", "delivery")
+
+    def __init__(self, restaurants=()):
+        """
+        Initialize the database and load the given restaurants.
+
+        Args:
+            restaurants (iterable, optional): Restaurant dictionaries to load.
+        """
+        self.names = []
+        self.ratings = array('d')
+        self.cuisines = DictionaryColumn('H')
+        self.locations = DictionaryColumn('I')
+        self.price_ranges = DictionaryColumn('H')
+        self._delivery = bytearray()
+        self._live = bytearray()
+        self._extras = {}
+        self._size = 0
+        self._live_count = 0
+        self.version = 0
+        self.cuisine_vocabulary = Vocabulary()
+        self.location_vocabulary = Vocabulary()
+        self.geo_index = GeoGridIndex()
+        self.text_index = RestaurantTextIndex()
+        for restaurant in restaurants:
+            self.add_restaurant(restaurant)
+
+    def __len__(self):
+        """
+        Return the number of live restaurants.
+        """
+        return self._live_count
+
+    @property
+    def restaurants(self):
+        """
+        list: A snapshot of all restaurant rows in insertion order.
+        """
+        return self.get_restaurants()
+
+    def get_restaurants(self):
+        """
+        Materialize every live restaurant as a dictionary.
+
+        Returns:
+            list: A list of dictionaries, where each dictionary contains restaurant information.
+        """
+        return self._rows([restaurant_id for restaurant_id in range(self._size) if self._is_live(restaurant_id)])
+
+    def get_restaurant(self, restaurant_id):
+        """
+        Materialize a single restaurant by its id.
+
+        Raises:
+            KeyError: If no live restaurant has the given id.
+        """
+        if not (0 <= restaurant_id < self._size and self._is_live(restaurant_id)):
+            raise KeyError(restaurant_id)
+        return self._row(restaurant_id)
+
+    def add_restaurant(self, restaurant):
+        """
+        Append a restaurant to every column.
+
+        Args:
+            restaurant (dict): The restaurant fields (name, cuisine, location, rating, price_range, delivery).
+
+        Returns:
+            int: The id assigned to the new restaurant.
+
+        Raises:
+            ValueError: If a column field is missing or has the wrong type, or the coordinates are invalid.
+        """
+        # Everything that can fail runs before the first column is appended, so the columns stay aligned.
+        _check_row(restaurant)
+        has_location = restaurant.get('latitude') is not None and restaurant.get('longitude') is not None
+        if has_location:
+            validate_coordinates(restaurant['latitude'], restaurant['longitude'])
+        cuisine = self.cuisines.encode(restaurant['cuisine'])
+        location = self.locations.encode(restaurant['location'])
+        price_range = self.price_ranges.encode(restaurant['price_range'])
+        restaurant_id = self._size
+        if has_location:
+            self.geo_index.insert(restaurant_id, restaurant['latitude'], restaurant['longitude'])
+        if restaurant_id % 8 == 0:
+            self._delivery.append(0)
+            self._live.append(0)
+        self.names.append(restaurant['name'])
+        self.ratings.append(restaurant['rating'])
+        self.cuisines.codes.append(cuisine)
+        self.locations.codes.append(location)
+        self.price_ranges.codes.append(price_range)
+        _set_bit(self._delivery, restaurant_id, restaurant['delivery'])
+        _set_bit(self._live, restaurant_id, True)
+        extras = {key: value for key, value in restaurant.items() if key not in self.COLUMNS and key != "id"}
+        if extras:
+            self._extras[restaurant_id] = extras
+        self.cuisine_vocabulary.add(restaurant['cuisine'])
+        self.location_vocabulary.add(restaurant['location'])
+        self.text_index.add(restaurant_id, restaurant['name'], restaurant.get('menu', ()))
+        self._size += 1
+        self._live_count += 1
+        self.version += 1
+        return restaurant_id
+
+    def update_restaurant(self, restaurant_id, **fields):
+        """
+        Overwrite fields of an existing restaurant in place.
+
+        Returns:
+            dict: The updated restaurant row.
+
+        Raises:
+            KeyError: If no live restaurant has the given id.
+            ValueError: If an attempt is made to change the restaurant id, a column field gets the wrong
+                        type, or the coordinates are invalid.
+        """
+        row = self.get_restaurant(restaurant_id)
+        if "id" in fields and fields["id"] != restaurant_id:
+            raise ValueError("Restaurant id cannot be changed.")
+        _check_row(dict(row, **fields))
+        latitude = fields.get('latitude', row.get('latitude'))
+        longitude = fields.get('longitude', row.get('longitude'))
+        has_location = latitude is not None and longitude is not None
+        if has_location:
+            validate_coordinates(latitude, longitude)
+        codes = {key: column.encode(fields[key])
+                 for key, column in (("cuisine", self.cuisines), ("location", self.locations),
+                                     ("price_range", self.price_ranges)) if key in fields}
+        if "latitude" in fields or "longitude" in fields:
+            if has_location:
+                self.geo_index.insert(restaurant_id, latitude, longitude)
+            else:
+                self.geo_index.remove(restaurant_id)
+        for key, value in fields.items():
+            if key == "name":
+                self.names[restaurant_id] = value
+            elif key == "rating":
+                self.ratings[restaurant_id] = value
+            elif key == "cuisine":
+                self.cuisine_vocabulary.discard(self.cuisines.values[self.cuisines.codes[restaurant_id]])
+                self.cuisine_vocabulary.add(value)
+                self.cuisines.codes[restaurant_id] = codes[key]
+            elif key == "location":
+                self.location_vocabulary.discard(self.locations.values[self.locations.codes[restaurant_id]])
+                self.location_vocabulary.add(value)
+                self.locations.codes[restaurant_id] = codes[key]
+            elif key == "price_range":
+                self.price_ranges.codes[restaurant_id] = codes[key]
+            elif key == "delivery":
+                _set_bit(self._delivery, restaurant_id, value)
+            elif key != "id":
+                self._extras.setdefault(restaurant_id, {})[key] = value
+        if "name" in fields or "menu" in fields:
+            self.text_index.add(restaurant_id, self.names[restaurant_id], fields.get('menu', row.get('menu', ())))
+        self.version += 1
+        return self._row(restaurant_id)
+
+    def remove_restaurant(self, restaurant_id):
+        """
+        Delete a restaurant by clearing its liveness bit; the column slots are not reused.
+
+        Returns:
+            dict: The removed restaurant row.
+
+        Raises:
+            KeyError: If no live restaurant has the given id.
+        """
+        row = self.get_restaurant(restaurant_id)
+        _set_bit(self._live, restaurant_id, False)
+        self._extras.pop(restaurant_id, None)
+        self.geo_index.remove(restaurant_id)
+        self.text_index.remove(restaurant_id)
+        self.cuisine_vocabulary.discard(row['cuisine'])
+        self.location_vocabulary.discard(row['location'])
+        self._live_count -= 1
+        self.version += 1
+        return row
+
+    def facets(self):
+        """
+        Report the distinct cuisines and locations with their restaurant counts.
+
+        Returns:
+            dict: {"cuisine": {cuisine: count}, "location": {location: count}}.
+        """
+        return {"cuisine": self.cuisine_vocabulary.facets(), "location": self.location_vocabulary.facets()}
+
+    def find(self, cuisine=None, location=None, min_rating=None, max_rating=None, near=None, radius_km=None):
+        """
+        Answer a conjunctive query by combining one boolean mask per predicate.
+
+        Args:
+            cuisine (str, optional): The cuisine to match, case-insensitively.
+            location (str, optional): The location to match, case-insensitively.
+            min_rating (float, optional): The minimum acceptable rating.
+            max_rating (float, optional): The maximum acceptable rating.
+            near (tuple, optional): A (latitude, longitude) pair to search around.
+            radius_km (float, optional): The search radius around `near`.
+
+        Returns:
+            list: The matching restaurants in insertion order.
+        """
+        return self._rows(self._matching_ids(cuisine, location, min_rating, max_rating, near, radius_km))
+
+    def iter_find(self, cuisine=None, location=None, min_rating=None, max_rating=None, near=None, radius_km=None):
+        """
+        Lazily decode the restaurants matching a conjunctive query, one row at a time.
+
+        Returns:
+            iterator: The matching restaurants in insertion order.
+        """
+        for restaurant_id in self._matching_ids(cuisine, location, min_rating, max_rating, near, radius_km):
+            yield self._row(int(restaurant_id))
+
+    def nearest(self, latitude, longitude, k, cuisine=None, location=None, min_rating=None, max_distance_km=None):
+        """
+        Find the k restaurants closest to a location that also satisfy the other predicates.
+
+        Returns:
+            list: (distance_km, restaurant) pairs, closest first.
+        """
+        accept = None
+        if cuisine is not None or location is not None or min_rating is not None:
+            accept = set(int(restaurant_id) for restaurant_id in
+                         self._matching_ids(cuisine, location, min_rating, None)).__contains__
+        return [(distance, self._row(restaurant_id))
+                for distance, restaurant_id in self.geo_index.nearest(latitude, longitude, k, accept=accept,
+                                                                      max_distance_km=max_distance_km)]
+
+    def top_rated(self, limit, cuisine=None, location=None):
+        """
+        Return the highest rated restaurants matching the optional cuisine and location.
+
+        Returns:
+            list: Up to `limit` restaurants, highest rating first; ties favour the newest restaurant.
+        """
+        ids = self._matching_ids(cuisine, location, None, None)
+        if np is not None and len(ids):
+            ratings = np.frombuffer(self.ratings, dtype=np.float64)[ids]
+            if len(ids) > limit:
+                threshold = np.partition(ratings, len(ratings) - limit)[len(ratings) - limit]
+                keep = ratings >= threshold
+                ids, ratings = ids[keep], ratings[keep]
+            ids = ids[np.lexsort((-ids, -ratings))[:limit]]
+        else:
+            ids = heapq.nlargest(limit, ids, key=lambda restaurant_id: (self.ratings[restaurant_id], restaurant_id))
+        return self._rows(ids)
+
+    def count_by_rating(self, min_rating=None, max_rating=None):
+        """
+        Count live restaurants within an inclusive rating range.
+        """
+        return len(self._matching_ids(None, None, min_rating, max_rating))
+
+    def _matching_ids(self, cuisine, location, min_rating, max_rating, near=None, radius_km=None):
+        """
+        Evaluate the predicates over the columns and return the matching ids in ascending order.
+        """
+        predicates = []
+        for column, value in ((self.cuisines, cuisine), (self.locations, location)):
+            if value is not None:
+                predicates.append((column.codes, column.codes_matching(value)))
+        nearby = None
+        if near is not None:
+            nearby = [restaurant_id for _, restaurant_id in self.geo_index.within_radius(near[0], near[1], radius_km)]
+        if np is None:
+            return self._matching_ids_python(predicates, min_rating, max_rating, nearby)
+
+        size = self._size
+        mask = np.unpackbits(np.frombuffer(self._live, dtype=np.uint8), count=size, bitorder='little').view(bool)
+        for codes, wanted in predicates:
+            mask &= np.isin(np.frombuffer(codes, dtype=_NUMPY_CODE_TYPES[codes.typecode]), wanted)
+        if min_rating is not None or max_rating is not None:
+            ratings = np.frombuffer(self.ratings, dtype=np.float64)
+            if min_rating is not None:
+                mask &= ratings >= min_rating
+            if max_rating is not None:
+                mask &= ratings <= max_rating
+        if nearby is not None:
+            near_mask = np.zeros(size, dtype=bool)
+            near_mask[nearby] = True
+            mask &= near_mask
+        return np.flatnonzero(mask)
+
+    def _matching_ids_python(self, predicates, min_rating, max_rating, nearby):
+        """
+        Fallback for `_matching_ids` when NumPy is unavailable.
+        """
+        if nearby is None:
+            ids = [restaurant_id for restaurant_id in range(self._size) if self._is_live(restaurant_id)]
+        else:
+            ids = sorted(nearby)
+        for codes, wanted in predicates:
+            wanted = set(wanted)
+            ids = [restaurant_id for restaurant_id in ids if codes[restaurant_id] in wanted]
+        if min_rating is not None:
+            ids = [restaurant_id for restaurant_id in ids if self.ratings[restaurant_id] >= min_rating]
+        if max_rating is not None:
+            ids = [restaurant_id for restaurant_id in ids if self.ratings[restaurant_id] <= max_rating]
+        return ids
+
+    def _is_live(self, restaurant_id):
+        """
+        Check the liveness bit of a row.
+        """
+        return _get_bit(self._live, restaurant_id)
+
+    def _row(self, restaurant_id):
+        """
+        Decode a row from the columns into a restaurant dictionary.
+        """
+        return self._rows([restaurant_id])[0]
+
+    def _rows(self, ids):
+        """
+        Decode many rows at once, hoisting the column lookups out of the loop.
+        """
+        if np is not None and isinstance(ids, np.ndarray):
+            ids = ids.tolist()
+        names, ratings, delivery, extras = self.names, self.ratings, self._delivery, self._extras
+        cuisine_values, cuisine_codes = self.cuisines.values, self.cuisines.codes
+        location_values, location_codes = self.locations.values, self.locations.codes
+        price_values, price_codes = self.price_ranges.values, self.price_ranges.codes
+        rows = []
+        for restaurant_id in ids:
+            row = {"name": names[restaurant_id],
+                   "cuisine": cuisine_values[cuisine_codes[restaurant_id]],
+                   "location": location_values[location_codes[restaurant_id]],
+                   "rating": ratings[restaurant_id],
+                   "price_range": price_values[price_codes[restaurant_id]],
+                   "delivery": bool(delivery[restaurant_id >> 3] & (1 << (restaurant_id & 7))),
+                   "id": restaurant_id}
+            if extras and restaurant_id in extras:
+                row.update(extras[restaurant_id])
+            rows.append(row)
+        return rows
+
+
+_NUMPY_CODE_TYPES = {'H': 'uint16', 'I': 'uint32'}
+
+
+def _check_row(row):
+    """
+    Reject a row that lacks a column field or holds a value of the wrong type for its column.
+    """
+    for field in ColumnarRestaurantDatabase.COLUMNS:
+        if field not in row:
+            raise ValueError(f"Missing required field: {field}")
+    for field in ('name', 'cuisine', 'location', 'price_range'):
+        if not isinstance(row[field], str):
+            raise ValueError(f"Invalid {field}: {row[field]!r}")
+    if isinstance(row['rating'], bool) or not isinstance(row['rating'], (int, float)):
+        raise ValueError(f"Invalid rating: {row['rating']!r}")
+    menu = row.get('menu', ())
+    if not isinstance(menu, (list, tuple)) or not all(isinstance(item, str) for item in menu):
+        raise ValueError(f"Invalid menu: {menu!r}")
+
+
+def _get_bit(bitmap, position):
+    """
+    Read one bit of a little-endian bitmap.
+    """
+    return bool(bitmap[position >> 3] & (1 << (position & 7)))
+
+
+def _set_bit(bitmap, position, value):
+    """
+    Write one bit of a little-endian bitmap.
+    """
+    if value:
+        bitmap[position >> 3] |= 1 << (position & 7)
+    else:
+        bitmap[position >> 3] &= ~(1 << (position & 7)) & 0xFF
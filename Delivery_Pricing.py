@@ -0,0 +1,194 @@
+import math
+import time
+from decimal import Decimal
+
+from Geospatial_Restaurant_Search import haversine_km, validate_coordinates
+from Money import Money
+
+# Distance bands as (up to km, fee); beyond the last band each extra kilometre costs EXTRA_FEE_PER_KM.
+DEFAULT_FEE_BANDS = ((2.0, Money(299)), (5.0, Money(499)), (8.0, Money(699)))
+EXTRA_FEE_PER_KM = Money(100)
+ROAD_FACTOR = 1.3  # Streets are longer than the straight line between two points.
+HANDOFF_MINUTES = 5
+MINUTES_PER_ACTIVE_ORDER = 1.5
+BUSY_ACTIVE_ORDERS = 10
+BUSY_SURCHARGE = Money(100)
+
+
+def default_hourly_conditions():
+    """
+    Builds the default fee multiplier and courier speed for each hour of the day.
+
+    Returns:
+        list: 24 (fee multiplier, speed in km/h) pairs, indexed by local hour.
+    """
+    conditions = []
+    for hour in range(24):
+        if 11 <= hour < 14 or 17 <= hour < 21:
+            conditions.append((Decimal("1.25"), 18.0))  # Lunch and dinner peaks: busy roads, scarce couriers.
+        elif hour >= 22 or hour < 6:
+            conditions.append((Decimal("1.10"), 30.0))  # Night: clear roads, few couriers.
+        else:
+            conditions.append((Decimal("1.00"), 24.0))
+    return conditions
+
+
+# DeliveryPricingEngine Class
+class DeliveryPricingEngine:
+    """
+    Quotes delivery fees and arrival estimates from distance, restaurant load and time of day.
+
+    Delivery addresses are grouped into square zones, and the clock into buckets of a few minutes.
+    The distance, banded fee, hourly multiplier and travel time depend only on (restaurant, zone,
+    time bucket), so they are computed once and memoized; later checkouts in the same zone and bucket
+    get them with a couple of dictionary lookups and add the restaurant's current load on top, so
+    load changes do not throw the memo away. Hourly fee multipliers and courier speeds are
+    precomputed into a table.
+    Distances are measured to the centre of the zone, so with the default zone size they are
+    accurate to about 350 metres.
+    """
+    def __init__(self, zone_size=0.005, bucket_minutes=15, fee_bands=DEFAULT_FEE_BANDS, max_distance_km=15.0,
+                 hourly_conditions=None, utc_offset_hours=0, clock=time.time):
+        """
+        Initializes a DeliveryPricingEngine.
+
+        Args:
+            zone_size (float): Side of a delivery zone, in degrees.
+            bucket_minutes (int): Length of a time bucket, in minutes.
+            fee_bands (tuple): (up to km, Money fee) pairs in increasing distance.
+            max_distance_km (float): The furthest road distance the engine will quote for.
+            hourly_conditions (list): 24 (fee multiplier, speed in km/h) pairs; defaults to default_hourly_conditions().
+            utc_offset_hours (float): Offset of the local time used for the hourly table.
+            clock (callable): Returns the current Unix time in seconds.
+
+        Raises:
+            ValueError: If a setting is out of range.
+        """
+        if zone_size <= 0 or bucket_minutes <= 0 or max_distance_km <= 0:
+            raise ValueError("Zone size, bucket length and maximum distance must be greater than 0.")
+        self.zone_size = zone_size
+        self.bucket_seconds = bucket_minutes * 60
+        self.fee_bands = tuple(fee_bands)
+        self.max_distance_km = max_distance_km
+        self.hourly_conditions = list(hourly_conditions or default_hourly_conditions())
+        if len(self.hourly_conditions) != 24:
+            raise ValueError("Hourly conditions must cover 24 hours.")
+        self.utc_offset_seconds = utc_offset_hours * 3600
+        self.clock = clock
+        self._restaurants = {}
+        self._loads = {}
+        self._quotes = {}
+        self.hits = 0
+        self.misses = 0
+
+    def add_restaurant(self, restaurant_id, latitude, longitude, prep_minutes=15):
+        """
+        Registers a restaurant's location and usual preparation time.
+
+        Args:
+            restaurant_id (int): The restaurant's ID.
+            latitude (float): The restaurant's latitude.
+            longitude (float): The restaurant's longitude.
+            prep_minutes (float): Minutes to prepare an order when the kitchen is idle.
+
+        Raises:
+            ValueError: If the coordinates are out of range.
+        """
+        validate_coordinates(latitude, longitude)
+        self._restaurants[restaurant_id] = (latitude, longitude, prep_minutes)
+        self._quotes.pop(restaurant_id, None)
+
+    def set_restaurant_load(self, restaurant_id, active_orders):
+        """
+        Records how many orders a restaurant is working on, which lengthens preparation and adds a surcharge when busy.
+
+        Args:
+            restaurant_id (int): The restaurant's ID.
+            active_orders (int): The number of orders in the kitchen.
+
+        Raises:
+            ValueError: If active_orders is negative.
+        """
+        if active_orders < 0:
+            raise ValueError("Active orders cannot be negative.")
+        self._loads[restaurant_id] = active_orders
+
+    def zone_of(self, latitude, longitude):
+        """
+        Returns the delivery zone containing a location.
+
+        Args:
+            latitude (float): The latitude.
+            longitude (float): The longitude.
+
+        Returns:
+            tuple: The (row, column) of the zone.
+        """
+        return math.floor(latitude / self.zone_size), math.floor(longitude / self.zone_size)
+
+    def quote(self, restaurant_id, latitude, longitude, when=None):
+        """
+        Quotes the delivery fee and arrival estimate for an order.
+
+        Args:
+            restaurant_id (int): The restaurant the order is from.
+            latitude (float): The delivery latitude.
+            longitude (float): The delivery longitude.
+            when (float): Unix time of the order; defaults to now.
+
+        Returns:
+            dict: "delivery_fee" (Money), "eta_minutes" (int), "distance_km" (float) and "zone" (tuple).
+
+        Raises:
+            ValueError: If the restaurant is unknown or the address is outside the delivery area.
+        """
+        bucket = int((self.clock() if when is None else when) // self.bucket_seconds)
+        zone = self.zone_of(latitude, longitude)
+        cached = self._quotes.get(restaurant_id)
+        if cached is None or cached[0] != bucket:
+            # Quotes from earlier buckets are never asked for again, so each restaurant keeps only the current one.
+            cached = (bucket, {})
+            self._quotes[restaurant_id] = cached
+        base = cached[1].get(zone)
+        if base is None:
+            self.misses += 1
+            base = self._compute_base(restaurant_id, zone, bucket)
+            cached[1][zone] = base
+        else:
+            self.hits += 1
+        fee, minutes, distance = base
+        if distance > self.max_distance_km:
+            raise ValueError("Delivery address is outside the delivery area.")
+        active_orders = self._loads.get(restaurant_id, 0)
+        if active_orders >= BUSY_ACTIVE_ORDERS:
+            fee = fee + BUSY_SURCHARGE
+        minutes += MINUTES_PER_ACTIVE_ORDER * active_orders
+        return {"delivery_fee": fee, "eta_minutes": math.ceil(minutes), "distance_km": distance, "zone": zone}
+
+    def _compute_base(self, restaurant_id, zone, bucket):
+        """
+        Works out the load-independent part of a quote for a restaurant, zone and time bucket: the fee
+        before any busy surcharge, the minutes for an idle kitchen, and the rounded road distance.
+        """
+        if restaurant_id not in self._restaurants:
+            raise ValueError(f"Unknown restaurant: {restaurant_id}")
+        latitude, longitude, prep_minutes = self._restaurants[restaurant_id]
+        center_latitude = (zone[0] + 0.5) * self.zone_size
+        center_longitude = (zone[1] + 0.5) * self.zone_size
+        distance = haversine_km(latitude, longitude, center_latitude, center_longitude) * ROAD_FACTOR
+
+        hour = int((bucket * self.bucket_seconds + self.utc_offset_seconds) // 3600) % 24
+        multiplier, speed_kmh = self.hourly_conditions[hour]
+        fee = self._distance_fee(distance).scale(multiplier)
+        minutes = prep_minutes + distance / speed_kmh * 60 + HANDOFF_MINUTES
+        return fee, minutes, round(distance, 3)
+
+    def _distance_fee(self, distance):
+        """
+        Looks up the base fee for a road distance in the distance bands.
+        """
+        for limit, fee in self.fee_bands:
+            if distance <= limit:
+                return fee
+        limit, fee = self.fee_bands[-1]
+        return fee + EXTRA_FEE_PER_KM * math.ceil(distance - limit)
@@ -1,4 +1,8 @@
+from bisect import bisect_left, bisect_right
+import operator
 import unittest
+
+from Search_Pagination import build_page, decode_cursor, select_page, validate_page_request
 # Red Phase
 
 class TestEnhancedSearchFilters(unittest.TestCase):
@@ -40,14 +44,188 @@ class RestaurantSearch1:
 class RestaurantSearch2:
     def __init__(self, restaurants):
         self.restaurants = restaurants
+        self.planner = SearchPlanner(restaurants)
+        self.last_plan = None
 
     def search(self, **filters):
-        results = self.restaurants
-        if 'cuisine' in filters:
-            results = [r for r in results if r.cuisine == filters['cuisine']]
-        if 'min_rating' in filters:
-            results = [r for r in results if r.rating >= filters['min_rating']]
-        if 'delivery_speed' in filters:
-            results = [r for r in results if r.delivery_speed == filters['delivery_speed']]
-        return results
+        # Filters are "<attr>" (equality), "min_<attr>" (>=) or "max_<attr>" (<=) on Restaurant attributes.
+        plan = self.planner.plan(filters)
+        self.last_plan = plan
+        return self.planner.execute(plan)
+
+    def explain(self, **filters):
+        return self.planner.plan(filters).describe()
+
+    def invalidate(self, *attributes):
+        # Call after editing a Restaurant in place or replacing rows in the list (restaurants[i] = ...).
+        self.planner.invalidate(*attributes)
+
+    # Streaming and keyset pagination: sort keys end with the row position so they are unique.
+    SORT_KEYS = {
+        "rating": lambda position, r: (-r.rating, position),
+        "name": lambda position, r: (r.name, position),
+        "delivery_speed": lambda position, r: (r.delivery_speed, position),
+    }
+    CURSOR_KEY_TYPES = {
+        "rating": ((int, float), int),
+        "name": (str, int),
+        "delivery_speed": (str, int),
+    }
+
+    def iter_search(self, **filters):
+        return (r for _, r in self.planner.iterate(self.planner.plan(filters)))
+
+    def search_page(self, limit=20, after=None, sort_by="rating", **filters):
+        validate_page_request(limit, sort_by, self.SORT_KEYS)
+        sort_key = self.SORT_KEYS[sort_by]
+
+        def key(pair):
+            return sort_key(*pair)
+
+        after_key = decode_cursor(after, sort_by, self.CURSOR_KEY_TYPES[sort_by]) if after else None
+        pairs, has_more = select_page(self.planner.iterate(self.planner.plan(filters)), key, limit, after_key)
+        page = build_page(pairs, has_more, key, sort_by)
+        page["results"] = [r for _, r in pairs]
+        return page
+
+
+# Optimize Phase
+class Predicate:
+    OPERATORS = {"eq": operator.eq, "min": operator.ge, "max": operator.le}
+
+    def __init__(self, attribute, kind, value):
+        self.attribute = attribute
+        self.kind = kind
+        self.value = value
+        self.estimate = None
+
+    @classmethod
+    def from_filter(cls, key, value):
+        for kind in ("min", "max"):
+            if key.startswith(kind + "_"):
+                return cls(key[len(kind) + 1:], kind, value)
+        return cls(key, "eq", value)
+
+    def __repr__(self):
+        symbol = {"eq": "==", "min": ">=", "max": "<="}[self.kind]
+        return f"{self.attribute} {symbol} {self.value!r}"
+
+
+class SearchPlan:
+    def __init__(self, access, predicates, total):
+        self.access = access          # "scan", "index" or "range": how the first predicate is answered
+        self.predicates = predicates  # most selective first; all are checked, fused in one pass
+        self.total = total
+
+    def describe(self):
+        if not self.predicates:
+            return [f"scan {self.total} rows"]
+        first = self.predicates[0]
+        steps = [f"{self.access} {first} (~{first.estimate} of {self.total} rows)"]
+        if len(self.predicates) > 1:
+            steps.append("filter " + " and ".join(repr(p) for p in self.predicates[1:]))
+        return steps
+
+
+class SearchPlanner:
+    # Statistics per attribute are built lazily the first time a filter touches it:
+    # equality indexes (value -> row positions in input order) and sorted (value, position) histograms for ranges.
+    # They are dropped when rows are added or removed, and invalidate drops them after rows are edited in place
+    # or replaced, all of them or only those of the attributes that changed. Rows found through them are still
+    # checked against every predicate, so a row that no longer matches is never returned even if the
+    # statistics are stale; only an edited row that newly matches needs invalidate to be found.
+
+    # Above this fraction of the rows, a sequential scan is cheaper than an index or range lookup.
+    SCAN_FRACTION = 0.25
+
+    def __init__(self, restaurants):
+        self.restaurants = restaurants
+        self.invalidate()
+
+    def invalidate(self, *attributes):
+        if attributes:
+            for attribute in attributes:
+                self._indexes.pop(attribute, None)
+                self._histograms.pop(attribute, None)
+            return
+        self._indexes = {}
+        self._histograms = {}
+        self._row_count = len(self.restaurants)
+
+    def plan(self, filters):
+        if len(self.restaurants) != self._row_count:
+            self.invalidate()
+        predicates = [Predicate.from_filter(key, value) for key, value in filters.items()]
+        if self.restaurants:
+            for predicate in predicates:
+                if not hasattr(self.restaurants[0], predicate.attribute):
+                    raise ValueError(f"Unknown filter attribute: {predicate.attribute}")
+        for predicate in predicates:
+            predicate.estimate = self._estimate(predicate)
+        predicates.sort(key=lambda p: p.estimate)
+        access = "scan"
+        if predicates and predicates[0].estimate <= self.SCAN_FRACTION * len(self.restaurants):
+            access = "index" if predicates[0].kind == "eq" else "range"
+        return SearchPlan(access, predicates, len(self.restaurants))
+
+    def execute(self, plan):
+        return [r for _, r in self.iterate(plan)]
+
+    def iterate(self, plan):
+        # Lazily yields (position, restaurant) pairs in input order.
+        restaurants = self.restaurants
+        if plan.access == "index":
+            first = plan.predicates[0]
+            positions = self._index(first.attribute).get(first.value, [])
+        elif plan.access == "range":
+            positions = sorted(self._range_positions(plan.predicates[0]))
+        else:
+            positions = range(len(restaurants))
+        # The index or range only narrows the candidates: every predicate, the first included, is rechecked.
+        checks = [(operator.attrgetter(p.attribute), Predicate.OPERATORS[p.kind], p.value) for p in plan.predicates]
+        # All predicates are evaluated in a single pass; no intermediate lists.
+        for i in positions:
+            if i >= len(restaurants):
+                continue
+            r = restaurants[i]
+            if all(test(get(r), value) for get, test, value in checks):
+                yield i, r
+
+    def _estimate(self, predicate):
+        if predicate.kind == "eq":
+            try:
+                return len(self._index(predicate.attribute).get(predicate.value, ()))
+            except TypeError:  # unhashable value: no index, assume nothing is filtered out
+                return len(self.restaurants)
+        values, _ = self._histogram(predicate.attribute)
+        low, high = self._range_bounds(values, predicate)
+        return high - low
+
+    def _index(self, attribute):
+        index = self._indexes.get(attribute)
+        if index is None:
+            index = {}
+            for i, r in enumerate(self.restaurants):
+                index.setdefault(getattr(r, attribute), []).append(i)
+            self._indexes[attribute] = index
+        return index
+
+    def _histogram(self, attribute):
+        histogram = self._histograms.get(attribute)
+        if histogram is None:
+            pairs = sorted((getattr(r, attribute), i) for i, r in enumerate(self.restaurants))
+            histogram = ([value for value, _ in pairs], [i for _, i in pairs])
+            self._histograms[attribute] = histogram
+        return histogram
+
+    def _range_positions(self, predicate):
+        values, positions = self._histogram(predicate.attribute)
+        low, high = self._range_bounds(values, predicate)
+        return positions[low:high]
+
+    @staticmethod
+    def _range_bounds(values, predicate):
+        if predicate.kind == "min":
+            return bisect_left(values, predicate.value), len(values)
+        return 0, bisect_right(values, predicate.value)
 
@@ -0,0 +1,296 @@
+import heapq
+import math
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """
+    Compute the great-circle distance between two points.
+
+    Args:
+        lat1 (float): Latitude of the first point, in degrees.
+        lon1 (float): Longitude of the first point, in degrees.
+        lat2 (float): Latitude of the second point, in degrees.
+        lon2 (float): Longitude of the second point, in degrees.
+
+    Returns:
+        float: The distance in kilometres.
+    """
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    a = _haversine_term(phi1, math.radians(lon1), math.cos(phi1), phi2, math.radians(lon2), math.cos(phi2))
+    return _term_to_km(a)
+
+
+def _haversine_term(phi1, lambda1, cos_phi1, phi2, lambda2, cos_phi2):
+    """
+    Compute the haversine term a = hav(dphi) + cos(phi1) cos(phi2) hav(dlambda) from radians.
+
+    The term grows monotonically with distance, so comparisons and rankings can be made on it
+    directly and the asin/sqrt is only paid for the results that are returned.
+    """
+    sin_half_dphi = math.sin((phi2 - phi1) / 2)
+    sin_half_dlambda = math.sin((lambda2 - lambda1) / 2)
+    return sin_half_dphi * sin_half_dphi + cos_phi1 * cos_phi2 * (sin_half_dlambda * sin_half_dlambda)
+
+
+def _term_to_km(a):
+    """
+    Convert a haversine term into a distance in kilometres.
+    """
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def _km_to_term(distance_km):
+    """
+    Convert a distance in kilometres into the haversine term, for comparisons against _haversine_term.
+    """
+    if distance_km == float("inf"):
+        return float("inf")
+    half_angle = min(math.pi / 2, distance_km / (2 * EARTH_RADIUS_KM))
+    return math.sin(half_angle) ** 2
+
+
+def validate_coordinates(latitude, longitude):
+    """
+    Check that a latitude/longitude pair is within range.
+
+    Raises:
+        ValueError: If the latitude is outside -90..90 or the longitude outside -180..180.
+    """
+    if not (-90 <= latitude <= 90):
+        raise ValueError(f"Invalid latitude: {latitude}")
+    if not (-180 <= longitude <= 180):
+        raise ValueError(f"Invalid longitude: {longitude}")
+
+
+class GeoGridIndex:
+    """
+    A uniform latitude/longitude grid that buckets points by cell for radius and k-nearest queries.
+
+    Each cell stores its points as parallel lists of ids, radian coordinates and cos(latitude),
+    so a query only touches the cells overlapping its search area and does no per-point
+    trigonometry beyond two sines. Longitude does not wrap around the antimeridian, which
+    is fine for delivery areas but not for global searches across it.
+
+    Attributes:
+        cell_size (float): The cell edge length in degrees.
+    """
+
+    def __init__(self, cell_size=0.01):
+        """
+        Initialize an empty grid.
+
+        Args:
+            cell_size (float): The cell edge in degrees; about 1.1 km of latitude at the default.
+
+        Raises:
+            ValueError: If the cell size is not positive.
+        """
+        if cell_size <= 0:
+            raise ValueError("Cell size must be greater than 0.")
+        self.cell_size = cell_size
+        self._cells = {}
+        self._points = {}
+        self._bounds = None  # (min_row, max_row, min_col, max_col) of every cell ever occupied
+
+    def __len__(self):
+        """
+        Return the number of indexed points.
+        """
+        return len(self._points)
+
+    def __contains__(self, point_id):
+        """
+        Check whether a point id is indexed.
+        """
+        return point_id in self._points
+
+    def insert(self, point_id, latitude, longitude):
+        """
+        Add a point, replacing any previous position stored under the same id.
+
+        Raises:
+            ValueError: If the coordinates are out of range.
+        """
+        validate_coordinates(latitude, longitude)
+        if point_id in self._points:
+            self.remove(point_id)
+        key = self._cell_of(latitude, longitude)
+        if self._bounds is None:
+            self._bounds = (key[0], key[0], key[1], key[1])
+        else:
+            min_row, max_row, min_col, max_col = self._bounds
+            self._bounds = (min(min_row, key[0]), max(max_row, key[0]), min(min_col, key[1]), max(max_col, key[1]))
+        phi = math.radians(latitude)
+        cell = self._cells.setdefault(key, ([], [], [], []))
+        cell[0].append(point_id)
+        cell[1].append(phi)
+        cell[2].append(math.radians(longitude))
+        cell[3].append(math.cos(phi))
+        self._points[point_id] = (latitude, longitude)
+
+    def remove(self, point_id):
+        """
+        Remove a point; unknown ids are ignored.
+        """
+        position = self._points.pop(point_id, None)
+        if position is None:
+            return
+        key = self._cell_of(*position)
+        cell = self._cells[key]
+        slot = cell[0].index(point_id)
+        for column in cell:
+            column[slot] = column[-1]
+            column.pop()
+        if not cell[0]:
+            del self._cells[key]
+
+    def position(self, point_id):
+        """
+        Return the (latitude, longitude) of an indexed point.
+
+        Raises:
+            KeyError: If the id is not indexed.
+        """
+        return self._points[point_id]
+
+    def within_radius(self, latitude, longitude, radius_km):
+        """
+        Find every point within a radius of a location.
+
+        Args:
+            latitude (float): The latitude of the centre.
+            longitude (float): The longitude of the centre.
+            radius_km (float): The search radius in kilometres.
+
+        Returns:
+            list: (distance_km, point_id) pairs in no particular order.
+
+        Raises:
+            ValueError: If the coordinates are out of range or the radius is negative.
+        """
+        validate_coordinates(latitude, longitude)
+        if radius_km < 0:
+            raise ValueError("Radius must be greater than or equal to 0.")
+        lat_span = radius_km / KM_PER_DEGREE
+        poleward = min(89.9, abs(latitude) + lat_span)
+        lon_span = min(180.0, lat_span / math.cos(math.radians(poleward)))
+        low_row, low_col = self._cell_of(max(-90.0, latitude - lat_span), max(-180.0, longitude - lon_span))
+        high_row, high_col = self._cell_of(min(90.0, latitude + lat_span), min(180.0, longitude + lon_span))
+        if (high_row - low_row + 1) * (high_col - low_col + 1) > len(self._cells):
+            keys = [key for key in self._cells
+                    if low_row <= key[0] <= high_row and low_col <= key[1] <= high_col]
+        else:
+            keys = [(row, col) for row in range(low_row, high_row + 1) for col in range(low_col, high_col + 1)]
+        phi, lam = math.radians(latitude), math.radians(longitude)
+        cos_phi = math.cos(phi)
+        term_limit = _km_to_term(radius_km)
+        matches = []
+        for key in keys:
+            cell = self._cells.get(key)
+            if cell is None:
+                continue
+            for point_id, point_phi, point_lambda, point_cos in zip(*cell):
+                a = _haversine_term(phi, lam, cos_phi, point_phi, point_lambda, point_cos)
+                if a <= term_limit:
+                    matches.append((_term_to_km(a), point_id))
+        return matches
+
+    def nearest(self, latitude, longitude, k, accept=None, max_distance_km=None):
+        """
+        Find the k nearest points to a location by searching rings of cells outward.
+
+        The search stops as soon as the k-th best distance found is no larger than the distance
+        to the nearest cell not yet visited, so dense areas are answered from a handful of cells.
+        Once the rings searched cover more cells than are occupied, as for a query far from every
+        point, the occupied cells not yet visited are scanned instead.
+
+        Args:
+            latitude (float): The latitude of the query location.
+            longitude (float): The longitude of the query location.
+            k (int): The number of neighbours to return.
+            accept (callable, optional): A predicate on point ids; rejected points are skipped.
+            max_distance_km (float, optional): Ignore points further away than this.
+
+        Returns:
+            list: Up to k (distance_km, point_id) pairs ordered by increasing distance.
+
+        Raises:
+            ValueError: If the coordinates are out of range or k is not positive.
+        """
+        validate_coordinates(latitude, longitude)
+        if k <= 0:
+            raise ValueError("k must be greater than 0.")
+        if not self._cells:
+            return []
+        limit = float("inf") if max_distance_km is None else max_distance_km
+        term_limit = _km_to_term(limit)
+        phi, lam = math.radians(latitude), math.radians(longitude)
+        cos_phi = math.cos(phi)
+        row, col = self._cell_of(latitude, longitude)
+        min_row, max_row, min_col, max_col = self._bounds
+        max_ring = max(abs(row - min_row), abs(row - max_row), abs(col - min_col), abs(col - max_col))
+        best = []  # max-heap of (-term, -point_id) holding the k best so far
+        for ring in range(max_ring + 1):
+            scan = (2 * ring + 1) ** 2 > len(self._cells)
+            if scan:
+                keys = [key for key in self._cells if max(abs(key[0] - row), abs(key[1] - col)) >= ring]
+            else:
+                keys = self._ring_cells(row, col, ring)
+            for key in keys:
+                cell = self._cells.get(key)
+                if cell is None:
+                    continue
+                for point_id, point_phi, point_lambda, point_cos in zip(*cell):
+                    a = _haversine_term(phi, lam, cos_phi, point_phi, point_lambda, point_cos)
+                    if a > term_limit or (len(best) == k and (-a, -point_id) < best[0]):
+                        continue
+                    if accept is not None and not accept(point_id):
+                        continue
+                    if len(best) < k:
+                        heapq.heappush(best, (-a, -point_id))
+                    else:
+                        heapq.heapreplace(best, (-a, -point_id))
+            if scan:
+                break
+            unexplored = self._distance_beyond_ring(latitude, longitude, row, col, ring)
+            if unexplored > limit or (len(best) == k and _term_to_km(-best[0][0]) <= unexplored):
+                break
+        return [(_term_to_km(a), point_id) for a, point_id in sorted((-a, -i) for a, i in best)]
+
+    def _cell_of(self, latitude, longitude):
+        """
+        Return the (row, column) of the cell containing a location.
+        """
+        return math.floor(latitude / self.cell_size), math.floor(longitude / self.cell_size)
+
+    @staticmethod
+    def _ring_cells(row, col, ring):
+        """
+        Yield the cells on the square ring at Chebyshev distance `ring` around a cell.
+        """
+        if ring == 0:
+            yield row, col
+            return
+        for c in range(col - ring, col + ring + 1):
+            yield row - ring, c
+            yield row + ring, c
+        for r in range(row - ring + 1, row + ring):
+            yield r, col - ring
+            yield r, col + ring
+
+    def _distance_beyond_ring(self, latitude, longitude, row, col, ring):
+        """
+        Lower-bound the distance from a location to any point outside the block of cells within `ring`.
+        """
+        size = self.cell_size
+        lat_margin = min(latitude - (row - ring) * size, (row + ring + 1) * size - latitude)
+        lon_margin = min(longitude - (col - ring) * size, (col + ring + 1) * size - longitude)
+        poleward = min(90.0, max(abs((row - ring) * size), abs((row + ring + 1) * size)))
+        # The shortest path across a longitude gap is along the most poleward latitude of the block.
+        lon_km = 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.cos(math.radians(poleward))
+                                                     * math.sin(math.radians(lon_margin) / 2)))
+        return min(lat_margin * KM_PER_DEGREE, lon_km)
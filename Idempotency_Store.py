@@ -0,0 +1,396 @@
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+class _InFlight:
+    """
+    A computation in progress for one key, which later requests with the same key wait for.
+    """
+    __slots__ = ("fingerprint", "done", "waiters", "result", "error")
+
+    def __init__(self, fingerprint):
+        self.fingerprint = fingerprint
+        self.done = threading.Event()
+        self.waiters = []
+        self.result = None
+        self.error = None
+
+
+# IdempotencyStore Class
+class IdempotencyStore:
+    """
+    Remembers the outcome of requests by idempotency key, so a retried request gets the original
+    outcome instead of being carried out again.
+
+    Outcomes are kept in a bounded LRU map and expire after a time-to-live. With a path, they are
+    also written to a SQLite database, so they survive a restart and are shared by processes using
+    the same file. While a request is running, later requests with the same key wait for it and
+    share its outcome rather than running in parallel. Within a process they wait on it directly.
+    Across processes, the process running a request holds a claim row for its key, and the others
+    poll the database every poll_interval seconds until the outcome is stored. A claim lapses after
+    claim_ttl seconds, so a crashed process does not block its key forever, but a request still
+    running by then may run a second time.
+
+    If the request raises, nothing is stored and the waiting requests get the same exception, so a
+    later retry runs it again. A request whose outcome is not yet settled, such as a payment the
+    gateway never confirmed, can instead return a provisional outcome: it is stored and returned
+    like any other, but the next request with the key runs again to settle it. Outcomes must be
+    JSON-serializable when a path is given.
+
+    Attributes:
+        max_entries (int): The most outcomes kept; the least recently used is evicted first.
+        ttl (float): Seconds an outcome is kept.
+        path (str): The SQLite database file, or None to keep outcomes in memory only.
+        claim_ttl (float): Seconds a claim on a running request holds off other processes.
+        poll_interval (float): Seconds between checks for a request another process is running.
+        hits (int): Requests answered with a stored outcome.
+        misses (int): Requests that had to run.
+        coalesced (int): Requests that waited for the same key already running.
+        evictions (int): Outcomes dropped to respect max_entries.
+        expirations (int): Outcomes dropped because their TTL elapsed.
+    """
+    PRUNE_EVERY = 256  # Stored outcomes between sweeps of the SQLite table.
+
+    def __init__(self, max_entries=10_000, ttl=24 * 3600.0, path=None, clock=time.time, claim_ttl=60.0,
+                 poll_interval=0.05):
+        """
+        Initializes an empty store, or opens the SQLite database at path.
+
+        Args:
+            max_entries (int): The most outcomes to keep.
+            ttl (float): Seconds an outcome is kept.
+            path (str, optional): A SQLite database file for outcomes that outlive the process.
+            clock (callable): Returns the current Unix time in seconds; injectable for tests.
+            claim_ttl (float): Seconds a process's claim on a running request holds off other processes.
+            poll_interval (float): Seconds between checks for a request another process is running.
+
+        Raises:
+            ValueError: If max_entries, ttl, claim_ttl or poll_interval is not positive.
+        """
+        if max_entries <= 0:
+            raise ValueError("max_entries must be greater than 0.")
+        if ttl <= 0:
+            raise ValueError("ttl must be greater than 0.")
+        if claim_ttl <= 0 or poll_interval <= 0:
+            raise ValueError("claim_ttl and poll_interval must be greater than 0.")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.path = path
+        self.claim_ttl = claim_ttl
+        self.poll_interval = poll_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._in_flight = {}
+        self._puts = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._db = None
+        if path is not None:
+            self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            # A write-ahead log lets each outcome commit without waiting for a full sync of the database file.
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute("CREATE TABLE IF NOT EXISTS idempotency (key TEXT PRIMARY KEY, fingerprint TEXT, "
+                             "result TEXT NOT NULL, expires_at REAL NOT NULL)")
+            self._db.execute("CREATE INDEX IF NOT EXISTS idempotency_expiry ON idempotency (expires_at)")
+            # A claim row marks a request some process is running; inserting it fails if one already exists.
+            self._db.execute("CREATE TABLE IF NOT EXISTS idempotency_claims (key TEXT PRIMARY KEY, "
+                             "fingerprint TEXT, expires_at REAL NOT NULL)")
+
+    def __len__(self):
+        """
+        Return the number of outcomes held in memory.
+        """
+        return len(self._entries)
+
+    def run(self, key, compute, fingerprint=None, provisional=None):
+        """
+        Returns the stored outcome for key, or calls compute once and stores what it returns.
+
+        Args:
+            key (str): The idempotency key.
+            compute (callable): Carries out the request and returns its outcome.
+            fingerprint (str, optional): Identifies the request's content. A key reused with a different
+                fingerprint is rejected.
+            provisional (callable, optional): Returns True for an outcome that a later request with the
+                key must run again rather than reuse.
+
+        Returns:
+            The outcome of the first request made with key.
+
+        Raises:
+            ValueError: If the key was already used with a different fingerprint.
+            Exception: Whatever compute raised, for the request that ran it and those waiting on it.
+        """
+        in_flight, owner = self._claim(key, fingerprint, provisional)
+        if not owner:
+            in_flight.done.wait()
+            return self._outcome(in_flight)
+        claimed = False
+        try:
+            claimed, entry = self._acquire(key, fingerprint, provisional)
+            while not claimed and entry is None:
+                time.sleep(self.poll_interval)
+                claimed, entry = self._acquire(key, fingerprint, provisional)
+            result = compute() if claimed else entry[2]
+        except BaseException as error:
+            self._finish(key, in_flight, error=error, store=claimed)
+            raise
+        self._finish(key, in_flight, result=result, store=claimed)
+        return result
+
+    async def run_async(self, key, compute, fingerprint=None, provisional=None):
+        """
+        Like run, for a compute that returns an awaitable. Waiting requests do not block the event loop.
+
+        Args:
+            key (str): The idempotency key.
+            compute (callable): Returns an awaitable that carries out the request.
+            fingerprint (str, optional): Identifies the request's content.
+            provisional (callable, optional): Returns True for an outcome that must be run again.
+
+        Returns:
+            The outcome of the first request made with key.
+
+        Raises:
+            ValueError: If the key was already used with a different fingerprint.
+            Exception: Whatever compute raised, for the request that ran it and those waiting on it.
+        """
+        in_flight, owner = self._claim(key, fingerprint, provisional)
+        if not owner:
+            loop = asyncio.get_running_loop()
+            waiter = loop.create_future()
+            with self._lock:
+                if not in_flight.done.is_set():
+                    in_flight.waiters.append((loop, waiter))
+                else:
+                    waiter.set_result(None)
+            await waiter
+            return self._outcome(in_flight)
+        claimed = False
+        try:
+            claimed, entry = self._acquire(key, fingerprint, provisional)
+            while not claimed and entry is None:
+                await asyncio.sleep(self.poll_interval)
+                claimed, entry = self._acquire(key, fingerprint, provisional)
+            result = await compute() if claimed else entry[2]
+        except BaseException as error:
+            self._finish(key, in_flight, error=error, store=claimed)
+            raise
+        self._finish(key, in_flight, result=result, store=claimed)
+        return result
+
+    def get(self, key):
+        """
+        Looks up a stored outcome without running anything.
+
+        Args:
+            key (str): The idempotency key.
+
+        Returns:
+            The stored outcome, or None if there is none.
+        """
+        with self._lock:
+            entry = self._lookup(key)
+        return None if entry is None else entry[2]
+
+    def clear(self):
+        """
+        Drops every stored outcome, including those in the SQLite database.
+        """
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM idempotency")
+
+    def close(self):
+        """
+        Closes the SQLite database, if any.
+        """
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def stats(self):
+        """
+        Report the store counters.
+
+        Returns:
+            dict: The in-memory size and the hit, miss, coalesced, eviction and expiration counts.
+        """
+        return {"size": len(self._entries), "hits": self.hits, "misses": self.misses,
+                "coalesced": self.coalesced, "evictions": self.evictions, "expirations": self.expirations}
+
+    def _claim(self, key, fingerprint, provisional=None):
+        """
+        Finds a settled outcome or a running request for key, or registers this request as running it.
+
+        Returns:
+            tuple: (_InFlight, True) if the caller must run the request, or (_InFlight, False) to wait on it.
+                A stored outcome is returned as an already finished _InFlight.
+        """
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is not None:
+                _check_fingerprint(entry[1], fingerprint)
+            if entry is not None and not (provisional is not None and provisional(entry[2])):
+                self.hits += 1
+                finished = _InFlight(entry[1])
+                finished.result = entry[2]
+                finished.done.set()
+                return finished, False
+            in_flight = self._in_flight.get(key)
+            if in_flight is not None:
+                _check_fingerprint(in_flight.fingerprint, fingerprint)
+                self.coalesced += 1
+                return in_flight, False
+            self.misses += 1
+            in_flight = self._in_flight[key] = _InFlight(fingerprint)
+            return in_flight, True
+
+    def _acquire(self, key, fingerprint, provisional=None):
+        """
+        Claims key in the SQLite database for this process, unless another process holds the claim or
+        has stored a settled outcome. Without a database the key is always claimed.
+
+        Returns:
+            tuple: (True, None) if this process must run the request, (False, entry) with another
+                process's settled (expires_at, fingerprint, result) entry, or (False, None) to poll again.
+        """
+        if self._db is None:
+            return True, None
+        with self._lock:
+            now = self._clock()
+            # The check and the insert share a transaction, so an outcome stored in between is not missed.
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                entry = self._load(key, now)
+                if entry is not None:
+                    _check_fingerprint(entry[1], fingerprint)
+                    if provisional is None or not provisional(entry[2]):
+                        self._remember(key, entry)
+                        return False, entry
+                self._db.execute("DELETE FROM idempotency_claims WHERE key = ? AND expires_at <= ?", (key, now))
+                try:
+                    self._db.execute("INSERT INTO idempotency_claims VALUES (?, ?, ?)",
+                                     (key, fingerprint, now + self.claim_ttl))
+                except sqlite3.IntegrityError:
+                    claim = self._db.execute("SELECT fingerprint FROM idempotency_claims WHERE key = ?",
+                                             (key,)).fetchone()
+                    _check_fingerprint(claim[0], fingerprint)
+                    return False, None
+                return True, None
+            finally:
+                self._db.execute("COMMIT")
+
+    def _finish(self, key, in_flight, result=None, error=None, store=True):
+        """
+        Stores a finished request's outcome, releases its claim and wakes the requests waiting on it.
+        store is False when this process did not claim the key, e.g. for an outcome another process stored.
+        """
+        with self._lock:
+            if store and error is None:
+                self._store(key, in_flight.fingerprint, result)
+            elif store and self._db is not None:
+                self._db.execute("DELETE FROM idempotency_claims WHERE key = ?", (key,))
+            in_flight.result = result
+            in_flight.error = error
+            del self._in_flight[key]
+            in_flight.done.set()
+            waiters, in_flight.waiters = in_flight.waiters, []
+        for loop, waiter in waiters:
+            loop.call_soon_threadsafe(_resolve, waiter)
+
+    def _outcome(self, in_flight):
+        """
+        Returns a finished request's result, or raises its exception.
+        """
+        if in_flight.error is not None:
+            raise in_flight.error
+        return in_flight.result
+
+    def _lookup(self, key):
+        """
+        Returns the live (expires_at, fingerprint, result) entry for key, loading it from SQLite on a
+        memory miss. Must be called with the lock held.
+        """
+        now = self._clock()
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] > now:
+                self._entries.move_to_end(key)
+                return entry
+            del self._entries[key]
+            self.expirations += 1
+            return None
+        entry = self._load(key, now)
+        if entry is not None:
+            self._remember(key, entry)
+        return entry
+
+    def _load(self, key, now):
+        """
+        Reads the live (expires_at, fingerprint, result) entry for key from SQLite, or returns None.
+        Must be called with the lock held.
+        """
+        if self._db is None:
+            return None
+        row = self._db.execute("SELECT expires_at, fingerprint, result FROM idempotency "
+                               "WHERE key = ? AND expires_at > ?", (key, now)).fetchone()
+        return None if row is None else (row[0], row[1], json.loads(row[2]))
+
+    def _store(self, key, fingerprint, result):
+        """
+        Saves an outcome in memory and, with a path, in SQLite. Must be called with the lock held.
+        """
+        now = self._clock()
+        entry = (now + self.ttl, fingerprint, result)
+        self._remember(key, entry)
+        if self._db is None:
+            return
+        encoded = json.dumps(result)
+        # The outcome and the release of the claim commit together, so a polling process sees one or the other.
+        self._db.execute("BEGIN IMMEDIATE")
+        self._db.execute("INSERT OR REPLACE INTO idempotency VALUES (?, ?, ?, ?)",
+                         (key, fingerprint, encoded, entry[0]))
+        self._db.execute("DELETE FROM idempotency_claims WHERE key = ?", (key,))
+        self._db.execute("COMMIT")
+        self._puts += 1
+        if self._puts % self.PRUNE_EVERY == 0:
+            self._db.execute("DELETE FROM idempotency WHERE expires_at <= ?", (now,))
+            self._db.execute("DELETE FROM idempotency WHERE key IN (SELECT key FROM idempotency "
+                             "ORDER BY expires_at DESC LIMIT -1 OFFSET ?)", (self.max_entries,))
+
+    def _remember(self, key, entry):
+        """
+        Puts an entry in the in-memory LRU map, evicting the least recently used beyond max_entries.
+        """
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+
+def _check_fingerprint(stored, fingerprint):
+    """
+    Rejects a key reused for a request with different content.
+    """
+    if stored != fingerprint:
+        raise ValueError("Idempotency key was already used for a different request.")
+
+
+def _resolve(waiter):
+    """
+    Wakes an asyncio waiter, unless it was cancelled meanwhile.
+    """
+    if not waiter.done():
+        waiter.set_result(None)
@@ -0,0 +1,153 @@
+import threading
+
+
+# MenuSnapshot Class
+class MenuSnapshot:
+    """
+    An immutable view of which menu items were available at one version of a MenuAvailabilityStore.
+
+    Attributes:
+        version (int): The store version this snapshot was published at.
+        available_items (frozenset): The names of the items that were available.
+    """
+    __slots__ = ("version", "available_items")
+
+    def __init__(self, version, available_items):
+        """
+        Initializes a MenuSnapshot.
+
+        Args:
+            version (int): The version number of the snapshot.
+            available_items (iterable): The names of the available items.
+        """
+        self.version = version
+        self.available_items = frozenset(available_items)
+
+    def is_item_available(self, item_name):
+        """
+        Checks if a specific item was available in this snapshot.
+
+        Args:
+            item_name (str): The name of the item to check.
+
+        Returns:
+            bool: True if the item is available, False otherwise.
+        """
+        return item_name in self.available_items
+
+    def are_items_available(self, item_names):
+        """
+        Checks several items against this snapshot at once.
+
+        Args:
+            item_names (iterable): The names of the items to check.
+
+        Returns:
+            list: For each name, in order, True if the item is available and False otherwise.
+        """
+        available = self.available_items
+        return [name in available for name in item_names]
+
+
+# MenuAvailabilityStore Class
+class MenuAvailabilityStore:
+    """
+    Tracks which items of a restaurant's menu are available as they sell out and come back.
+
+    Every update builds a new MenuSnapshot and publishes it with a single reference swap, so readers
+    never take a lock and never see half of a bulk update; only writers serialize on a lock. The store
+    can be passed to OrderPlacement in place of a RestaurantMenu.
+    """
+    def __init__(self, available_items=()):
+        """
+        Initializes the store with its first snapshot (version 0).
+
+        Args:
+            available_items (iterable): The names of the items available to begin with.
+        """
+        self._write_lock = threading.Lock()
+        self._snapshot = MenuSnapshot(0, available_items)
+
+    @property
+    def version(self):
+        """
+        int: The version of the current snapshot.
+        """
+        return self._snapshot.version
+
+    @property
+    def available_items(self):
+        """
+        frozenset: The names of the items available in the current snapshot.
+        """
+        return self._snapshot.available_items
+
+    def snapshot(self):
+        """
+        Returns the current snapshot, which stays unchanged however the store is updated afterwards.
+
+        Returns:
+            MenuSnapshot: The current snapshot.
+        """
+        return self._snapshot
+
+    def update(self, available=(), unavailable=()):
+        """
+        Marks items available or unavailable in one atomic step.
+
+        Args:
+            available (iterable): Names of items that are back on the menu.
+            unavailable (iterable): Names of items that have sold out or been withdrawn.
+
+        Returns:
+            int: The version of the new snapshot.
+
+        Raises:
+            ValueError: If an item is listed as both available and unavailable.
+        """
+        available, unavailable = set(available), set(unavailable)
+        both = available & unavailable
+        if both:
+            raise ValueError(f"Items cannot be both available and unavailable: {', '.join(sorted(both))}")
+        with self._write_lock:
+            current = self._snapshot
+            self._snapshot = MenuSnapshot(current.version + 1, (current.available_items - unavailable) | available)
+            return self._snapshot.version
+
+    def replace(self, available_items):
+        """
+        Replaces the whole set of available items in one atomic step.
+
+        Args:
+            available_items (iterable): The names of the items now available.
+
+        Returns:
+            int: The version of the new snapshot.
+        """
+        with self._write_lock:
+            self._snapshot = MenuSnapshot(self._snapshot.version + 1, available_items)
+            return self._snapshot.version
+
+    def is_item_available(self, item_name):
+        """
+        Checks if a specific item is available in the current snapshot.
+
+        Args:
+            item_name (str): The name of the item to check.
+
+        Returns:
+            bool: True if the item is available, False otherwise.
+        """
+        return item_name in self._snapshot.available_items
+
+    def are_items_available(self, item_names):
+        """
+        Checks several items against one snapshot, so the answers are consistent with each other.
+
+        Args:
+            item_names (iterable): The names of the items to check.
+
+        Returns:
+            list: For each name, in order, True if the item is available and False otherwise.
+        """
+        return self._snapshot.are_items_available(item_names)
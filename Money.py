@@ -0,0 +1,273 @@
+from decimal import ROUND_DOWN, ROUND_HALF_EVEN, ROUND_HALF_UP, Decimal, InvalidOperation
+from fractions import Fraction
+from functools import lru_cache
+
+
+@lru_cache(maxsize=256)
+def _rate_fraction(rate):
+    """
+    Converts a rate to an exact (numerator, denominator) pair.
+
+    Floats are read by their shortest decimal representation, so 0.1 means exactly one tenth.
+
+    Args:
+        rate (int, float, Decimal or Fraction): The rate to convert.
+
+    Returns:
+        tuple: The numerator and positive denominator of the rate.
+    """
+    if isinstance(rate, float):
+        rate = Decimal(repr(rate))
+    fraction = Fraction(rate)
+    return fraction.numerator, fraction.denominator
+
+
+def _divide(numerator, denominator, rounding):
+    """
+    Divides two integers, rounding the quotient to a whole number with the given rule.
+
+    Args:
+        numerator (int): The dividend.
+        denominator (int): The divisor, which must be positive.
+        rounding (str): ROUND_HALF_UP (ties away from zero), ROUND_HALF_EVEN or ROUND_DOWN (towards zero).
+
+    Returns:
+        int: The rounded quotient.
+    """
+    quotient, remainder = divmod(abs(numerator), denominator)
+    if rounding == ROUND_HALF_UP:
+        quotient += 2 * remainder >= denominator
+    elif rounding == ROUND_HALF_EVEN:
+        twice = 2 * remainder
+        quotient += twice > denominator or (twice == denominator and quotient % 2 == 1)
+    elif rounding != ROUND_DOWN:
+        raise ValueError(f"Unsupported rounding mode: {rounding}")
+    return -quotient if numerator < 0 else quotient
+
+
+def _as_decimal(value):
+    """
+    Reads a number as a Decimal, using the shortest representation for floats.
+
+    Args:
+        value (int, float, str or Decimal): The number to read.
+
+    Returns:
+        Decimal: The value as a Decimal.
+
+    Raises:
+        ValueError: If the value is not a finite number.
+    """
+    try:
+        number = Decimal(repr(value)) if isinstance(value, float) else Decimal(value)
+    except InvalidOperation:
+        raise ValueError(f"Invalid amount: {value!r}") from None
+    if not number.is_finite():
+        raise ValueError(f"Invalid amount: {value!r}")
+    return number
+
+
+_new_object = object.__new__
+
+
+def _from_cents(cents):
+    """
+    Builds a Money object from integer cents without the constructor's type check, for results
+    of integer arithmetic on other Money objects.
+    """
+    money = _new_object(Money)
+    money.cents = cents
+    return money
+
+
+# Money Class
+class Money:
+    """
+    An exact amount of money held as a whole number of cents.
+
+    Adding, subtracting and multiplying by an integer quantity is plain integer arithmetic, so totals
+    are exact and cheaper than decimal.Decimal. Anything that can produce fractions of a cent (tax
+    rates, splitting a bill) takes an explicit rounding rule. Money compares exactly with other
+    numbers, the way Decimal and Fraction do: Money(1299) == Decimal("12.99") and Money(500) == 5.0,
+    but Money(1299) != 12.99, since that float is slightly more than 12.99. Equal values hash alike,
+    and Money is immutable.
+
+    Each operator still builds a new object, so loops over many lines should add up `cents` and wrap
+    the result once, as Cart does with its running subtotal.
+
+    Attributes:
+        cents (int): The amount in cents.
+    """
+    __slots__ = ("cents",)
+
+    def __init__(self, cents):
+        """
+        Initializes a Money object from a whole number of cents.
+
+        Args:
+            cents (int): The amount in cents.
+
+        Raises:
+            TypeError: If cents is not an integer.
+        """
+        if type(cents) is not int:
+            raise TypeError("Money is built from integer cents; use Money.from_amount for other values.")
+        self.cents = cents
+
+    @classmethod
+    def from_amount(cls, amount, rounding=ROUND_HALF_UP):
+        """
+        Builds a Money object from an amount in currency units.
+
+        Args:
+            amount (Money, int, float, str or Decimal): The amount, e.g. 12.99 or "12.99".
+            rounding (str): How to round amounts with fractions of a cent.
+
+        Returns:
+            Money: The amount rounded to whole cents.
+
+        Raises:
+            ValueError: If the amount is not a finite number.
+            TypeError: If the amount is of an unsupported type.
+        """
+        if isinstance(amount, Money):
+            return amount
+        if isinstance(amount, bool) or not isinstance(amount, (int, float, str, Decimal)):
+            raise TypeError(f"Cannot convert {type(amount).__name__} to Money.")
+        if isinstance(amount, int):
+            return cls(amount * 100)
+        number = _as_decimal(amount).scaleb(2)
+        return cls(int(number.to_integral_value(rounding=rounding)))
+
+    def scale(self, rate, rounding=ROUND_HALF_UP):
+        """
+        Multiplies the amount by a rate, such as a tax rate, and rounds to whole cents.
+
+        Args:
+            rate (int, float, Decimal or Fraction): The rate to apply; floats are read as written, so 0.1 is one tenth.
+            rounding (str): ROUND_HALF_UP (ties away from zero), ROUND_HALF_EVEN or ROUND_DOWN.
+
+        Returns:
+            Money: The scaled amount.
+        """
+        numerator, denominator = _rate_fraction(rate)
+        product = self.cents * numerator
+        money = _new_object(Money)
+        if rounding == ROUND_HALF_UP and product >= 0:
+            # The common case (a tax on a positive amount), without the general rounding helper.
+            money.cents = (2 * product + denominator) // (2 * denominator)
+        else:
+            money.cents = _divide(product, denominator, rounding)
+        return money
+
+    def split(self, parts):
+        """
+        Splits the amount into equal shares that add up exactly to the amount.
+
+        Leftover cents go one each to the first shares, so shares differ by at most one cent.
+
+        Args:
+            parts (int): The number of shares.
+
+        Returns:
+            list: A list of Money shares.
+
+        Raises:
+            ValueError: If parts is not greater than zero.
+        """
+        if parts <= 0:
+            raise ValueError("Split must be greater than zero")
+        share, leftover = divmod(self.cents, parts)
+        return [_from_cents(share + 1)] * leftover + [_from_cents(share)] * (parts - leftover)
+
+    def to_decimal(self):
+        """
+        Returns:
+            Decimal: The amount in currency units with two decimal places.
+        """
+        return Decimal(self.cents).scaleb(-2)
+
+    def _cents_of(self, other):
+        """
+        Returns another amount in cents for comparison, exactly, or None if it is not a finite number.
+        A float counts as its exact binary value, not its shortest representation, so that values
+        that compare equal also hash equal.
+        """
+        if isinstance(other, Money):
+            return other.cents
+        if isinstance(other, int):
+            return other * 100
+        if isinstance(other, (float, Decimal)):
+            try:
+                return Fraction(other) * 100
+            except (ValueError, OverflowError):
+                return None
+        return None
+
+    def __add__(self, other):
+        if isinstance(other, Money):
+            return _from_cents(self.cents + other.cents)
+        if type(other) is int and other == 0:
+            return self
+        return NotImplemented
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        if isinstance(other, Money):
+            return _from_cents(self.cents - other.cents)
+        return NotImplemented
+
+    def __mul__(self, quantity):
+        if type(quantity) is int:
+            return _from_cents(self.cents * quantity)
+        return NotImplemented
+
+    __rmul__ = __mul__
+
+    def __neg__(self):
+        return _from_cents(-self.cents)
+
+    def __abs__(self):
+        return _from_cents(abs(self.cents))
+
+    def __bool__(self):
+        return self.cents != 0
+
+    def __eq__(self, other):
+        cents = self._cents_of(other)
+        if cents is None:
+            return NotImplemented
+        return self.cents == cents
+
+    def __lt__(self, other):
+        cents = self._cents_of(other)
+        return NotImplemented if cents is None else self.cents < cents
+
+    def __le__(self, other):
+        cents = self._cents_of(other)
+        return NotImplemented if cents is None else self.cents <= cents
+
+    def __gt__(self, other):
+        cents = self._cents_of(other)
+        return NotImplemented if cents is None else self.cents > cents
+
+    def __ge__(self, other):
+        cents = self._cents_of(other)
+        return NotImplemented if cents is None else self.cents >= cents
+
+    def __hash__(self):
+        # Hash like the equal Fraction, so Money(500) shares a dictionary slot with 5, 5.0 and Decimal("5.00").
+        return hash(Fraction(self.cents, 100))
+
+    def __float__(self):
+        return self.cents / 100
+
+    def __str__(self):
+        return str(self.to_decimal())
+
+    def __repr__(self):
+        return f"Money('{self}')"
+
+    def __format__(self, spec):
+        return format(self.to_decimal(), spec)
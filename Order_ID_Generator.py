@@ -0,0 +1,142 @@
+import itertools
+import os
+import random
+import time
+import weakref
+
+EPOCH_MS = 1_704_067_200_000  # 2024-01-01T00:00:00Z
+TIMESTAMP_BITS = 48
+NODE_BITS = 24
+SEQUENCE_BITS = 24
+PREFIX = "ORD"
+
+_NODE_MASK = (1 << NODE_BITS) - 1
+_SEQUENCE_MASK = (1 << SEQUENCE_BITS) - 1
+_TIMESTAMP_SHIFT = NODE_BITS + SEQUENCE_BITS
+_HEX_DIGITS = (TIMESTAMP_BITS + NODE_BITS + SEQUENCE_BITS) // 4
+
+# Generators that picked their own node id, so a forked child can pick fresh ones.
+_random_node_generators = weakref.WeakSet()
+
+
+# OrderIdGenerator Class
+class OrderIdGenerator:
+    """
+    Generates unique, time-sortable order IDs without coordination between threads or processes.
+
+    An ID packs a millisecond timestamp, a node id and a sequence number into 96 bits and renders them
+    as fixed-width hex after the "ORD" prefix, so IDs sort by creation time as plain strings. The
+    sequence comes from a shared counter whose increments are atomic under the GIL, so generating an
+    ID takes no lock. Without an explicit node id, each process draws a random node id and a random
+    starting sequence (and draws new ones after a fork), which makes a clash between processes
+    vanishingly unlikely; give each worker its own node_id to rule it out entirely.
+
+    Attributes:
+        node_id (int): The node id embedded in every ID from this generator.
+    """
+    def __init__(self, node_id=None, clock=time.time_ns):
+        """
+        Initializes an OrderIdGenerator.
+
+        Args:
+            node_id (int): A number from 0 to 2**24 - 1 unique to this worker, or None to draw one at random.
+            clock (callable): Returns the current time in nanoseconds; replaceable for tests.
+
+        Raises:
+            ValueError: If node_id is out of range.
+        """
+        if node_id is not None and not 0 <= node_id <= _NODE_MASK:
+            raise ValueError(f"Node id must be between 0 and {_NODE_MASK}.")
+        self._clock = clock
+        if node_id is None:
+            self._reseed()
+            _random_node_generators.add(self)
+        else:
+            self._set_node(node_id, 0)
+
+    def next_id(self):
+        """
+        Generates one order ID.
+
+        Returns:
+            str: An ID such as "ORD00148b4a6047000007000000".
+        """
+        sequence = next(self._counter) & _SEQUENCE_MASK
+        millis = self._clock() // 1_000_000
+        head = self._head
+        if head[0] != millis:
+            # The "ORD" + timestamp + node prefix only changes once per millisecond. It is swapped in as
+            # one tuple so concurrent threads never pair a prefix with the wrong millisecond.
+            head = (millis, f"{PREFIX}{millis - EPOCH_MS:012x}{self.node_id:06x}")
+            self._head = head
+        return f"{head[1]}{sequence:06x}"
+
+    def next_ids(self, count):
+        """
+        Generates a block of order IDs, reading the clock once.
+
+        Args:
+            count (int): How many IDs to generate.
+
+        Returns:
+            list: The IDs, in increasing order unless the sequence wraps within the block.
+        """
+        millis = self._clock() // 1_000_000 - EPOCH_MS
+        base = (millis << _TIMESTAMP_SHIFT) | (self.node_id << SEQUENCE_BITS)
+        return [f"{PREFIX}{base | (sequence & _SEQUENCE_MASK):024x}"
+                for sequence in itertools.islice(self._counter, count)]
+
+    def _reseed(self):
+        """
+        Draws a new random node id and starting sequence.
+        """
+        rng = random.SystemRandom()
+        self._set_node(rng.getrandbits(NODE_BITS), rng.getrandbits(SEQUENCE_BITS))
+
+    def _set_node(self, node_id, first_sequence):
+        """
+        Sets the node id and restarts the sequence, dropping the cached ID prefix.
+        """
+        self._head = (None, "")
+        self.node_id = node_id
+        self._counter = itertools.count(first_sequence)
+
+
+def parse_order_id(order_id):
+    """
+    Splits an order ID back into its parts.
+
+    Args:
+        order_id (str): An ID produced by OrderIdGenerator.
+
+    Returns:
+        dict: The creation time in Unix milliseconds ("timestamp_ms"), "node_id" and "sequence".
+
+    Raises:
+        ValueError: If the ID was not produced by OrderIdGenerator.
+    """
+    digits = order_id[len(PREFIX):] if isinstance(order_id, str) and order_id.startswith(PREFIX) else ""
+    if len(digits) != _HEX_DIGITS:
+        raise ValueError(f"Invalid order ID: {order_id!r}")
+    try:
+        value = int(digits, 16)
+    except ValueError:
+        raise ValueError(f"Invalid order ID: {order_id!r}") from None
+    return {"timestamp_ms": (value >> _TIMESTAMP_SHIFT) + EPOCH_MS,
+            "node_id": (value >> SEQUENCE_BITS) & _NODE_MASK,
+            "sequence": value & _SEQUENCE_MASK}
+
+
+def _reseed_after_fork():
+    """
+    Gives every randomly seeded generator a fresh node id and sequence in a forked child, so the
+    child does not repeat the IDs its parent goes on to generate.
+    """
+    for generator in list(_random_node_generators):
+        generator._reseed()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reseed_after_fork)
+
+default_generator = OrderIdGenerator()
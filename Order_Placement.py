@@ -1,28 +1,46 @@
+import asyncio
+import random
+import time
 import unittest
+from array import array
+from decimal import ROUND_HALF_UP, Decimal
 from unittest import mock  # Import the mock module for simulating payment failures in tests.
 
+from Money import Money
+from Order_ID_Generator import default_generator
+
+# Returned for a payment that timed out in a worker thread, which may still complete it.
+PAYMENT_OUTCOME_UNKNOWN = "Payment outcome unknown"
+
+
 # CartItem Class
 class CartItem:
     """
     Represents an individual item in the shopping cart.
 
+    The class uses __slots__, so an item carries no per-instance dictionary. Every connected
+    session keeps its cart lines in memory, and this cuts about a third of what each line costs.
+
     Attributes:
         name (str): The name of the item.
-        price (float): The price of the item.
+        price (Money): The price of the item.
         quantity (int): The quantity of the item in the cart.
     """
+    __slots__ = ("name", "price", "quantity")
+
     def __init__(self, name, price, quantity):
         """
         Initializes a CartItem object with the given name, price, and quantity.
 
         Args:
             name (str): Name of the item.
-            price (float): Price of the item.
+            price (Money or float): Price of the item; plain numbers are rounded to the nearest cent.
             quantity (int): Quantity of the item in the cart.
 
         Raises:
             ValueError: If the price is not greater than 0 or the quantity is less than 0.
         """
+        price = Money.from_amount(price)
         if price <= 0:
             raise ValueError("Price must be greater than 0.")
         if quantity < 0:
@@ -50,27 +68,50 @@ class CartItem:
         Calculates the subtotal price for this item based on its price and quantity.
 
         Returns:
-            float: The subtotal price for this item.
+            Money: The subtotal price for this item.
         """
         return self.price * self.quantity
 
 
 # Cart Class
 class Cart:
-    TAX_RATE = 0.10
-    DELIVERY_FEE = 5.00
+    TAX_RATE = Decimal("0.10")
+    TAX_ROUNDING = ROUND_HALF_UP
+    DELIVERY_FEE = Money(500)
 
     """
     Represents a shopping cart that can contain multiple CartItem objects.
 
+    Items are kept in an insertion-ordered dictionary keyed by name, so adding, updating and
+    removing an item are O(1) however many lines the cart has. Amounts are Money values. The
+    subtotal is kept as a running total in integer cents and the price breakdown is cached until
+    the cart next changes, so calculate_total is O(1) too. Quantities should therefore be changed
+    through the cart rather than on the CartItem objects directly.
+
     Attributes:
-        items (list): A list of CartItem objects in the cart.
+        items (list): A list of CartItem objects in the cart, in the order they were added.
+        self_check (bool): Whether calculate_total verifies the running subtotal against a full recompute.
     """
-    def __init__(self):
+    def __init__(self, self_check=False):
         """
         Initializes an empty Cart with no items.
+
+        Args:
+            self_check (bool): If True, every calculate_total call re-sums the items and raises
+                RuntimeError when the running subtotal has drifted. Meant for debugging and tests.
+        """
+        self._items = {}
+        self._subtotal_cents = 0
+        self._totals = None
+        self._delivery_fee = None
+        self.self_check = self_check
+
+    @property
+    def items(self):
         """
-        self.items = []
+        list: A snapshot of the CartItem objects in the cart, in the order they were added.
+        """
+        return list(self._items.values())
 
     def add_item(self, name, price, quantity):
         """
@@ -78,7 +119,7 @@ class Cart:
 
         Args:
             name (str): Name of the item.
-            price (float): Price of the item.
+            price (Money or float): Price of the item.
             quantity (int): Quantity to be added to the cart.
 
         Returns:
@@ -89,19 +130,22 @@ class Cart:
         """
         if not name:
             raise ValueError("Item name cannot be empty.")
+        price = Money.from_amount(price)
         if price <= 0:
             raise ValueError("Price must be greater than 0.")
         if quantity < 0:
             raise ValueError("Quantity must be greater than or equal to 0.")
-        for item in self.items:
-            if item.name == name:
-                # If the item is already in the cart, update its quantity.
-                item.update_quantity(item.quantity + quantity)
-                return f"Updated {name} quantity to {item.quantity}"
+        item = self._items.get(name)
+        if item is not None:
+            # If the item is already in the cart, update its quantity.
+            item.update_quantity(item.quantity + quantity)
+            self._adjust_subtotal(item.price.cents * quantity)
+            return f"Updated {name} quantity to {item.quantity}"
 
         # If the item is not in the cart, add it as a new item.
-        new_item = CartItem(name, price, quantity)
-        self.items.append(new_item)
+        item = CartItem(name, price, quantity)
+        self._items[name] = item
+        self._adjust_subtotal(item.price.cents * quantity)
         return f"Added {name} to cart"
 
     def remove_item(self, name):
@@ -114,10 +158,10 @@ class Cart:
         Returns:
             str: A message indicating the item was removed.
         """
-        original_length = len(self.items)
-        self.items = [item for item in self.items if item.name!= name]
-        if len(self.items) == original_length:
+        item = self._items.pop(name, None)
+        if item is None:
             return f"{name} not found in cart"
+        self._adjust_subtotal(-item.price.cents * item.quantity)
         return f"Removed {name} from cart"
 
     def update_item_quantity(self, name, new_quantity):
@@ -136,23 +180,39 @@ class Cart:
         """
         if new_quantity < 0:
             raise ValueError("Quantity cannot be less than 0.")
-        for item in self.items:
-            if item.name == name:
-                item.update_quantity(new_quantity)
-                return f"Updated {name} quantity to {new_quantity}"
-        return f"{name} not found in cart"
+        item = self._items.get(name)
+        if item is None:
+            return f"{name} not found in cart"
+        old_quantity = item.quantity
+        item.update_quantity(new_quantity)
+        self._adjust_subtotal(item.price.cents * (new_quantity - old_quantity))
+        return f"Updated {name} quantity to {new_quantity}"
 
     def calculate_total(self):
         """
         Calculates the total cost of the items in the cart, including tax and delivery fee.
 
+        Tax is rounded to whole cents with TAX_ROUNDING, and the result is cached until the cart
+        next changes.
+
         Returns:
-            dict: A dictionary containing the subtotal, tax, delivery fee, and total cost.
+            dict: A dictionary containing the subtotal, tax, delivery fee, and total cost as Money.
+
+        Raises:
+            RuntimeError: If self_check is enabled and the running subtotal does not match the items.
         """
-        subtotal = sum(item.get_subtotal() for item in self.items)
-        tax = subtotal * self.TAX_RATE
-        total = subtotal + tax + self.DELIVERY_FEE
-        return {"subtotal": subtotal, "tax": tax, "delivery_fee": self.DELIVERY_FEE, "total": total}
+        if self.self_check:
+            expected = self._recompute_subtotal_cents()
+            if expected != self._subtotal_cents:
+                raise RuntimeError(f"Running subtotal is {self._subtotal_cents} cents "
+                                   f"but the items add up to {expected} cents.")
+        if self._totals is None:
+            subtotal = Money(self._subtotal_cents)
+            tax = subtotal.scale(self.TAX_RATE, self.TAX_ROUNDING)
+            delivery_fee = Money.from_amount(self.DELIVERY_FEE if self._delivery_fee is None else self._delivery_fee)
+            self._totals = {"subtotal": subtotal, "tax": tax, "delivery_fee": delivery_fee,
+                            "total": subtotal + tax + delivery_fee}
+        return dict(self._totals)
 
     def view_cart(self):
         """
@@ -161,7 +221,206 @@ class Cart:
         Returns:
             list: A list of dictionaries with each item's name, quantity, and subtotal price.
         """
-        return [{"name": item.name, "quantity": item.quantity, "subtotal": item.get_subtotal()} for item in self.items]
+        return [{"name": item.name, "quantity": item.quantity, "subtotal": item.get_subtotal()}
+                for item in self._items.values()]
+
+    def item_names(self):
+        """
+        Lists the names of the items in the cart without building CartItem copies.
+
+        Returns:
+            list: The item names, in the order they were added.
+        """
+        return list(self._items)
+
+    def _recompute_subtotal_cents(self):
+        """
+        Sums the subtotal from scratch, for the self-check.
+
+        Returns:
+            int: The subtotal of every item in the cart, in cents.
+        """
+        return sum(item.price.cents * item.quantity for item in self._items.values())
+
+    def set_delivery_fee(self, fee):
+        """
+        Sets the delivery fee for this cart, in place of the flat DELIVERY_FEE.
+
+        Args:
+            fee (Money or float): The delivery fee, or None to go back to DELIVERY_FEE.
+        """
+        fee = None if fee is None else Money.from_amount(fee)
+        if fee != self._delivery_fee:
+            self._delivery_fee = fee
+            self._totals = None
+
+    def _adjust_subtotal(self, delta_cents):
+        """
+        Moves the running subtotal by the given number of cents and drops the cached breakdown.
+
+        Args:
+            delta_cents (int): The change in the subtotal, in cents.
+        """
+        self._subtotal_cents += delta_cents
+        self._totals = None
+
+
+# CompactCart Class
+class CompactCart(Cart):
+    """
+    A Cart that stores its lines as parallel arrays instead of one CartItem object per line.
+
+    Names live in a list and prices (in cents) and quantities in typed arrays, with a name -> slot dictionary
+    for O(1) lookups. Removed lines leave a hole that is reclaimed once holes outnumber live lines,
+    so insertion order is kept without shifting the arrays. Meant for very large carts, such as
+    office catering orders, where the per-object overhead of CartItem adds up.
+
+    The items property builds CartItem objects on demand; changing them does not change the cart.
+    """
+    def __init__(self, self_check=False):
+        """
+        Initializes an empty CompactCart with no items.
+
+        Args:
+            self_check (bool): If True, every calculate_total call re-sums the items and raises
+                RuntimeError when the running subtotal has drifted.
+        """
+        super().__init__(self_check=self_check)
+        self._slots = {}
+        self._names = []
+        self._prices = array("q")
+        self._quantities = array("q")
+
+    @property
+    def items(self):
+        """
+        list: CartItem copies of the lines in the cart, in the order they were added.
+        """
+        return [CartItem(name, Money(price), quantity) for name, price, quantity in self._lines()]
+
+    def add_item(self, name, price, quantity):
+        """
+        Adds a new item to the cart or updates the quantity of an existing item.
+
+        Args:
+            name (str): Name of the item.
+            price (Money or float): Price of the item.
+            quantity (int): Quantity to be added to the cart.
+
+        Returns:
+            str: A message indicating whether the item was added or updated.
+
+        Raises:
+            ValueError: If the price is not greater than 0, the quantity is less than 0, or the name is empty.
+        """
+        if not name:
+            raise ValueError("Item name cannot be empty.")
+        price = Money.from_amount(price)
+        if price <= 0:
+            raise ValueError("Price must be greater than 0.")
+        if quantity < 0:
+            raise ValueError("Quantity must be greater than or equal to 0.")
+        slot = self._slots.get(name)
+        if slot is not None:
+            self._quantities[slot] += quantity
+            self._adjust_subtotal(self._prices[slot] * quantity)
+            return f"Updated {name} quantity to {self._quantities[slot]}"
+
+        self._slots[name] = len(self._names)
+        self._names.append(name)
+        self._prices.append(price.cents)
+        self._quantities.append(quantity)
+        self._adjust_subtotal(price.cents * quantity)
+        return f"Added {name} to cart"
+
+    def remove_item(self, name):
+        """
+        Removes an item from the cart by its name.
+
+        Args:
+            name (str): Name of the item to be removed.
+
+        Returns:
+            str: A message indicating the item was removed.
+        """
+        slot = self._slots.pop(name, None)
+        if slot is None:
+            return f"{name} not found in cart"
+        self._adjust_subtotal(-self._prices[slot] * self._quantities[slot])
+        self._names[slot] = None
+        if len(self._names) - len(self._slots) > max(64, len(self._slots)):
+            self._compact()
+        return f"Removed {name} from cart"
+
+    def update_item_quantity(self, name, new_quantity):
+        """
+        Updates the quantity of an item in the cart by its name.
+
+        Args:
+            name (str): Name of the item.
+            new_quantity (int): The new quantity for the item.
+
+        Returns:
+            str: A message indicating whether the item's quantity was updated or if the item was not found.
+
+        Raises:
+            ValueError: If the new quantity is less than 0.
+        """
+        if new_quantity < 0:
+            raise ValueError("Quantity cannot be less than 0.")
+        slot = self._slots.get(name)
+        if slot is None:
+            return f"{name} not found in cart"
+        self._adjust_subtotal(self._prices[slot] * (new_quantity - self._quantities[slot]))
+        self._quantities[slot] = new_quantity
+        return f"Updated {name} quantity to {new_quantity}"
+
+    def view_cart(self):
+        """
+        Provides a view of the items in the cart.
+
+        Returns:
+            list: A list of dictionaries with each item's name, quantity, and subtotal price.
+        """
+        return [{"name": name, "quantity": quantity, "subtotal": Money(price * quantity)}
+                for name, price, quantity in self._lines()]
+
+    def item_names(self):
+        """
+        Lists the names of the items in the cart.
+
+        Returns:
+            list: The item names, in the order they were added.
+        """
+        return list(self._slots)
+
+    def _lines(self):
+        """
+        Yields (name, price in cents, quantity) for each line in the cart, skipping removed slots.
+        """
+        prices, quantities = self._prices, self._quantities
+        for slot, name in enumerate(self._names):
+            if name is not None:
+                yield name, prices[slot], quantities[slot]
+
+    def _recompute_subtotal_cents(self):
+        """
+        Sums the subtotal from scratch, for the self-check.
+
+        Returns:
+            int: The subtotal of every item in the cart, in cents.
+        """
+        return sum(price * quantity for _, price, quantity in self._lines())
+
+    def _compact(self):
+        """
+        Rewrites the arrays without the slots of removed lines.
+        """
+        lines = list(self._lines())
+        self._names = [name for name, _, _ in lines]
+        self._prices = array("q", (price for _, price, _ in lines))
+        self._quantities = array("q", (quantity for _, _, quantity in lines))
+        self._slots = {name: slot for slot, name in enumerate(self._names)}
 
 
 # OrderPlacement Class
@@ -173,8 +432,14 @@ class OrderPlacement:
         cart (Cart): The shopping cart containing the items for the order.
         user_profile (UserProfile): The user's profile, including delivery address.
         restaurant_menu (RestaurantMenu): The menu containing available restaurant items.
+        order_ids (OrderIdGenerator): Generates the ID of each confirmed order.
+        delivery_pricing (DeliveryPricingEngine): Quotes the delivery fee and ETA, or None for the flat defaults.
+        restaurant_id (int): The restaurant's ID in delivery_pricing.
     """
-    def __init__(self, cart, user_profile, restaurant_menu):
+    DEFAULT_ESTIMATED_DELIVERY = "45 minutes"
+
+    def __init__(self, cart, user_profile, restaurant_menu, order_ids=None, delivery_pricing=None,
+                 restaurant_id=None):
         """
         Initializes an OrderPlacement object with the cart, user profile, and restaurant menu.
 
@@ -182,39 +447,114 @@ class OrderPlacement:
             cart (Cart): The shopping cart.
             user_profile (UserProfile): The user's profile.
             restaurant_menu (RestaurantMenu): The restaurant menu with available items.
+            order_ids (OrderIdGenerator): Generates order IDs; defaults to the process-wide generator.
+            delivery_pricing (DeliveryPricingEngine): Quotes per-order delivery fees and ETAs. Used when the
+                user profile has coordinates; otherwise the cart's flat fee and a 45 minute estimate apply.
+            restaurant_id (int): The restaurant's ID in delivery_pricing.
         """
         self.cart = cart
         self.user_profile = user_profile
         self.restaurant_menu = restaurant_menu
+        self.order_ids = default_generator if order_ids is None else order_ids
+        self.delivery_pricing = delivery_pricing
+        self.restaurant_id = restaurant_id
+        self.delivery_quote = None
+        self._quoted_for = None  # The (restaurant, latitude, longitude) delivery_quote was made for.
 
     def validate_order(self):
         """
         Validates the order by checking if the cart is empty and if all items are available in the restaurant menu.
 
+        With delivery pricing, the quote shown at checkout is kept; validation only fails if the
+        delivery address or restaurant has changed since. An order that was never checked out is
+        quoted here.
+
         Returns:
             dict: A dictionary indicating whether the order is valid and an accompanying message.
         """
-        if not self.cart.items:
+        names = self.cart.item_names()
+        if not names:
             return {"success": False, "message": "Cart is empty"}
 
-        # Validate the availability of each item in the cart.
-        for item in self.cart.items:
-            if not self.restaurant_menu.is_item_available(item.name):
-                return {"success": False, "message": f"{item.name} is not available"}
+        # Validate the availability of the whole cart in one call.
+        for name, available in zip(names, _check_availability(self.restaurant_menu, names)):
+            if not available:
+                return {"success": False, "message": f"{name} is not available"}
+        try:
+            self._check_delivery_quote()
+        except ValueError as error:
+            return {"success": False, "message": str(error)}
         return {"success": True, "message": "Order is valid"}
 
+    def quote_delivery(self):
+        """
+        Quotes the delivery fee and ETA for this order and applies the fee to the cart.
+
+        Returns:
+            dict: The quote from delivery_pricing, or None when the order uses the flat defaults.
+
+        Raises:
+            ValueError: If the restaurant is unknown or the address is outside the delivery area.
+        """
+        destination = self._delivery_destination()
+        if destination is None:
+            return None
+        self.delivery_quote = self.delivery_pricing.quote(*destination)
+        self._quoted_for = destination
+        self.cart.set_delivery_fee(self.delivery_quote["delivery_fee"])
+        return self.delivery_quote
+
+    def _delivery_destination(self):
+        """
+        Returns the (restaurant, latitude, longitude) to quote delivery for, or None for the flat defaults.
+        """
+        latitude = getattr(self.user_profile, "latitude", None)
+        longitude = getattr(self.user_profile, "longitude", None)
+        if self.delivery_pricing is None or latitude is None or longitude is None:
+            return None
+        return self.restaurant_id, latitude, longitude
+
+    def _check_delivery_quote(self):
+        """
+        Makes sure the order is charged the delivery fee it was quoted, quoting it first if it never was.
+
+        Raises:
+            ValueError: If the address cannot be delivered to, or has changed since the quote.
+        """
+        destination = self._delivery_destination()
+        if destination is None or self.delivery_quote is None:
+            self.quote_delivery()
+        elif destination != self._quoted_for:
+            self.delivery_pricing.quote(*destination)  # Raises if the new address is out of the delivery area.
+            raise ValueError("Delivery address changed since checkout; check out again.")
+
+    def estimated_delivery(self):
+        """
+        Returns:
+            str: The estimated delivery time from the latest delivery quote, e.g. "32 minutes".
+        """
+        if self.delivery_quote is None:
+            return self.DEFAULT_ESTIMATED_DELIVERY
+        return f"{self.delivery_quote['eta_minutes']} minutes"
+
     def proceed_to_checkout(self):
         """
-        Prepares the order for checkout by calculating the total and retrieving the delivery address.
+        Prepares the order for checkout by quoting delivery, calculating the total and retrieving the delivery address.
 
         Returns:
-            dict: A dictionary containing the cart items, total cost details, and delivery address.
+            dict: A dictionary containing the cart items, total cost details, delivery address and
+                estimated delivery time.
+
+        Raises:
+            ValueError: If delivery pricing is configured and cannot quote this address.
         """
+        self.quote_delivery()
         total_info = self.cart.calculate_total()
         return {
             "items": self.cart.view_cart(),
             "total_info": total_info,
             "delivery_address": self.user_profile.delivery_address,
+            "estimated_delivery": self.estimated_delivery(),
         }
 
     def confirm_order(self, payment_method):
@@ -237,14 +577,184 @@ class OrderPlacement:
         payment_success = payment_method.process_payment(self.cart.calculate_total()["total"])
 
         if payment_success:
-            return {
-                "success": True,
-                "message": "Order confirmed",
-                "order_id": "ORD123456",  # Simulate an order ID.
-                "estimated_delivery": "45 minutes"
-            }
+            return self._confirmation()
         raise PaymentFailedException("Payment failed")
 
+    @staticmethod
+    def confirm_orders(orders, payment_method, batch_size=256):
+        """
+        Confirms many orders at once, returning one result per order without letting a failure stop the batch.
+
+        Each restaurant menu is checked once, for every item name ordered from it, totals are read from
+        the carts' cached breakdowns, and payments are submitted in batches through
+        payment_method.process_payments when the payment method has it (one process_payment call
+        per order otherwise).
+
+        Args:
+            orders (list): The OrderPlacement objects to confirm.
+            payment_method (PaymentMethod): The method of payment to be used for every order.
+            batch_size (int): The largest number of payments submitted in one call.
+
+        Returns:
+            list: One dictionary per order, in input order. Confirmed orders get the same dictionary as
+                confirm_order; orders that fail validation get {"success": False, "message": "Order
+                validation failed", "reason": ...}; failed payments get {"success": False, "message":
+                "Payment failed", "error": PaymentFailedException or the exception raised by the gateway}.
+
+        Raises:
+            ValueError: If batch_size is not a positive integer.
+        """
+        if not isinstance(batch_size, int) or batch_size <= 0:
+            raise ValueError("Batch size must be a positive integer.")
+        orders = list(orders)
+        results = [None] * len(orders)
+
+        # Look each distinct item name up once per menu.
+        names_by_menu = {}
+        for order in orders:
+            menu_names = names_by_menu.setdefault(id(order.restaurant_menu), (order.restaurant_menu, set()))[1]
+            menu_names.update(order.cart.item_names())
+        unavailable = {}
+        for menu_id, (menu, names) in names_by_menu.items():
+            names = list(names)
+            unavailable[menu_id] = {name for name, available in zip(names, _check_availability(menu, names))
+                                    if not available}
+
+        payable = []
+        for index, order in enumerate(orders):
+            names = order.cart.item_names()
+            missing = unavailable[id(order.restaurant_menu)]
+            if not names:
+                reason = "Cart is empty"
+            else:
+                reason = next((f"{name} is not available" for name in names if name in missing), None)
+            if reason is None:
+                try:
+                    order._check_delivery_quote()
+                except ValueError as error:
+                    reason = str(error)
+            if reason is None:
+                payable.append((index, order.cart.calculate_total()["total"]))
+            else:
+                results[index] = {"success": False, "message": "Order validation failed", "reason": reason}
+
+        process_payments = getattr(payment_method, "process_payments", None)
+        for start in range(0, len(payable), batch_size):
+            batch = payable[start:start + batch_size]
+            amounts = [amount for _, amount in batch]
+            if process_payments is not None:
+                try:
+                    outcomes = list(process_payments(amounts))
+                except Exception as error:
+                    outcomes = [error] * len(batch)
+                if len(outcomes) != len(batch):
+                    error = PaymentFailedException("Payment batch returned the wrong number of results")
+                    outcomes = [error] * len(batch)
+            else:
+                outcomes = []
+                for amount in amounts:
+                    try:
+                        outcomes.append(payment_method.process_payment(amount))
+                    except Exception as error:
+                        outcomes.append(error)
+            for (index, _), outcome in zip(batch, outcomes):
+                if isinstance(outcome, Exception):
+                    results[index] = {"success": False, "message": "Payment failed", "error": outcome}
+                elif outcome:
+                    results[index] = orders[index]._confirmation()
+                else:
+                    results[index] = {"success": False, "message": "Payment failed",
+                                      "error": PaymentFailedException("Payment failed")}
+        return results
+
+    async def confirm_order_async(self, payment_method, timeout=None, limiter=None):
+        """
+        Confirms the order like confirm_order, awaiting the payment so the event loop stays free meanwhile.
+
+        Payment methods with a process_payment_async coroutine are awaited directly, and cancelled if
+        they time out. Others have their process_payment run in the loop's default executor, where a
+        timed-out payment cannot be stopped and may still go through, so it is reported as
+        {"success": False, "message": PAYMENT_OUTCOME_UNKNOWN} rather than as a failure that invites
+        a retry and a second charge.
+
+        Args:
+            payment_method (PaymentMethod): The method of payment to be used.
+            timeout (float): Seconds to wait for the payment before giving up, or None to wait indefinitely.
+            limiter (asyncio.Semaphore): Shared by concurrent calls to cap how many payments are in flight.
+
+        Returns:
+            dict: A dictionary indicating whether the order was confirmed and an order ID if successful.
+
+        Raises:
+            PaymentFailedException: If the payment fails, or a process_payment_async payment times out.
+        """
+        if not self.validate_order()["success"]:
+            return {"success": False, "message": "Order validation failed"}
+
+        amount = self.cart.calculate_total()["total"]
+        if limiter is None:
+            payment_success = await _charge_async(payment_method, amount, timeout)
+        else:
+            async with limiter:
+                payment_success = await _charge_async(payment_method, amount, timeout)
+
+        if payment_success is None:
+            return {"success": False, "message": PAYMENT_OUTCOME_UNKNOWN,
+                    "reason": f"Payment still running after {timeout} seconds"}
+        if payment_success:
+            return self._confirmation()
+        raise PaymentFailedException("Payment failed")
+
+    @staticmethod
+    async def confirm_orders_async(orders, payment_method, concurrency=100, timeout=None):
+        """
+        Confirms many orders concurrently, with at most `concurrency` payments in flight at once.
+
+        Args:
+            orders (list): The OrderPlacement objects to confirm.
+            payment_method (PaymentMethod): The method of payment to be used for every order.
+            concurrency (int): The largest number of payments awaited at the same time.
+            timeout (float): Seconds to wait for each payment, or None to wait indefinitely.
+
+        Returns:
+            list: One dictionary per order, in input order, shaped like the results of confirm_orders, or
+                {"success": False, "message": PAYMENT_OUTCOME_UNKNOWN, ...} for a payment that timed out
+                in the executor.
+
+        Raises:
+            ValueError: If concurrency is not a positive integer or timeout is not positive.
+        """
+        if not isinstance(concurrency, int) or concurrency <= 0:
+            raise ValueError("Concurrency must be a positive integer.")
+        if timeout is not None and timeout <= 0:
+            raise ValueError("Timeout must be greater than 0.")
+        limiter = asyncio.Semaphore(concurrency)
+        outcomes = await asyncio.gather(
+            *(order.confirm_order_async(payment_method, timeout=timeout, limiter=limiter) for order in orders),
+            return_exceptions=True)
+        results = []
+        for outcome in outcomes:
+            if isinstance(outcome, BaseException):
+                if not isinstance(outcome, Exception):
+                    raise outcome
+                outcome = {"success": False, "message": "Payment failed", "error": outcome}
+            results.append(outcome)
+        return results
+
+    def _confirmation(self):
+        """
+        Builds the result returned for a confirmed order.
+
+        Returns:
+            dict: The success flag, message, order ID and estimated delivery time.
+        """
+        return {
+            "success": True,
+            "message": "Order confirmed",
+            "order_id": self.order_ids.next_id(),
+            "estimated_delivery": self.estimated_delivery()
+        }
+
 
 # PaymentMethod Class
 class PaymentMethod:
@@ -256,7 +766,7 @@ class PaymentMethod:
         Processes the payment for the given amount.
 
         Args:
-            amount (float): The amount to be paid.
+            amount (Money): The amount to be paid.
 
         Returns:
             bool: True if the payment is successful, False otherwise.
@@ -265,6 +775,157 @@ class PaymentMethod:
             return True
         return False
 
+    def process_payments(self, amounts):
+        """
+        Processes a batch of payments, one result per amount.
+
+        Gateways that accept batched charges should override this; the default charges each amount in turn.
+
+        Args:
+            amounts (list): The amounts to be paid, as Money.
+
+        Returns:
+            list: For each amount, True if the payment succeeded, False otherwise.
+        """
+        return [self.process_payment(amount) for amount in amounts]
+
+
+# AsyncPaymentMethod Class
+class AsyncPaymentMethod(PaymentMethod):
+    """
+    A payment method that can also be awaited, for use with OrderPlacement.confirm_order_async.
+
+    Subclasses talking to a real gateway override process_payment_async with a non-blocking call;
+    the default simply calls process_payment.
+    """
+    async def process_payment_async(self, amount):
+        """
+        Processes the payment for the given amount without blocking the event loop.
+
+        Args:
+            amount (Money): The amount to be paid.
+
+        Returns:
+            bool: True if the payment is successful, False otherwise.
+        """
+        return self.process_payment(amount)
+
+
+# FakePaymentGateway Class (for simulating a remote payment gateway)
+class FakePaymentGateway(AsyncPaymentMethod):
+    """
+    A stand-in for a remote payment gateway that answers after an injected latency.
+
+    Attributes:
+        latency (float): Seconds each payment takes.
+        jitter (float): Up to this many extra seconds, drawn at random, are added to each payment.
+        decline_over (Money): Payments above this amount are declined, or None to accept all positive amounts.
+        in_flight (int): The number of payments currently being processed.
+        max_in_flight (int): The most payments that were ever processed at the same time.
+        calls (int): The number of payments processed so far.
+    """
+    def __init__(self, latency=0.05, jitter=0.0, decline_over=None, seed=None):
+        """
+        Initializes a FakePaymentGateway.
+
+        Args:
+            latency (float): Seconds each payment takes.
+            jitter (float): Maximum random extra seconds per payment.
+            decline_over (Money or float): Decline payments above this amount; None accepts all positive amounts.
+            seed (int): Seed for the jitter, for repeatable runs.
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.decline_over = None if decline_over is None else Money.from_amount(decline_over)
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.calls = 0
+        self._random = random.Random(seed)
+
+    def process_payment(self, amount):
+        """
+        Processes the payment, blocking for the gateway's latency.
+
+        Args:
+            amount (Money): The amount to be paid.
+
+        Returns:
+            bool: True if the payment is accepted, False if it is declined.
+        """
+        self._enter()
+        try:
+            time.sleep(self._delay())
+            return self._approve(amount)
+        finally:
+            self.in_flight -= 1
+
+    async def process_payment_async(self, amount):
+        """
+        Processes the payment, awaiting the gateway's latency.
+
+        Args:
+            amount (Money): The amount to be paid.
+
+        Returns:
+            bool: True if the payment is accepted, False if it is declined.
+        """
+        self._enter()
+        try:
+            await asyncio.sleep(self._delay())
+            return self._approve(amount)
+        finally:
+            self.in_flight -= 1
+
+    def _enter(self):
+        """
+        Counts a payment as started.
+        """
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def _delay(self):
+        """
+        Returns the latency for one payment, including jitter.
+        """
+        return self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+
+    def _approve(self, amount):
+        """
+        Decides whether a payment is accepted.
+        """
+        return amount > 0 and (self.decline_over is None or amount <= self.decline_over)
+
+
+async def _charge_async(payment_method, amount, timeout):
+    """
+    Awaits one payment, through process_payment_async when the payment method has it and in the
+    default executor otherwise.
+
+    Args:
+        payment_method (PaymentMethod): The method of payment to be used.
+        amount (Money): The amount to be paid.
+        timeout (float): Seconds to wait, or None to wait indefinitely.
+
+    Returns:
+        bool: True if the payment is successful, False otherwise, or None if a payment in the executor
+            did not complete within the timeout and may still go through.
+
+    Raises:
+        PaymentFailedException: If process_payment_async does not complete within the timeout.
+    """
+    charge = getattr(payment_method, "process_payment_async", None)
+    if charge is None:
+        call = asyncio.get_running_loop().run_in_executor(None, payment_method.process_payment, amount)
+    else:
+        call = charge(amount)
+    try:
+        return await asyncio.wait_for(call, timeout)
+    except asyncio.TimeoutError:
+        if charge is None:
+            return None  # The worker thread keeps running and cannot be told to stop.
+        raise PaymentFailedException(f"Payment timed out after {timeout} seconds") from None
+
 
 # UserProfile Class (for simulating the user's details)
 class UserProfile:
@@ -273,15 +934,21 @@ class UserProfile:
 
     Attributes:
         delivery_address (str): The user's delivery address.
+        latitude (float): Latitude of the delivery address, or None if it has not been geocoded.
+        longitude (float): Longitude of the delivery address, or None if it has not been geocoded.
     """
-    def __init__(self, delivery_address):
+    def __init__(self, delivery_address, latitude=None, longitude=None):
         """
         Initializes a UserProfile object with a delivery address.
 
         Args:
             delivery_address (str): The user's delivery address.
+            latitude (float): Latitude of the delivery address, if known.
+            longitude (float): Longitude of the delivery address, if known.
         """
         self.delivery_address = delivery_address
+        self.latitude = latitude
+        self.longitude = longitude
 
 
 # RestaurantMenu Class (for simulating available menu items)
@@ -313,6 +980,36 @@ class RestaurantMenu:
         """
         return item_name in self.available_items
 
+    def are_items_available(self, item_names):
+        """
+        Checks several items against the menu at once.
+
+        Args:
+            item_names (iterable): The names of the items to check.
+
+        Returns:
+            list: For each name, in order, True if the item is available and False otherwise.
+        """
+        available = self.available_items
+        return [name in available for name in item_names]
+
+
+def _check_availability(menu, item_names):
+    """
+    Checks items against a menu with one are_items_available call, or item by item for menus without it.
+
+    Args:
+        menu (RestaurantMenu): The menu, or any object with is_item_available, such as a MenuAvailabilityStore.
+        item_names (list): The names of the items to check.
+
+    Returns:
+        list: For each name, in order, True if the item is available and False otherwise.
+    """
+    check = getattr(menu, "are_items_available", None)
+    if check is None:
+        return [menu.is_item_available(name) for name in item_names]
+    return check(item_names)
+
 
 # 定义支付失败异常类
 class PaymentFailedException(Exception):
@@ -366,15 +1063,14 @@ class TestOrderPlacement(unittest.TestCase):
         self.cart.add_item("Pizza", 12.99, 1)
         result = self.order.proceed_to_checkout()
         expected_result = {
-            "items": [{"name": "Pizza", "quantity": 1, "subtotal": 12.99}],
-            "total_info": {"subtotal": 12.99, "tax": 1.3, "delivery_fee": 5.0, "total": 19.29},
+            "items": [{"name": "Pizza", "quantity": 1, "subtotal": Money(1299)}],
+            "total_info": {"subtotal": Money(1299), "tax": Money(130), "delivery_fee": Money(500),
+                           "total": Money(1929)},
             "delivery_address": "123 Main St"
         }
         self.assertEqual(result["items"], expected_result["items"])
         self.assertEqual(result["delivery_address"], expected_result["delivery_address"])
-        self.assertAlmostEqual(result["total_info"]["subtotal"], expected_result["total_info"]["subtotal"], places=2)
-        self.assertAlmostEqual(result["total_info"]["tax"], expected_result["total_info"]["tax"], places=2)
-        self.assertAlmostEqual(result["total_info"]["total"], expected_result["total_info"]["total"], places=2)
+        self.assertEqual(result["total_info"], expected_result["total_info"])
 
     def test_confirm_order_success(self):
         """
@@ -385,7 +1081,7 @@ class TestOrderPlacement(unittest.TestCase):
         result = self.order.confirm_order(payment_method)
         self.assertTrue(result["success"])
         self.assertEqual(result["message"], "Order confirmed")
-        self.assertEqual(result["order_id"], "ORD123456")
+        self.assertTrue(result["order_id"].startswith("ORD"))
 
     def test_confirm_order_failed_payment(self):
         """
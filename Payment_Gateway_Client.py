@@ -0,0 +1,527 @@
+import abc
+import asyncio
+import functools
+import itertools
+import json
+import random
+import threading
+
+from Money import Money
+
+DECLINED_CARD_NUMBER = "1111222233334444"
+
+
+class GatewayUnavailableError(ConnectionError):
+    """
+    Raised when a charge could not be sent to the payment gateway, so it was certainly not made.
+    Other timeouts and connection errors leave the charge's outcome unknown.
+    """
+    pass
+
+
+class _LoopThread:
+    """
+    An event loop running forever in a daemon thread, so blocking callers can share its connections.
+    """
+    def __init__(self, name):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name=name, daemon=True)
+        self._thread.start()
+
+    def run(self, coroutine):
+        """
+        Runs a coroutine on the loop and blocks until it finishes.
+        """
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+
+    def stop(self):
+        """
+        Stops the loop and waits for its thread to exit.
+        """
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
+
+
+# PaymentGatewayClient Class
+class PaymentGatewayClient(abc.ABC):
+    """
+    The interface PaymentProcessing uses to charge a card through a payment gateway.
+
+    Gateway responses are dictionaries with a "status" of "success" or "failure", like those of
+    PaymentProcessing.mock_payment_gateway.
+
+    A charge sent with an idempotency key must be passed on to the gateway with it, so that a charge
+    resent after a timeout is answered with the first charge's response instead of being made twice.
+    A client raises GatewayUnavailableError when a charge was not sent at all, and TimeoutError or
+    ConnectionError when it was sent but no response came back. Subclasses must implement charge;
+    charge_async runs it in the default executor unless overridden.
+    """
+    @abc.abstractmethod
+    def charge(self, method, details, amount, timeout=None, idempotency_key=None):
+        """
+        Charges a payment, blocking until the gateway answers.
+
+        Args:
+            method (str): The payment method (e.g., 'credit_card').
+            details (dict): The payment details.
+            amount (Money): The amount to charge.
+            timeout (float, optional): Seconds to wait for the gateway, overriding the client's default.
+            idempotency_key (str, optional): Identifies the payment to the gateway across resends.
+
+        Returns:
+            dict: The gateway's response.
+        """
+
+    async def charge_async(self, method, details, amount, timeout=None, idempotency_key=None):
+        """
+        Charges a payment without blocking the event loop.
+
+        Args:
+            method (str): The payment method (e.g., 'credit_card').
+            details (dict): The payment details.
+            amount (Money): The amount to charge.
+            timeout (float, optional): Seconds to wait for the gateway, overriding the client's default.
+            idempotency_key (str, optional): Identifies the payment to the gateway across resends.
+
+        Returns:
+            dict: The gateway's response.
+        """
+        charge = functools.partial(self.charge, method, details, amount, timeout, idempotency_key)
+        return await asyncio.get_running_loop().run_in_executor(None, charge)
+
+    def close(self):
+        """
+        Releases the client's connections.
+        """
+
+    async def close_async(self):
+        """
+        Releases the client's connections from within an event loop.
+        """
+        self.close()
+
+
+class _GatewayConnection:
+    """
+    One persistent connection to the gateway. Requests are pipelined: each is written as soon as it
+    is made and tagged with an id, and a reader task matches responses to requests by id, in any order.
+    """
+    def __init__(self, reader, writer):
+        self._reader = reader
+        self._writer = writer
+        self._ids = itertools.count()
+        self._pending = {}
+        self._drain_lock = asyncio.Lock()
+        self.closed = False
+        self._reader_task = asyncio.ensure_future(self._read_responses())
+
+    @property
+    def pending(self):
+        """
+        int: The number of requests waiting for a response.
+        """
+        return len(self._pending)
+
+    async def request(self, payload, sent):
+        """
+        Sends one request and waits for its response, setting sent["sent"] once the request is written.
+        """
+        if self.closed:
+            raise ConnectionError("Payment gateway connection closed.")
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            self._writer.write(json.dumps(dict(payload, id=request_id)).encode() + b"\n")
+            sent["sent"] = True
+            async with self._drain_lock:
+                await self._writer.drain()
+            return await future
+        finally:
+            # Also forgets requests that timed out, so a late response is dropped by the reader.
+            self._pending.pop(request_id, None)
+
+    async def close(self):
+        """
+        Closes the connection, failing any requests still waiting.
+        """
+        self._reader_task.cancel()
+        try:
+            await self._reader_task
+        except asyncio.CancelledError:
+            pass
+
+    async def _read_responses(self):
+        """
+        Resolves pending requests as their responses arrive, until the connection closes.
+        """
+        try:
+            while True:
+                line = await self._reader.readline()
+                if not line:
+                    break
+                response = json.loads(line)
+                future = self._pending.get(response.pop("id", None))
+                if future is not None and not future.done():
+                    future.set_result(response)
+        except (OSError, ValueError):
+            pass
+        finally:
+            self.closed = True
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("Payment gateway connection closed."))
+            self._writer.close()
+
+
+# PooledGatewayClient Class
+class PooledGatewayClient(PaymentGatewayClient):
+    """
+    A payment gateway client that keeps a bounded pool of persistent connections and pipelines
+    requests over them.
+
+    Each request goes to the connection with the fewest requests waiting, and a new connection is
+    opened only while every open one is busy and the pool is below pool_size. At most
+    pool_size * pipeline_depth requests are in flight; further requests wait for a slot. The
+    connections belong to the first event loop that uses the client: charge_async must be awaited on
+    that loop until it closes, while charge can be called from any other thread. A client first used
+    through charge runs its own loop in a background thread.
+
+    Attributes:
+        host (str): The gateway's host.
+        port (int): The gateway's port.
+        pool_size (int): The most connections kept open.
+        pipeline_depth (int): The most requests in flight on one connection.
+        timeout (float): Seconds to wait for each response, including any time spent connecting.
+    """
+    def __init__(self, host, port, pool_size=4, pipeline_depth=32, timeout=5.0):
+        """
+        Initializes a PooledGatewayClient. No connection is opened until the first request.
+
+        Args:
+            host (str): The gateway's host.
+            port (int): The gateway's port.
+            pool_size (int): The most connections to keep open.
+            pipeline_depth (int): The most requests in flight on one connection.
+            timeout (float): Seconds to wait for each response.
+
+        Raises:
+            ValueError: If pool_size, pipeline_depth or timeout is not positive.
+        """
+        if pool_size <= 0 or pipeline_depth <= 0 or timeout <= 0:
+            raise ValueError("Pool size, pipeline depth and timeout must be greater than 0.")
+        self.host = host
+        self.port = port
+        self.pool_size = pool_size
+        self.pipeline_depth = pipeline_depth
+        self.timeout = timeout
+        self._connections = []
+        self._loop = None
+        self._loop_thread = None
+        self._start_lock = threading.Lock()
+
+    def charge(self, method, details, amount, timeout=None, idempotency_key=None):
+        """
+        Charges a payment, blocking until the gateway answers.
+
+        Args:
+            method (str): The payment method (e.g., 'credit_card').
+            details (dict): The payment details.
+            amount (Money or float): The amount to charge.
+            timeout (float, optional): Seconds to wait for the response instead of the client's timeout.
+            idempotency_key (str, optional): Sent with the charge so the gateway makes it at most once.
+
+        Returns:
+            dict: The gateway's response.
+
+        Raises:
+            GatewayUnavailableError: If the charge could not be sent within the timeout.
+            TimeoutError: If the charge was sent but the gateway did not answer within the timeout.
+            ConnectionError: If the connection failed after the charge was sent.
+            RuntimeError: If called from the event loop the client's connections belong to.
+        """
+        return self._run(self.charge_async(method, details, amount, timeout, idempotency_key))
+
+    async def charge_async(self, method, details, amount, timeout=None, idempotency_key=None):
+        """
+        Charges a payment over a pooled connection.
+
+        Args:
+            method (str): The payment method (e.g., 'credit_card').
+            details (dict): The payment details.
+            amount (Money or float): The amount to charge.
+            timeout (float, optional): Seconds to wait for the response instead of the client's timeout.
+            idempotency_key (str, optional): Sent with the charge so the gateway makes it at most once.
+
+        Returns:
+            dict: The gateway's response.
+
+        Raises:
+            GatewayUnavailableError: If the charge could not be sent within the timeout.
+            TimeoutError: If the charge was sent but the gateway did not answer within the timeout.
+            ConnectionError: If the connection failed after the charge was sent.
+            RuntimeError: If the client's connections belong to another event loop.
+        """
+        self._bind(asyncio.get_running_loop())
+        payload = {"method": method, "details": details, "amount_cents": Money.from_amount(amount).cents}
+        if idempotency_key is not None:
+            payload["idempotency_key"] = idempotency_key
+        timeout = self.timeout if timeout is None else timeout
+        sent = {"sent": False}
+        async with self._slots:
+            try:
+                return await asyncio.wait_for(self._request(payload, sent), timeout)
+            except asyncio.TimeoutError:
+                if not sent["sent"]:
+                    raise GatewayUnavailableError(
+                        f"Could not reach the payment gateway within {timeout:g} seconds.") from None
+                raise TimeoutError(f"Payment gateway did not respond within {timeout:g} seconds.") from None
+            except OSError as error:
+                # Until the charge is written, a failure to connect or write means it was never made.
+                if sent["sent"] or isinstance(error, GatewayUnavailableError):
+                    raise
+                raise GatewayUnavailableError(f"Could not reach the payment gateway: {error}") from error
+
+    def close(self):
+        """
+        Closes every pooled connection, and the client's own event loop if it started one.
+        """
+        if self._loop is not None and not self._loop.is_closed():
+            self._run(self.close_async())
+        self._connections = []
+        if self._loop_thread is not None:
+            self._loop_thread.stop()
+            self._loop_thread = None
+            self._loop = None
+
+    async def close_async(self):
+        """
+        Closes every pooled connection. Requests made afterwards open new ones.
+        """
+        connections, self._connections = self._connections, []
+        for connection in connections:
+            await connection.close()
+
+    def _run(self, coroutine):
+        """
+        Runs a coroutine on the loop that owns the connections, starting a background loop if none does.
+        """
+        with self._start_lock:
+            if self._loop_thread is None and (self._loop is None or self._loop.is_closed()):
+                self._loop_thread = _LoopThread("payment-gateway-client")
+        loop = self._loop_thread.loop if self._loop_thread is not None else self._loop
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            coroutine.close()
+            raise RuntimeError("Use charge_async from the event loop that owns the gateway connections.")
+        return asyncio.run_coroutine_threadsafe(coroutine, loop).result()
+
+    def _bind(self, loop):
+        """
+        Ties the pool to the event loop it is first used from.
+        """
+        if self._loop is None or (self._loop is not loop and self._loop.is_closed()):
+            # Connections left from a loop that has since closed (e.g. an earlier asyncio.run) are unusable.
+            self._loop = loop
+            self._connections = []
+            self._connect_lock = asyncio.Lock()
+            self._slots = asyncio.Semaphore(self.pool_size * self.pipeline_depth)
+        elif self._loop is not loop:
+            raise RuntimeError("The gateway connections belong to another event loop.")
+
+    async def _request(self, payload, sent):
+        """
+        Sends one request over the least busy connection, setting sent["sent"] once it is written.
+        """
+        connection = self._least_busy()
+        if connection is None or (connection.pending and len(self._connections) < self.pool_size):
+            async with self._connect_lock:
+                # Another request may have opened a connection while this one waited for the lock.
+                connection = self._least_busy()
+                if connection is None or (connection.pending and len(self._connections) < self.pool_size):
+                    reader, writer = await asyncio.open_connection(self.host, self.port)
+                    connection = _GatewayConnection(reader, writer)
+                    self._connections.append(connection)
+        return await connection.request(payload, sent)
+
+    def _least_busy(self):
+        """
+        Drops closed connections and returns the open one with the fewest pending requests, or None.
+        """
+        self._connections = [connection for connection in self._connections if not connection.closed]
+        return min(self._connections, key=lambda connection: connection.pending, default=None)
+
+
+# LocalGatewayServer Class (a stand-in payment gateway for tests and benchmarks)
+class LocalGatewayServer:
+    """
+    A payment gateway stand-in listening on a localhost socket, speaking the line-delimited JSON that
+    PooledGatewayClient sends.
+
+    Requests on one connection are answered concurrently, each after the injected latency, so
+    responses can come back out of order. The card number 1111222233334444 is always declined. Like
+    a real gateway, the server remembers the response to each idempotency key it has been sent: a
+    charge resent with the same key gets the first response, waiting for it if the first charge is
+    still in progress, and is not charged again. Keys answered with a gateway error are forgotten.
+
+    Attributes:
+        latency (float): Seconds each request takes.
+        jitter (float): Up to this many extra seconds, drawn at random, are added to each request.
+        error_rate (float): The fraction of requests answered with a gateway error.
+        slow_rate (float): The fraction of requests that take slow_latency instead of latency.
+        slow_latency (float): Seconds a slow request takes.
+        connections (int): The number of connections accepted so far.
+        requests (int): The number of requests answered so far.
+        charges (int): The number of payments actually charged, which excludes resent charges.
+        in_flight (int): The number of requests currently being processed.
+        max_in_flight (int): The most requests that were ever processed at the same time.
+    """
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, slow_rate=0.0, slow_latency=0.0, seed=None):
+        """
+        Initializes a LocalGatewayServer. It does not listen until started.
+
+        Args:
+            latency (float): Seconds each request takes.
+            jitter (float): Maximum random extra seconds per request.
+            error_rate (float): The fraction of requests, from 0 to 1, answered with a gateway error.
+            slow_rate (float): The fraction of requests, from 0 to 1, that take slow_latency.
+            slow_latency (float): Seconds a slow request takes, to model a long latency tail.
+            seed (int): Seed for the jitter, errors and slow requests, for repeatable runs.
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.slow_rate = slow_rate
+        self.slow_latency = slow_latency
+        self.connections = 0
+        self.requests = 0
+        self.charges = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._random = random.Random(seed)
+        self._server = None
+        self._loop_thread = None
+        self._handlers = {}
+        self._responses = {}  # The response, or a future for it, by idempotency key.
+
+    def start(self):
+        """
+        Starts listening in a background thread.
+
+        Returns:
+            tuple: The (host, port) the server listens on.
+        """
+        self._loop_thread = _LoopThread("local-payment-gateway")
+        return self._loop_thread.run(self.start_async())
+
+    def close(self):
+        """
+        Stops a server started with start.
+        """
+        if self._loop_thread is not None:
+            self._loop_thread.run(self.close_async())
+            self._loop_thread.stop()
+            self._loop_thread = None
+
+    async def start_async(self, host="127.0.0.1", port=0):
+        """
+        Starts listening on the running event loop.
+
+        Args:
+            host (str): The address to listen on.
+            port (int): The port to listen on; 0 picks a free one.
+
+        Returns:
+            tuple: The (host, port) the server listens on.
+        """
+        self._server = await asyncio.start_server(self._serve, host, port)
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def close_async(self):
+        """
+        Stops listening, closes the open connections and waits for the server to shut down.
+        """
+        if self._server is not None:
+            self._server.close()
+            for writer in self._handlers.values():
+                writer.close()
+            await asyncio.gather(*self._handlers, return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _serve(self, reader, writer):
+        """
+        Reads requests from one connection and answers each in its own task.
+        """
+        self.connections += 1
+        handler = asyncio.current_task()
+        self._handlers[handler] = writer
+        tasks = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                task = asyncio.ensure_future(self._respond(json.loads(line), writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except (OSError, ValueError):
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            writer.close()
+            del self._handlers[handler]
+
+    async def _respond(self, request, writer):
+        """
+        Answers one request after the injected latency, or with the first response to its idempotency key.
+        """
+        key = request.get("idempotency_key")
+        earlier = self._responses.get(key) if key is not None else None
+        if earlier is not None:
+            response = await asyncio.shield(earlier)
+            self.requests += 1
+        else:
+            charged = asyncio.get_running_loop().create_future()
+            if key is not None:
+                self._responses[key] = charged
+            try:
+                response = await self._charge(request)
+            except BaseException:
+                self._responses.pop(key, None)
+                charged.cancel()
+                raise
+            charged.set_result(response)
+            if response.get("message") == "Gateway error":
+                self._responses.pop(key, None)
+        if not writer.is_closing():
+            writer.write(json.dumps(dict(response, id=request.get("id"))).encode() + b"\n")
+
+    async def _charge(self, request):
+        """
+        Processes one charge after the injected latency and returns the response.
+        """
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.slow_rate and self._random.random() < self.slow_rate:
+                delay = self.slow_latency
+            else:
+                delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+            await asyncio.sleep(delay)
+        finally:
+            self.in_flight -= 1
+        self.requests += 1
+        if self.error_rate and self._random.random() < self.error_rate:
+            return {"status": "failure", "message": "Gateway error"}
+        if request.get("details", {}).get("card_number") == DECLINED_CARD_NUMBER:
+            return {"status": "failure", "message": "Card declined"}
+        if request.get("amount_cents", 0) <= 0:
+            return {"status": "failure", "message": "Invalid amount"}
+        self.charges += 1
+        return {"status": "success", "transaction_id": f"txn{self.requests:08d}"}
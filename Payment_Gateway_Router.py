@@ -0,0 +1,322 @@
+import itertools
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from Circuit_Breaker import OPEN, CircuitOpenError
+from Payment_Gateway_Client import GatewayUnavailableError, PaymentGatewayClient
+
+POLICIES = ("ewma", "least_outstanding", "round_robin")
+
+
+class _Backend:
+    """
+    One gateway behind the router, with the load and latency figures routing decisions are based on.
+    """
+    __slots__ = ("name", "client", "payment_methods", "circuit_breaker", "outstanding", "ewma", "updated_at",
+                 "requests", "failures")
+
+    def __init__(self, name, client, payment_methods, circuit_breaker):
+        self.name = name
+        self.client = client
+        self.payment_methods = payment_methods
+        self.circuit_breaker = circuit_breaker
+        self.outstanding = 0
+        self.ewma = 0.0
+        self.updated_at = None
+        self.requests = 0
+        self.failures = 0
+
+
+# GatewayRouter Class
+class GatewayRouter(PaymentGatewayClient):
+    """
+    Spreads payments across several gateway backends, sending each to the best healthy backend that
+    supports its payment method.
+
+    With the "ewma" policy a backend's cost is its peak-EWMA latency times one more than its
+    outstanding requests. The estimate jumps straight up to a slow response and decays back over
+    decay_seconds, and while a backend is idle the estimate keeps fading so it is tried again
+    eventually. A failed request counts as a response taking failure_penalty seconds, so a backend
+    that fails fast does not look fast. "least_outstanding" picks the backend with the fewest
+    requests in flight, breaking ties by latency, and "round_robin" takes the backends in turn.
+
+    A backend that has not answered yet is estimated as fast as the fastest measured one, so it is
+    tried soon, and concurrent requests at start-up spread out by their outstanding counts instead
+    of all going to the first backend.
+
+    A backend can have its own CircuitBreaker. Backends whose breaker is open are skipped, and if
+    a breaker rejects a request or the backend cannot be reached the router tries the next backend.
+    A request that reached a gateway and failed is never resent elsewhere, since it may already
+    have charged the customer.
+    If such a request carried an idempotency key, resends with that key go to the same backend, whose
+    gateway recognises the key, until one of them gets an answer.
+    The router is a PaymentGatewayClient, so PaymentProcessing can use it as its gateway client.
+    """
+    MAX_UNSETTLED = 10_000  # Idempotency keys pinned to a backend at once; the oldest are forgotten first.
+
+    def __init__(self, policy="ewma", decay_seconds=10.0, failure_penalty=1.0, clock=time.monotonic):
+        """
+        Initializes a GatewayRouter with no backends.
+
+        Args:
+            policy (str): "ewma", "least_outstanding" or "round_robin".
+            decay_seconds (float): How quickly latency estimates recover after a slow response.
+            failure_penalty (float): The latency, in seconds, a failed request counts as.
+            clock (callable): Returns the current time in seconds; injectable for tests.
+
+        Raises:
+            ValueError: If the policy is unknown or decay_seconds is not positive.
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown routing policy: {policy}. Choose from {', '.join(POLICIES)}.")
+        if decay_seconds <= 0:
+            raise ValueError("decay_seconds must be greater than 0.")
+        self.policy = policy
+        self.decay_seconds = decay_seconds
+        self.failure_penalty = failure_penalty
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._backends = []
+        self._turns = itertools.count()
+        self._unsettled = OrderedDict()  # Backend name by idempotency key, for charges with no answer yet.
+
+    @property
+    def payment_methods(self):
+        """
+        list: The payment methods at least one backend supports, in the order they were first added.
+        """
+        methods = []
+        for backend in self._backends:
+            methods.extend(method for method in backend.payment_methods if method not in methods)
+        return methods
+
+    def add_backend(self, name, client, payment_methods=("credit_card",), circuit_breaker=None):
+        """
+        Adds a gateway backend.
+
+        Args:
+            name (str): A unique name for the backend, reported in responses and stats.
+            client (PaymentGatewayClient): The client that charges payments through the backend.
+            payment_methods (iterable): The payment methods the backend accepts.
+            circuit_breaker (CircuitBreaker, optional): Guards calls to this backend.
+
+        Raises:
+            ValueError: If a backend with the same name was already added.
+        """
+        if any(backend.name == name for backend in self._backends):
+            raise ValueError(f"Duplicate gateway backend: {name}")
+        self._backends.append(_Backend(name, client, tuple(payment_methods), circuit_breaker))
+
+    def charge(self, method, details, amount, timeout=None, idempotency_key=None):
+        """
+        Charges a payment through the best backend for its method, blocking until it answers.
+
+        Args:
+            method (str): The payment method (e.g., 'credit_card').
+            details (dict): The payment details.
+            amount (Money): The amount to charge.
+            timeout (float, optional): Seconds to wait, for backends without their own circuit breaker.
+            idempotency_key (str, optional): Passed on to the backend, and pins resends to it.
+
+        Returns:
+            dict: The gateway's response, with the backend's name under "gateway".
+
+        Raises:
+            ValueError: If no backend supports the method.
+            CircuitOpenError: If every backend for the method is rejecting requests.
+            GatewayUnavailableError: If no backend for the method could be reached.
+        """
+        error = None
+        for backend in self._ranked(method, idempotency_key):
+            started = self._start(backend)
+            try:
+                if backend.circuit_breaker is None:
+                    response = backend.client.charge(method, details, amount, timeout, idempotency_key)
+                else:
+                    response = backend.circuit_breaker.call(backend.client.charge, method, details, amount,
+                                                            idempotency_key=idempotency_key, pass_timeout=True)
+            except CircuitOpenError as rejected:
+                self._finish(backend, started, None)
+                error = rejected
+                continue
+            except GatewayUnavailableError as unavailable:
+                # The request never left, so the next backend may take it.
+                self._finish(backend, started, False)
+                self._settle(idempotency_key, backend, unavailable)
+                error = unavailable
+                continue
+            except BaseException as failure:
+                self._finish(backend, started, False)
+                self._settle(idempotency_key, backend, failure)
+                raise
+            self._finish(backend, started, True)
+            self._settle(idempotency_key, backend)
+            return dict(response, gateway=backend.name)
+        raise error
+
+    async def charge_async(self, method, details, amount, timeout=None, idempotency_key=None):
+        """
+        Charges a payment through the best backend for its method without blocking the event loop.
+
+        Args:
+            method (str): The payment method (e.g., 'credit_card').
+            details (dict): The payment details.
+            amount (Money): The amount to charge.
+            timeout (float, optional): Seconds to wait, for backends without their own circuit breaker.
+            idempotency_key (str, optional): Passed on to the backend, and pins resends to it.
+
+        Returns:
+            dict: The gateway's response, with the backend's name under "gateway".
+
+        Raises:
+            ValueError: If no backend supports the method.
+            CircuitOpenError: If every backend for the method is rejecting requests.
+            GatewayUnavailableError: If no backend for the method could be reached.
+        """
+        error = None
+        for backend in self._ranked(method, idempotency_key):
+            started = self._start(backend)
+            try:
+                if backend.circuit_breaker is None:
+                    response = await backend.client.charge_async(method, details, amount, timeout, idempotency_key)
+                else:
+                    response = await backend.circuit_breaker.call_async(backend.client.charge_async, method,
+                                                                        details, amount, None, idempotency_key)
+            except CircuitOpenError as rejected:
+                self._finish(backend, started, None)
+                error = rejected
+                continue
+            except GatewayUnavailableError as unavailable:
+                # The request never left, so the next backend may take it.
+                self._finish(backend, started, False)
+                self._settle(idempotency_key, backend, unavailable)
+                error = unavailable
+                continue
+            except BaseException as failure:
+                self._finish(backend, started, False)
+                self._settle(idempotency_key, backend, failure)
+                raise
+            self._finish(backend, started, True)
+            self._settle(idempotency_key, backend)
+            return dict(response, gateway=backend.name)
+        raise error
+
+    def close(self):
+        """
+        Closes every backend's client.
+        """
+        for backend in self._backends:
+            backend.client.close()
+
+    async def close_async(self):
+        """
+        Closes every backend's client from within an event loop.
+        """
+        for backend in self._backends:
+            await backend.client.close_async()
+
+    def stats(self):
+        """
+        Report each backend's load and latency, for metrics scraping.
+
+        Returns:
+            dict: For each backend name, its "outstanding", "requests" and "failures" counts, its latency
+                estimate "ewma_seconds" and its circuit breaker "state" ("closed" without a breaker).
+        """
+        with self._lock:
+            return {backend.name: {"outstanding": backend.outstanding, "requests": backend.requests,
+                                   "failures": backend.failures, "ewma_seconds": backend.ewma,
+                                   "state": "closed" if backend.circuit_breaker is None
+                                   else backend.circuit_breaker.state}
+                    for backend in self._backends}
+
+    def _ranked(self, method, idempotency_key=None):
+        """
+        Returns the backends that accept method, best first, with those whose breaker is open last. A key
+        whose earlier charge got no answer gets only the backend that charge went to.
+        """
+        backends = [backend for backend in self._backends if method in backend.payment_methods]
+        if not backends:
+            raise ValueError(f"No payment gateway supports the payment method: {method}")
+        with self._lock:
+            pinned = self._unsettled.get(idempotency_key)
+            if pinned is not None:
+                return [backend for backend in backends if backend.name == pinned] or backends
+            if self.policy == "round_robin":
+                turn = next(self._turns) % len(backends)
+                backends = backends[turn:] + backends[:turn]
+            else:
+                now = self._clock()
+                measured = [self._estimate(backend, now) for backend in backends if backend.updated_at is not None]
+                prior = min(measured) if measured else 1.0
+                # On a tie a backend that has never answered goes first, so each one gets measured.
+                if self.policy == "ewma":
+                    key = lambda backend: (self._estimate(backend, now, prior) * (backend.outstanding + 1),
+                                           backend.updated_at is not None)
+                else:
+                    key = lambda backend: (backend.outstanding, self._estimate(backend, now, prior),
+                                           backend.updated_at is not None)
+                backends.sort(key=key)
+        # An open breaker may have turned half-open by now; it gets its chance once the healthy ones are tried.
+        return sorted(backends, key=lambda backend: backend.circuit_breaker is not None
+                      and backend.circuit_breaker.state == OPEN)
+
+    def _settle(self, idempotency_key, backend, failure=None):
+        """
+        Pins a key to the backend whose gateway may have charged it without answering, or unpins it
+        once a charge with the key gets an answer.
+        """
+        if idempotency_key is None:
+            return
+        with self._lock:
+            unanswered = isinstance(failure, (TimeoutError, ConnectionError))
+            if not unanswered or isinstance(failure, GatewayUnavailableError):
+                self._unsettled.pop(idempotency_key, None)
+                return
+            self._unsettled[idempotency_key] = backend.name
+            self._unsettled.move_to_end(idempotency_key)
+            while len(self._unsettled) > self.MAX_UNSETTLED:
+                self._unsettled.popitem(last=False)
+
+    def _estimate(self, backend, now, prior=0.0):
+        """
+        Returns a backend's latency estimate, faded by how long it has been idle, or prior if it has
+        never answered.
+        """
+        if backend.updated_at is None:
+            return prior
+        if backend.outstanding:
+            return backend.ewma
+        return backend.ewma * math.exp(-(now - backend.updated_at) / self.decay_seconds)
+
+    def _start(self, backend):
+        """
+        Counts a request as in flight on a backend and returns its start time.
+        """
+        with self._lock:
+            backend.outstanding += 1
+            return self._clock()
+
+    def _finish(self, backend, started, succeeded):
+        """
+        Counts a request as finished and folds its latency into the backend's estimate. succeeded is None
+        for a request the backend's breaker rejected, which says nothing about latency.
+        """
+        with self._lock:
+            backend.outstanding -= 1
+            if succeeded is None:
+                return
+            now = self._clock()
+            backend.requests += 1
+            latency = now - started
+            if not succeeded:
+                backend.failures += 1
+                latency = max(latency, self.failure_penalty)
+            if latency >= backend.ewma or backend.updated_at is None:
+                backend.ewma = latency
+            else:
+                weight = math.exp(-(now - backend.updated_at) / self.decay_seconds)
+                backend.ewma = backend.ewma * weight + latency * (1 - weight)
+            backend.updated_at = now
@@ -1,6 +1,25 @@
 import unittest
 from unittest import mock
 
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; batch card validation falls back to a Python loop.
+    np = None
+
+from Idempotency_Store import IdempotencyStore
+from Money import Money
+from Payment_Gateway_Client import GatewayUnavailableError
+
+CARD_NUMBER_LENGTH = 16
+CVV_LENGTH = 3
+
+# Returned when a charge was sent but the gateway's answer was lost, so it may or may not have been made.
+PAYMENT_OUTCOME_UNKNOWN = "Error: Payment outcome unknown, retry with the same idempotency key"
+
+# Luhn doubles every second digit from the right and subtracts 9 from two-digit results.
+_LUHN_DOUBLED = (0, 2, 4, 6, 8, 1, 3, 5, 7, 9)
+_LUHN_DOUBLED_NUMPY = None if np is None else np.array(_LUHN_DOUBLED, dtype=np.uint8)
+
 # PaymentProcessing Class
 class PaymentProcessing:
     """
@@ -8,12 +27,30 @@ class PaymentProcessing:
 
     Attributes:
         available_gateways (list): A list of supported payment gateways such as 'credit_card' and 'paypal'.
+        gateway_client (PaymentGatewayClient): Charges payments through a real gateway, or None to use
+            mock_payment_gateway.
+        idempotency_store (IdempotencyStore): Remembers the outcome of payments made with an idempotency key.
+        circuit_breaker (CircuitBreaker): Guards the gateway call and sets its timeout, or None for no guard.
     """
-    def __init__(self):
+    def __init__(self, gateway_client=None, idempotency_store=None, circuit_breaker=None):
         """
         Initializes the PaymentProcessing class with available payment gateways.
+
+        Args:
+            gateway_client (PaymentGatewayClient): The client used to charge payments, or None to use
+                mock_payment_gateway. With a GatewayRouter, the payment methods its backends accept are
+                the ones available.
+            idempotency_store (IdempotencyStore): Where payment outcomes are kept by idempotency key;
+                defaults to an in-memory store.
+            circuit_breaker (CircuitBreaker): Fails payments fast while the gateway is failing or slow, and
+                gives the gateway client a timeout derived from recent latency. A charge cut off by that
+                timeout may still have gone through, so it is reported as PAYMENT_OUTCOME_UNKNOWN.
         """
-        self.available_gateways = ["credit_card", "paypal"]
+        # A router knows which payment methods its backends accept; add its backends before passing it in.
+        self.available_gateways = list(getattr(gateway_client, "payment_methods", None) or ["credit_card", "paypal"])
+        self.gateway_client = gateway_client
+        self.idempotency_store = IdempotencyStore() if idempotency_store is None else idempotency_store
+        self.circuit_breaker = circuit_breaker
 
     def validate_payment_method(self, payment_method, payment_details):
         """
@@ -60,7 +97,7 @@ class PaymentProcessing:
             return False
 
         # Check card number length and CVV length
-        if len(card_number) != 16 or len(cvv) != 3:
+        if len(card_number) != CARD_NUMBER_LENGTH or len(cvv) != CVV_LENGTH:
             return False
 
         # Check Luhn algorithm validation
@@ -92,37 +129,181 @@ class PaymentProcessing:
             total += num
         return total % 10 == 0
 
-    def process_payment(self, order, payment_method, payment_details):
+    def validate_credit_cards(self, details_list):
+        """
+        Validates many sets of credit card details at once, e.g. when re-checking stored cards.
+
+        Applies the same presence, length and Luhn checks as validate_credit_card. The card numbers that
+        pass the presence and length checks are packed into one byte buffer and checked together with
+        NumPy when it is installed. A card number with a character other than an ASCII digit is reported
+        as invalid rather than raising.
+
+        Args:
+            details_list (list): Dictionaries containing 'card_number', 'expiry_date', and 'cvv'.
+
+        Returns:
+            numpy.ndarray or list: For each set of details, in order, True if it is valid and False otherwise.
+                A NumPy boolean array when NumPy is installed, otherwise a list of bools.
+        """
+        positions = []
+        card_numbers = []
+        for position, details in enumerate(details_list):
+            card_number = details.get("card_number", "")
+            cvv = details.get("cvv", "")
+            if (isinstance(card_number, str) and len(card_number) == CARD_NUMBER_LENGTH
+                    and cvv and len(cvv) == CVV_LENGTH and details.get("expiry_date", "")):
+                positions.append(position)
+                card_numbers.append(card_number)
+
+        if np is None:
+            valid = [False] * len(details_list)
+            for position, card_number in zip(positions, card_numbers):
+                valid[position] = _luhn_valid(card_number)
+            return valid
+
+        valid = np.zeros(len(details_list), dtype=bool)
+        if card_numbers:
+            # Non-ASCII characters become "?", which keeps every card at 16 bytes and fails the digit check.
+            buffer = "".join(card_numbers).encode("ascii", errors="replace")
+            digits = np.frombuffer(buffer, dtype=np.uint8).reshape(-1, CARD_NUMBER_LENGTH) - np.uint8(48)
+            all_digits = (digits <= 9).all(axis=1)
+            digits = np.minimum(digits, 9)
+            # With an even number of digits the doubled ones are those at even offsets from the left.
+            totals = (_LUHN_DOUBLED_NUMPY[digits[:, 0::2]].sum(axis=1, dtype=np.int64)
+                      + digits[:, 1::2].sum(axis=1, dtype=np.int64))
+            valid[positions] = all_digits & (totals % 10 == 0)
+        return valid
+
+    def process_payment(self, order, payment_method, payment_details, idempotency_key=None):
         """
         Processes the payment for an order, validating the payment method and interacting with the payment gateway.
 
+        A retry made with the same idempotency key gets the first attempt's message without validating or
+        charging again, and concurrent attempts with the key share a single charge. Only attempts that
+        reach the gateway are remembered, so a retry after an "Error: ..." message is charged afresh.
+        The exception is a charge that was sent but timed out or lost its connection: it may have gone
+        through, so PAYMENT_OUTCOME_UNKNOWN is returned and remembered, and a retry with the key sends
+        the charge again with the same key, which the gateway answers without charging twice.
+
         Args:
-            order (dict): The order details, including total amount.
+            order (dict): The order details, including total amount as Money or a plain number.
             payment_method (str): The selected payment method.
             payment_details (dict): The details required for the payment method.
+            idempotency_key (str, optional): A key the client sends unchanged with every retry of one payment.
 
         Returns:
             str: A message indicating whether the payment was successful or failed.
         """
-        if payment_method not in ["credit_card"]:  # Assume that only credit_card is currently supported
+        if payment_method not in self._chargeable_methods():
             raise ValueError("Invalid payment method")
         try:
-            # Validate payment method and details
-            self.validate_payment_method(payment_method, payment_details)
+            if idempotency_key is None:
+                return self._charge(order, payment_method, payment_details)
+            return self.idempotency_store.run(
+                idempotency_key, lambda: self._charge(order, payment_method, payment_details, idempotency_key),
+                _payment_fingerprint(order, payment_method, payment_details), _outcome_unknown)
+
+        except Exception as e:
+            # Catch and return any validation or processing errors
+            return f"Error: {str(e)}"
 
-            # Simulate interaction with payment gateway
-            payment_response = self.mock_payment_gateway(payment_method, payment_details, order["total_amount"])
+    async def process_payment_async(self, order, payment_method, payment_details, idempotency_key=None):
+        """
+        Processes the payment for an order like process_payment, awaiting the gateway client instead of blocking.
 
-            # Return message based on payment gateway response
-            if payment_response["status"] == "success":
-                return "Payment successful, Order confirmed"
-            else:
-                return "Payment failed, please try again"
+        Args:
+            order (dict): The order details, including total amount as Money or a plain number.
+            payment_method (str): The selected payment method.
+            payment_details (dict): The details required for the payment method.
+            idempotency_key (str, optional): A key the client sends unchanged with every retry of one payment.
 
+        Returns:
+            str: A message indicating whether the payment was successful or failed.
+        """
+        if payment_method not in self._chargeable_methods():
+            raise ValueError("Invalid payment method")
+        try:
+            if idempotency_key is None:
+                return await self._charge_async(order, payment_method, payment_details)
+            return await self.idempotency_store.run_async(
+                idempotency_key, lambda: self._charge_async(order, payment_method, payment_details, idempotency_key),
+                _payment_fingerprint(order, payment_method, payment_details), _outcome_unknown)
         except Exception as e:
-            # Catch and return any validation or processing errors
             return f"Error: {str(e)}"
 
+    def _chargeable_methods(self):
+        """
+        Returns the payment methods process_payment can charge: every method a routing gateway client
+        accepts, and otherwise only credit cards.
+        """
+        return getattr(self.gateway_client, "payment_methods", None) or ["credit_card"]
+
+    def _charge(self, order, payment_method, payment_details, idempotency_key=None):
+        """
+        Validates the payment details and charges the order total, returning the resulting message.
+        """
+        self.validate_payment_method(payment_method, payment_details)
+
+        # Charge an exact amount in cents through the gateway client, or the simulated gateway without one.
+        amount = Money.from_amount(order["total_amount"])
+        breaker = self.circuit_breaker
+        try:
+            if breaker is None:
+                payment_response = self._call_gateway(payment_method, payment_details, amount,
+                                                      idempotency_key=idempotency_key)
+            else:
+                payment_response = breaker.call(self._call_gateway, payment_method, payment_details, amount,
+                                                idempotency_key=idempotency_key, pass_timeout=True)
+        except GatewayUnavailableError:
+            raise
+        except (TimeoutError, ConnectionError):
+            return PAYMENT_OUTCOME_UNKNOWN
+        return self._payment_message(payment_response)
+
+    async def _charge_async(self, order, payment_method, payment_details, idempotency_key=None):
+        """
+        Validates the payment details and charges the order total without blocking the event loop.
+        """
+        self.validate_payment_method(payment_method, payment_details)
+        amount = Money.from_amount(order["total_amount"])
+        try:
+            if self.circuit_breaker is None:
+                payment_response = await self._call_gateway_async(payment_method, payment_details, amount,
+                                                                  idempotency_key)
+            else:
+                payment_response = await self.circuit_breaker.call_async(self._call_gateway_async, payment_method,
+                                                                         payment_details, amount, idempotency_key)
+        except GatewayUnavailableError:
+            raise
+        except (TimeoutError, ConnectionError):
+            return PAYMENT_OUTCOME_UNKNOWN
+        return self._payment_message(payment_response)
+
+    def _call_gateway(self, payment_method, payment_details, amount, timeout=None, idempotency_key=None):
+        """
+        Sends one charge to the gateway client, or to mock_payment_gateway when there is no client.
+        """
+        if self.gateway_client is None:
+            return self.mock_payment_gateway(payment_method, payment_details, amount)
+        return self.gateway_client.charge(payment_method, payment_details, amount, timeout, idempotency_key)
+
+    async def _call_gateway_async(self, payment_method, payment_details, amount, idempotency_key=None):
+        """
+        Sends one charge to the gateway client without blocking, or to mock_payment_gateway when there is no client.
+        """
+        if self.gateway_client is None:
+            return self.mock_payment_gateway(payment_method, payment_details, amount)
+        return await self.gateway_client.charge_async(payment_method, payment_details, amount,
+                                                      idempotency_key=idempotency_key)
+
+    def _payment_message(self, payment_response):
+        """
+        Turns a gateway response into the message returned by process_payment.
+        """
+        if payment_response["status"] == "success":
+            return "Payment successful, Order confirmed"
+        return "Payment failed, please try again"
+
     def mock_payment_gateway(self, method, details, amount):
         """
         Simulates the interaction with a payment gateway for processing payments.
@@ -130,7 +311,7 @@ class PaymentProcessing:
         Args:
             method (str): The payment method (e.g., 'credit_card').
             details (dict): The payment details (e.g., card number).
-            amount (float): The amount to be charged.
+            amount (Money): The amount to be charged.
 
         Returns:
             dict: A mock response from the payment gateway, indicating success or failure.
@@ -143,6 +324,35 @@ class PaymentProcessing:
         return {"status": "success", "transaction_id": "abc123"}
 
 
+def _payment_fingerprint(order, payment_method, payment_details):
+    """
+    Identifies what a payment charges, so an idempotency key cannot be replayed for a different payment.
+    Only the last four digits of the card number are kept, since fingerprints may be written to disk.
+    """
+    card_number = str(payment_details.get("card_number", ""))
+    return f"{payment_method}:{Money.from_amount(order['total_amount']).cents}:{card_number[-4:]}"
+
+
+def _outcome_unknown(message):
+    """
+    Tells the idempotency store that a payment message is provisional and the charge must be resent.
+    """
+    return message == PAYMENT_OUTCOME_UNKNOWN
+
+
+def _luhn_valid(card_number):
+    """
+    Checks a card number with the Luhn algorithm, returning False if it is not all ASCII digits.
+    """
+    if not (card_number.isascii() and card_number.isdigit()):
+        return False
+    digits = card_number.encode("ascii")
+    doubled = digits[-2::-2]
+    total = sum(digits[-1::-2]) - 48 * (len(digits) - len(doubled))
+    total += sum(_LUHN_DOUBLED[digit - 48] for digit in doubled)
+    return total % 10 == 0
+
+
 # Unit tests for PaymentProcessing class
 class TestPaymentProcessing(unittest.TestCase):
     """
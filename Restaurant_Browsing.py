@@ -1,3 +1,15 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+import heapq
+from itertools import islice
+import time
+
+from Geospatial_Restaurant_Search import GeoGridIndex, validate_coordinates
+from Restaurant_Name_Search import RestaurantTextIndex
+from Search_Pagination import build_page, decode_cursor, select_page, validate_page_request
+
+
 class RestaurantBrowsing:
     """
     A class for browsing restaurants in a database based on various criteria like cuisine type, location, and rating.
@@ -6,6 +18,20 @@ class RestaurantBrowsing:
         database (RestaurantDatabase): An instance of RestaurantDatabase that holds restaurant data.
     """
 
+    # Keyset sort orders for search_page. Every key ends with the id so that keys are unique;
+    # "rating" matches the order of the rating index walked backwards (best first, newest on ties).
+    SORT_KEYS = {
+        "rating": lambda restaurant: (-restaurant['rating'], -restaurant['id']),
+        "name": lambda restaurant: (restaurant['name'], restaurant['id']),
+        "id": lambda restaurant: (restaurant['id'],),
+    }
+    # The element types of each sort key, which cursors from clients are checked against.
+    CURSOR_KEY_TYPES = {
+        "rating": ((int, float), int),
+        "name": (str, int),
+        "id": (int,),
+    }
+
     def __init__(self, database):
         """
         Initialize RestaurantBrowsing with a reference to a restaurant database.
@@ -30,8 +56,7 @@ class RestaurantBrowsing:
         """
         if not cuisine_type:
             raise ValueError("Cuisine type cannot be empty or None.")
-        return [restaurant for restaurant in self.database.get_restaurants()
-                if restaurant['cuisine'].lower() == cuisine_type.lower()]
+        return self.database.find(cuisine=cuisine_type)
 
     def search_by_location(self, location):
         """
@@ -48,8 +73,7 @@ class RestaurantBrowsing:
         """
         if not location:
             raise ValueError("Location cannot be empty or None.")
-        return [restaurant for restaurant in self.database.get_restaurants()
-                if restaurant['location'].lower() == location.lower()]
+        return self.database.find(location=location)
 
     def search_by_rating(self, min_rating):
         """
@@ -66,17 +90,111 @@ class RestaurantBrowsing:
         """
         if not (0 <= min_rating <= 5):
             raise ValueError("Minimum rating must be between 0 and 5.")
-        return [restaurant for restaurant in self.database.get_restaurants()
-                if restaurant['rating'] >= min_rating]
+        return self.database.find(min_rating=min_rating)
+
+    def search_by_rating_range(self, min_rating, max_rating):
+        """
+        Search for restaurants whose rating falls within an inclusive range.
+
+        Args:
+            min_rating (float): The lowest acceptable rating (e.g., 4.0).
+            max_rating (float): The highest acceptable rating (e.g., 4.5).
+
+        Returns:
+            list: A list of restaurants with min_rating <= rating <= max_rating.
 
-    def search_by_filters(self, cuisine_type=None, location=None, min_rating=None):
+        Raises:
+            ValueError: If either bound is outside 0 to 5 or the bounds are reversed.
+        """
+        if not (0 <= min_rating <= 5) or not (0 <= max_rating <= 5):
+            raise ValueError("Rating bounds must be between 0 and 5.")
+        if min_rating > max_rating:
+            raise ValueError("Minimum rating cannot exceed maximum rating.")
+        return self.database.find(min_rating=min_rating, max_rating=max_rating)
+
+    def top_rated(self, limit, cuisine_type=None, location=None):
         """
-        Search for restaurants based on multiple filters: cuisine type, location, and/or rating.
+        Return the best rated restaurants, optionally restricted to a cuisine and/or location.
+
+        Args:
+            limit (int): The maximum number of restaurants to return.
+            cuisine_type (str, optional): The type of cuisine to filter by.
+            location (str, optional): The location to filter by.
+
+        Returns:
+            list: Up to `limit` restaurants ordered from highest to lowest rating.
+
+        Raises:
+            ValueError: If the limit is not a positive integer.
+        """
+        if not isinstance(limit, int) or limit <= 0:
+            raise ValueError("Limit must be a positive integer.")
+        return self.database.top_rated(limit, cuisine=cuisine_type or None, location=location or None)
+
+    def get_facets(self):
+        """
+        Report the distinct cuisines and locations with the number of restaurants for each.
+
+        Returns:
+            dict: {"cuisine": {cuisine: count}, "location": {location: count}}, read from the
+                  vocabularies the database maintains, without scanning any rows.
+        """
+        return self.database.facets()
+
+    def search_by_name(self, query, limit=10, min_similarity=0.3):
+        """
+        Fuzzy search restaurant names and menu items, tolerating typos.
+
+        Args:
+            query (str): The text to search for (e.g., "piza").
+            limit (int): The maximum number of restaurants to return.
+            min_similarity (float): The minimum trigram similarity (0 to 1) of a match.
+
+        Returns:
+            list: Copies of the best matching restaurants, best first, each with an added
+                  "match_score" and "matched_text" (the name or menu item that matched).
+
+        Raises:
+            ValueError: If the query is empty or None, or the limit or similarity is invalid.
+        """
+        if not query:
+            raise ValueError("Search query cannot be empty or None.")
+        if not isinstance(limit, int) or limit <= 0:
+            raise ValueError("Limit must be a positive integer.")
+        return [dict(self.database.get_restaurant(restaurant_id), match_score=score, matched_text=text)
+                for score, restaurant_id, _, text in self.database.text_index.search(query, limit, min_similarity)]
+
+    def autocomplete(self, prefix, limit=10):
+        """
+        Suggest restaurants as the user types, by name or by any word of the name.
+
+        Args:
+            prefix (str): What the user has typed so far.
+            limit (int): The maximum number of suggestions.
+
+        Returns:
+            list: Up to `limit` restaurants; whole-name prefix matches come first.
+
+        Raises:
+            ValueError: If the limit is not a positive integer.
+        """
+        if not isinstance(limit, int) or limit <= 0:
+            raise ValueError("Limit must be a positive integer.")
+        if not prefix:
+            return []
+        return [self.database.get_restaurant(restaurant_id)
+                for restaurant_id in self.database.text_index.autocomplete(prefix, limit)]
+
+    def search_by_filters(self, cuisine_type=None, location=None, min_rating=None, near=None, radius_km=None):
+        """
+        Search for restaurants based on multiple filters: cuisine type, location, rating and/or distance.
 
         Args:
             cuisine_type (str, optional): The type of cuisine to filter by.
             location (str, optional): The location to filter by.
             min_rating (float, optional): The minimum acceptable rating to filter by.
+            near (tuple, optional): A (latitude, longitude) pair; requires radius_km.
+            radius_km (float, optional): Only keep restaurants within this distance of `near`.
 
         Returns:
             list: A list of restaurants that match all specified filters.
@@ -84,55 +202,172 @@ class RestaurantBrowsing:
         Raises:
             ValueError: If any of the filter parameters are invalid.
         """
-        results = self.database.get_restaurants()
-        valid_cuisines = {restaurant['cuisine'].lower() for restaurant in results}
-        valid_locations = {restaurant['location'].lower() for restaurant in results}
+        self._validate_filters(cuisine_type, location, min_rating)
+        if (near is None) != (radius_km is None):
+            raise ValueError("near and radius_km must be given together.")
+        return self.database.find(cuisine=cuisine_type or None, location=location or None,
+                                  min_rating=min_rating, near=near, radius_km=radius_km)
+
+    def search_nearby(self, latitude, longitude, limit=10, radius_km=None, cuisine_type=None, location=None,
+                      min_rating=None):
+        """
+        Find the restaurants closest to a location, optionally combined with the other filters.
+
+        Args:
+            latitude (float): The customer's latitude.
+            longitude (float): The customer's longitude.
+            limit (int): The maximum number of restaurants to return.
+            radius_km (float, optional): Ignore restaurants further away than this.
+            cuisine_type (str, optional): The type of cuisine to filter by.
+            location (str, optional): The location to filter by.
+            min_rating (float, optional): The minimum acceptable rating to filter by.
+
+        Returns:
+            list: Copies of the nearest restaurants, closest first, each with an added "distance_km".
+
+        Raises:
+            ValueError: If any of the parameters are invalid.
+        """
+        if not isinstance(limit, int) or limit <= 0:
+            raise ValueError("Limit must be a positive integer.")
+        self._validate_filters(cuisine_type, location, min_rating)
+        return [dict(restaurant, distance_km=round(distance, 3))
+                for distance, restaurant in self.database.nearest(latitude, longitude, limit,
+                                                                  cuisine=cuisine_type or None,
+                                                                  location=location or None,
+                                                                  min_rating=min_rating,
+                                                                  max_distance_km=radius_km)]
+
+    def iter_search(self, cuisine_type=None, location=None, min_rating=None):
+        """
+        Lazily stream the restaurants matching the filters instead of building a list.
+
+        Args:
+            cuisine_type (str, optional): The type of cuisine to filter by.
+            location (str, optional): The location to filter by.
+            min_rating (float, optional): The minimum acceptable rating to filter by.
+
+        Returns:
+            iterator: The matching restaurants, in no particular order.
+
+        Raises:
+            ValueError: If any of the filter parameters are invalid.
+        """
+        self._validate_filters(cuisine_type, location, min_rating)
+        return self.database.iter_find(cuisine=cuisine_type or None, location=location or None,
+                                       min_rating=min_rating)
 
-        if cuisine_type and cuisine_type.lower() not in valid_cuisines:
+    def search_page(self, limit=20, after=None, sort_by="rating", cuisine_type=None, location=None,
+                    min_rating=None):
+        """
+        Return one page of matching restaurants using keyset pagination.
+
+        Only the requested page is materialized: rating order walks the rating index from the
+        cursor position when the database has one, and other orders keep a heap of `limit + 1`
+        rows while streaming the matches.
+
+        Args:
+            limit (int): The maximum number of restaurants on the page.
+            after (str, optional): The next_cursor of the previous page; omit for the first page.
+            sort_by (str): "rating" (best first), "name" or "id" (insertion order).
+            cuisine_type (str, optional): The type of cuisine to filter by.
+            location (str, optional): The location to filter by.
+            min_rating (float, optional): The minimum acceptable rating to filter by.
+
+        Returns:
+            dict: {"results": [...], "next_cursor": str or None when there are no more pages}.
+
+        Raises:
+            ValueError: If the filters, limit, sort order or cursor are invalid.
+        """
+        validate_page_request(limit, sort_by, self.SORT_KEYS)
+        self._validate_filters(cuisine_type, location, min_rating)
+        key = self.SORT_KEYS[sort_by]
+        after_key = decode_cursor(after, sort_by, self.CURSOR_KEY_TYPES[sort_by]) if after else None
+        filters = dict(cuisine=cuisine_type or None, location=location or None, min_rating=min_rating)
+        if sort_by == "rating" and hasattr(self.database, "iter_by_rating"):
+            after_row = None if after_key is None else (-after_key[0], -after_key[1])
+            page = list(islice(self.database.iter_by_rating(after=after_row, **filters), limit + 1))
+            page, has_more = page[:limit], len(page) > limit
+        else:
+            page, has_more = select_page(self.database.iter_find(**filters), key, limit, after_key)
+        return build_page(page, has_more, key, sort_by)
+
+    def _validate_filters(self, cuisine_type, location, min_rating):
+        """
+        Check search filters against the database vocabularies.
+
+        Raises:
+            ValueError: If any of the filter parameters are invalid.
+        """
+        if cuisine_type and cuisine_type not in self.database.cuisine_vocabulary:
             raise ValueError(f"Invalid cuisine type: {cuisine_type}")
-        if location and location.lower() not in valid_locations:
+        if location and location not in self.database.location_vocabulary:
             raise ValueError(f"Invalid location: {location}")
         if min_rating is not None and not (0 <= min_rating <= 5):
             raise ValueError(f"Invalid minimum rating: {min_rating}")
 
-        if cuisine_type:
-            results = [restaurant for restaurant in results
-                       if restaurant['cuisine'].lower() == cuisine_type.lower()]
-        if location:
-            results = [restaurant for restaurant in results
-                       if restaurant['location'].lower() == location.lower()]
-        if min_rating is not None:
-            results = [restaurant for restaurant in results
-                       if restaurant['rating'] >= min_rating]
-
-        return results
-
 
 class RestaurantDatabase:
     """
     A simulated in-memory database that stores restaurant information.
 
+    Every row is addressed by an integer id assigned on insert. Alongside the rows the database
+    maintains case-folded inverted indexes (cuisine -> ids, location -> ids) and a rating index
+    (ratings sorted ascending with a parallel array of ids), all kept up to date on insert, update
+    and delete, so lookups never have to scan the whole table.
+
     Attributes:
         restaurants (list): A list of dictionaries, where each dictionary represents a restaurant with
-                            fields like name, cuisine, location, rating, price range, and delivery status.
+                            fields like id, name, cuisine, location, rating, price range, and delivery status.
+        cuisine_index (dict): Maps a case-folded cuisine to the set of ids of restaurants serving it.
+        location_index (dict): Maps a case-folded location to the set of ids of restaurants located there.
+        geo_index (GeoGridIndex): Positions of the restaurants that have "latitude" and "longitude" fields.
+        text_index (RestaurantTextIndex): Trigram and prefix indexes over names and "menu" item names.
+        cuisine_vocabulary (Vocabulary): The distinct cuisines with restaurant counts.
+        location_vocabulary (Vocabulary): The distinct locations with restaurant counts.
+        version (int): A generation counter incremented by every insert, update and delete.
     """
 
-    def __init__(self):
+    def __init__(self, restaurants=None):
         """
         Initialize the RestaurantDatabase with a predefined set of restaurant data.
+
+        Args:
+            restaurants (iterable, optional): Restaurant dictionaries to load instead of the predefined set.
         """
-        self.restaurants = [
-            {"name": "Italian Bistro", "cuisine": "Italian", "location": "Downtown", "rating": 4.5,
-             "price_range": "$$", "delivery": True},
-            {"name": "Sushi House", "cuisine": "Japanese", "location": "Midtown", "rating": 4.8,
-             "price_range": "$$$", "delivery": False},
-            {"name": "Burger King", "cuisine": "Fast Food", "location": "Uptown", "rating": 4.0,
-             "price_range": "$", "delivery": True},
-            {"name": "Taco Town", "cuisine": "Mexican", "location": "Downtown", "rating": 4.2,
-             "price_range": "$", "delivery": True},
-            {"name": "Pizza Palace", "cuisine": "Italian", "location": "Uptown", "rating": 3.9,
-             "price_range": "$$", "delivery": True}
-        ]
+        if restaurants is None:
+            restaurants = [
+                {"name": "Italian Bistro", "cuisine": "Italian", "location": "Downtown", "rating": 4.5,
+                 "price_range": "$$", "delivery": True, "latitude": 40.7075, "longitude": -74.0113},
+                {"name": "Sushi House", "cuisine": "Japanese", "location": "Midtown", "rating": 4.8,
+                 "price_range": "$$$", "delivery": False, "latitude": 40.7549, "longitude": -73.9840},
+                {"name": "Burger King", "cuisine": "Fast Food", "location": "Uptown", "rating": 4.0,
+                 "price_range": "$", "delivery": True, "latitude": 40.7870, "longitude": -73.9754},
+                {"name": "Taco Town", "cuisine": "Mexican", "location": "Downtown", "rating": 4.2,
+                 "price_range": "$", "delivery": True, "latitude": 40.7128, "longitude": -74.0060},
+                {"name": "Pizza Palace", "cuisine": "Italian", "location": "Uptown", "rating": 3.9,
+                 "price_range": "$$", "delivery": True, "latitude": 40.7831, "longitude": -73.9712}
+            ]
+        self._rows = {}
+        self._next_id = 0
+        self.version = 0
+        self.cuisine_vocabulary = Vocabulary()
+        self.location_vocabulary = Vocabulary()
+        self.cuisine_index = {}
+        self.location_index = {}
+        self.geo_index = GeoGridIndex()
+        self.text_index = RestaurantTextIndex()
+        self._ratings = array('d')
+        self._rating_ids = array('q')
+        self.bulk_load(restaurants)
+
+    @property
+    def restaurants(self):
+        """
+        list: A snapshot of all restaurant rows in insertion order.
+        """
+        return list(self._rows.values())
 
     def get_restaurants(self):
         """
@@ -141,7 +376,516 @@ class RestaurantDatabase:
         Returns:
             list: A list of dictionaries, where each dictionary contains restaurant information.
         """
-        return self.restaurants
+        return list(self._rows.values())
+
+    def get_restaurant(self, restaurant_id):
+        """
+        Retrieve a single restaurant by its id.
+
+        Args:
+            restaurant_id (int): The id assigned to the restaurant on insert.
+
+        Returns:
+            dict: The restaurant row.
+
+        Raises:
+            KeyError: If no restaurant has the given id.
+        """
+        return self._rows[restaurant_id]
+
+    def add_restaurant(self, restaurant):
+        """
+        Insert a restaurant and register it in the secondary indexes.
+
+        Args:
+            restaurant (dict): The restaurant fields (name, cuisine, location, rating, price_range, delivery).
+
+        Returns:
+            int: The id assigned to the new restaurant.
+
+        Raises:
+            ValueError: If the coordinates are invalid, or the name, cuisine, location, rating or menu
+                        has the wrong type.
+        """
+        restaurant_id = self._next_id
+        row = dict(restaurant, id=restaurant_id)
+        _check_indexed_fields(row)
+        if row.get('latitude') is not None and row.get('longitude') is not None:
+            validate_coordinates(row['latitude'], row['longitude'])
+        self._next_id += 1
+        self._rows[restaurant_id] = row
+        self._index_row(row)
+        self.version += 1
+        return restaurant_id
+
+    def update_restaurant(self, restaurant_id, **fields):
+        """
+        Update fields of an existing restaurant, re-indexing it if an indexed field changed. The name
+        and menu are re-indexed for text search, and the coordinates for geo search, only when they change.
+
+        Args:
+            restaurant_id (int): The id of the restaurant to update.
+            **fields: The fields to overwrite (e.g. rating=4.6, location="Midtown").
+
+        Returns:
+            dict: The updated restaurant row.
+
+        Raises:
+            KeyError: If no restaurant has the given id.
+            ValueError: If an attempt is made to change the restaurant id, the coordinates are invalid, or
+                        the name, cuisine, location, rating or menu would get the wrong type.
+        """
+        if "id" in fields and fields["id"] != restaurant_id:
+            raise ValueError("Restaurant id cannot be changed.")
+        row = self._rows[restaurant_id]
+        # Checked before the row is unindexed, so a rejected update leaves it as it was.
+        _check_indexed_fields(dict(row, **fields))
+        latitude = fields.get('latitude', row.get('latitude'))
+        longitude = fields.get('longitude', row.get('longitude'))
+        if latitude is not None and longitude is not None:
+            validate_coordinates(latitude, longitude)
+        text = any(field in fields and fields[field] != row.get(field) for field in ('name', 'menu'))
+        geo = any(field in fields and fields[field] != row.get(field) for field in ('latitude', 'longitude'))
+        self._unindex_row(row, text=text, geo=geo)
+        row.update(fields)
+        self._index_row(row, text=text, geo=geo)
+        self.version += 1
+        return row
+
+    def bulk_load(self, restaurants):
+        """
+        Insert many restaurants, building the secondary indexes once at the end.
+
+        Rows are stored as the iterable yields them, so it can be a generator streaming from a
+        file. The indexes are then built in a single pass, with the rating index sorted once
+        instead of shifted on every insert. If the iterable raises, a row has invalid coordinates
+        or a field the indexes cannot hold, or indexing fails, every row of this call is rolled back.
+
+        Args:
+            restaurants (iterable): Restaurant dictionaries.
+
+        Returns:
+            int: The number of restaurants loaded; they are assigned consecutive ids.
+
+        Raises:
+            ValueError: If a row has invalid coordinates, or a name, cuisine, location, rating or menu
+                        of the wrong type.
+        """
+        first_id = self._next_id
+        rows = []
+        indexing = False
+        try:
+            for restaurant in restaurants:
+                row = dict(restaurant, id=self._next_id)
+                _check_indexed_fields(row)
+                if row.get('latitude') is not None and row.get('longitude') is not None:
+                    validate_coordinates(row['latitude'], row['longitude'])
+                self._rows[self._next_id] = row
+                self._next_id += 1
+                rows.append(row)
+            indexing = True
+            self._index_rows(rows)
+        except Exception:
+            for row in rows:
+                del self._rows[row['id']]
+            self._next_id = first_id
+            if indexing:
+                self._rebuild_indexes()
+            raise
+        self.version += 1
+        return len(rows)
+
+    def remove_restaurant(self, restaurant_id):
+        """
+        Delete a restaurant and drop it from the secondary indexes.
+
+        Args:
+            restaurant_id (int): The id of the restaurant to delete.
+
+        Returns:
+            dict: The removed restaurant row.
+
+        Raises:
+            KeyError: If no restaurant has the given id.
+        """
+        row = self._rows.pop(restaurant_id)
+        self._unindex_row(row)
+        self.version += 1
+        return row
+
+    def facets(self):
+        """
+        Report the distinct cuisines and locations with their restaurant counts.
+
+        Returns:
+            dict: {"cuisine": {cuisine: count}, "location": {location: count}}.
+        """
+        return {"cuisine": self.cuisine_vocabulary.facets(), "location": self.location_vocabulary.facets()}
+
+    def find(self, cuisine=None, location=None, min_rating=None, max_rating=None, near=None, radius_km=None):
+        """
+        Answer a conjunctive query from the secondary indexes.
+
+        The estimated size of every predicate is known up front (the length of an id set, or the
+        width of a binary-searched rating slice), so the most selective one drives the lookup and
+        the others are checked against its candidates only.
+
+        Args:
+            cuisine (str, optional): The cuisine to match, case-insensitively.
+            location (str, optional): The location to match, case-insensitively.
+            min_rating (float, optional): The minimum acceptable rating.
+            max_rating (float, optional): The maximum acceptable rating.
+            near (tuple, optional): A (latitude, longitude) pair to search around.
+            radius_km (float, optional): The search radius around `near`.
+
+        Returns:
+            list: The matching restaurants in insertion order.
+        """
+        id_sets = self._id_sets(cuisine, location, near, radius_km)
+        has_rating = min_rating is not None or max_rating is not None
+        if has_rating:
+            low, high = self._rating_bounds(min_rating, max_rating)
+        if has_rating and (not id_sets or high - low < len(id_sets[0])):
+            matches = self._rating_ids[low:high]
+            if id_sets:
+                matches = id_sets[0].intersection(matches)
+                matches.intersection_update(*id_sets[1:])
+        elif id_sets:
+            matches = id_sets[0].intersection(*id_sets[1:])
+            if has_rating:
+                low_rating = float("-inf") if min_rating is None else min_rating
+                high_rating = float("inf") if max_rating is None else max_rating
+                matches = [restaurant_id for restaurant_id in matches
+                           if low_rating <= self._rows[restaurant_id]['rating'] <= high_rating]
+        else:
+            return list(self._rows.values())
+        return self._rows_in_order(matches)
+
+    def iter_find(self, cuisine=None, location=None, min_rating=None, max_rating=None, near=None, radius_km=None):
+        """
+        Lazily yield the restaurants matching a conjunctive query.
+
+        Rows are produced straight from the smallest matching id set (or the table when there is
+        no equality predicate) without collecting them, so memory does not grow with the result.
+
+        Returns:
+            iterator: The matching restaurants, in no particular order.
+        """
+        id_sets = self._id_sets(cuisine, location, near, radius_km)
+        low_rating = float("-inf") if min_rating is None else min_rating
+        high_rating = float("inf") if max_rating is None else max_rating
+        if id_sets:
+            others = id_sets[1:]
+            for restaurant_id in id_sets[0]:
+                if all(restaurant_id in id_set for id_set in others):
+                    row = self._rows[restaurant_id]
+                    if low_rating <= row['rating'] <= high_rating:
+                        yield row
+        else:
+            for row in self._rows.values():
+                if low_rating <= row['rating'] <= high_rating:
+                    yield row
+
+    def iter_by_rating(self, cuisine=None, location=None, min_rating=None, after=None):
+        """
+        Lazily yield matching restaurants from the highest rating down by walking the rating index.
+
+        Args:
+            cuisine (str, optional): The cuisine to match, case-insensitively.
+            location (str, optional): The location to match, case-insensitively.
+            min_rating (float, optional): Stop once ratings drop below this value.
+            after (tuple, optional): (rating, id) of the last row already seen; resume just below it.
+
+        Returns:
+            iterator: Restaurants ordered by rating descending, newest first on ties.
+        """
+        id_sets = self._id_sets(cuisine, location)
+        start = len(self._ratings) if after is None else self._rating_position(*after)
+        stop = 0 if min_rating is None else bisect_left(self._ratings, min_rating)
+        for position in range(start - 1, stop - 1, -1):
+            restaurant_id = self._rating_ids[position]
+            if all(restaurant_id in id_set for id_set in id_sets):
+                yield self._rows[restaurant_id]
+
+    def top_rated(self, limit, cuisine=None, location=None):
+        """
+        Return the highest rated restaurants matching the optional cuisine and location.
+
+        Without filters the answer is the tail of the rating index. With filters the rating
+        index is walked from the top until `limit` matches are found, unless the filtered id set
+        is small enough that a heap selection over it is cheaper; the table is never sorted.
+
+        Args:
+            limit (int): The maximum number of restaurants to return.
+            cuisine (str, optional): The cuisine to match, case-insensitively.
+            location (str, optional): The location to match, case-insensitively.
+
+        Returns:
+            list: Up to `limit` restaurants, highest rating first; ties favour the newest restaurant.
+        """
+        id_sets = self._id_sets(cuisine, location)
+        if not id_sets:
+            return [self._rows[restaurant_id] for restaurant_id in islice(reversed(self._rating_ids), limit)]
+        candidates = id_sets[0].intersection(*id_sets[1:]) if len(id_sets) > 1 else id_sets[0]
+        if limit * len(self._rows) < len(candidates) ** 2:
+            # Walking down the rating index expects len(rows) / len(candidates) steps per match.
+            ids = (restaurant_id for restaurant_id in reversed(self._rating_ids) if restaurant_id in candidates)
+        else:
+            ids = heapq.nlargest(limit, candidates,
+                                 key=lambda restaurant_id: (self._rows[restaurant_id]['rating'], restaurant_id))
+        return [self._rows[restaurant_id] for restaurant_id in islice(ids, limit)]
+
+    def nearest(self, latitude, longitude, k, cuisine=None, location=None, min_rating=None, max_distance_km=None):
+        """
+        Find the k restaurants closest to a location that also satisfy the other predicates.
+
+        Args:
+            latitude (float): The latitude of the query location.
+            longitude (float): The longitude of the query location.
+            k (int): The maximum number of restaurants to return.
+            cuisine (str, optional): The cuisine to match, case-insensitively.
+            location (str, optional): The location to match, case-insensitively.
+            min_rating (float, optional): The minimum acceptable rating.
+            max_distance_km (float, optional): Ignore restaurants further away than this.
+
+        Returns:
+            list: (distance_km, restaurant) pairs, closest first.
+        """
+        id_sets = self._id_sets(cuisine, location)
+        accept = None
+        if id_sets or min_rating is not None:
+            low_rating = float("-inf") if min_rating is None else min_rating
+
+            def accept(restaurant_id):
+                return (all(restaurant_id in id_set for id_set in id_sets)
+                        and self._rows[restaurant_id]['rating'] >= low_rating)
+        return [(distance, self._rows[restaurant_id])
+                for distance, restaurant_id in self.geo_index.nearest(latitude, longitude, k, accept=accept,
+                                                                      max_distance_km=max_distance_km)]
+
+    def count_by_rating(self, min_rating=None, max_rating=None):
+        """
+        Count restaurants within an inclusive rating range in O(log n).
+
+        Args:
+            min_rating (float, optional): The minimum rating.
+            max_rating (float, optional): The maximum rating.
+
+        Returns:
+            int: The number of restaurants whose rating falls within the range.
+        """
+        low, high = self._rating_bounds(min_rating, max_rating)
+        return max(0, high - low)
+
+    def _id_sets(self, cuisine, location, near=None, radius_km=None):
+        """
+        Look up the id sets of the given equality and radius predicates, smallest first.
+        """
+        id_sets = [index.get(_fold(value), _NO_IDS)
+                   for index, value in ((self.cuisine_index, cuisine), (self.location_index, location))
+                   if value is not None]
+        if near is not None:
+            id_sets.append({restaurant_id for _, restaurant_id in self.geo_index.within_radius(near[0], near[1],
+                                                                                                radius_km)})
+        id_sets.sort(key=len)
+        return id_sets
+
+    def _rating_bounds(self, min_rating, max_rating):
+        """
+        Binary-search the rating index for the slice covering an inclusive rating range.
+        """
+        low = 0 if min_rating is None else bisect_left(self._ratings, min_rating)
+        high = len(self._ratings) if max_rating is None else bisect_right(self._ratings, max_rating)
+        return low, max(low, high)
+
+    def _rating_position(self, rating, restaurant_id):
+        """
+        Locate the slot of (rating, id) in the rating index; equal ratings are ordered by id.
+        """
+        low = bisect_left(self._ratings, rating)
+        high = bisect_right(self._ratings, rating, low)
+        return bisect_left(self._rating_ids, restaurant_id, low, high)
+
+    def _rows_in_order(self, ids):
+        """
+        Materialize rows for a collection of ids in insertion order.
+
+        Sorting the ids costs O(k log k); once the matches are a sizeable fraction of the table a
+        single ordered pass with set membership tests is cheaper.
+        """
+        if len(ids) * _SORT_TO_SCAN_RATIO > len(self._rows):
+            ids = ids if isinstance(ids, (set, frozenset)) else set(ids)
+            return [row for restaurant_id, row in self._rows.items() if restaurant_id in ids]
+        return [self._rows[restaurant_id] for restaurant_id in sorted(ids)]
+
+    def _index_row(self, row, text=True, geo=True):
+        """
+        Add a row to the cuisine, location and rating indexes and the vocabularies, and unless text or
+        geo is False to the text or geo index.
+        """
+        if geo and row.get('latitude') is not None and row.get('longitude') is not None:
+            self.geo_index.insert(row['id'], row['latitude'], row['longitude'])
+        if text:
+            self.text_index.add(row['id'], row['name'], row.get('menu', ()))
+        self.cuisine_vocabulary.add(row['cuisine'])
+        self.location_vocabulary.add(row['location'])
+        self.cuisine_index.setdefault(_fold(row['cuisine']), set()).add(row['id'])
+        self.location_index.setdefault(_fold(row['location']), set()).add(row['id'])
+        position = self._rating_position(row['rating'], row['id'])
+        self._ratings.insert(position, row['rating'])
+        self._rating_ids.insert(position, row['id'])
+
+    def _index_rows(self, rows):
+        """
+        Add many rows to every index in one pass, sorting the rating index once.
+        """
+        cuisine_index, location_index = self.cuisine_index, self.location_index
+        ratings = list(zip(self._ratings, self._rating_ids))
+        for row in rows:
+            if row.get('latitude') is not None and row.get('longitude') is not None:
+                self.geo_index.insert(row['id'], row['latitude'], row['longitude'])
+            self.cuisine_vocabulary.add(row['cuisine'])
+            self.location_vocabulary.add(row['location'])
+            cuisine_index.setdefault(_fold(row['cuisine']), set()).add(row['id'])
+            location_index.setdefault(_fold(row['location']), set()).add(row['id'])
+            ratings.append((row['rating'], row['id']))
+        ratings.sort()
+        self._ratings = array('d', [rating for rating, _ in ratings])
+        self._rating_ids = array('q', [restaurant_id for _, restaurant_id in ratings])
+        self.text_index.add_many((row['id'], row['name'], row.get('menu', ())) for row in rows)
+
+    def _rebuild_indexes(self):
+        """
+        Rebuild every index and vocabulary from the stored rows, dropping whatever they held.
+        """
+        self.cuisine_vocabulary = Vocabulary()
+        self.location_vocabulary = Vocabulary()
+        self.cuisine_index = {}
+        self.location_index = {}
+        self.geo_index = GeoGridIndex(self.geo_index.cell_size)
+        self.text_index = RestaurantTextIndex()
+        self._ratings = array('d')
+        self._rating_ids = array('q')
+        self._index_rows(list(self._rows.values()))
+
+    def _unindex_row(self, row, text=True, geo=True):
+        """
+        Remove a row from the cuisine, location and rating indexes and the vocabularies, and unless text
+        or geo is False from the text or geo index.
+        """
+        self.cuisine_vocabulary.discard(row['cuisine'])
+        self.location_vocabulary.discard(row['location'])
+        if geo:
+            self.geo_index.remove(row['id'])
+        if text:
+            self.text_index.remove(row['id'])
+        for index, value in ((self.cuisine_index, row['cuisine']), (self.location_index, row['location'])):
+            key = _fold(value)
+            ids = index[key]
+            ids.discard(row['id'])
+            if not ids:
+                del index[key]
+        position = self._rating_position(row['rating'], row['id'])
+        del self._ratings[position]
+        del self._rating_ids[position]
+
+
+class Vocabulary:
+    """
+    The distinct values of a text column together with how many restaurants carry each one.
+
+    Values are compared case-insensitively; each is reported under the spelling it was first
+    added with. Membership tests and counts are O(1) and the vocabulary is updated
+    incrementally as rows change, so validating a search never requires scanning the table.
+
+    Attributes:
+        version (int): Incremented whenever a value is added or removed.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty vocabulary.
+        """
+        self._counts = {}
+        self._labels = {}
+        self.version = 0
+
+    def __contains__(self, value):
+        """
+        Check whether at least one restaurant carries the given value.
+        """
+        return _fold(value) in self._counts
+
+    def __len__(self):
+        """
+        Return the number of distinct values.
+        """
+        return len(self._counts)
+
+    def count(self, value):
+        """
+        Return how many restaurants carry the given value.
+        """
+        return self._counts.get(_fold(value), 0)
+
+    def add(self, value, count=1):
+        """
+        Record `count` more restaurants (one by default) carrying the given value.
+        """
+        key = _fold(value)
+        self._counts[key] = self._counts.get(key, 0) + count
+        self._labels.setdefault(key, value)
+        self.version += 1
+
+    def discard(self, value):
+        """
+        Record one restaurant fewer carrying the given value, forgetting it once unused.
+        """
+        key = _fold(value)
+        remaining = self._counts.get(key, 0) - 1
+        if remaining > 0:
+            self._counts[key] = remaining
+        elif key in self._counts:
+            del self._counts[key]
+            del self._labels[key]
+        self.version += 1
+
+    def facets(self):
+        """
+        Return a snapshot mapping each distinct value to its restaurant count.
+
+        Returns:
+            dict: {value: count} using the first-seen spelling of each value.
+        """
+        return {self._labels[key]: count for key, count in self._counts.items()}
+
+
+_NO_IDS = frozenset()
+
+# Above 1/8 of the table, an ordered scan beats sorting the matching ids.
+_SORT_TO_SCAN_RATIO = 8
+
+
+def _fold(value):
+    """
+    Normalize a text field for case-insensitive index lookups.
+    """
+    return value.casefold()
+
+
+def _check_indexed_fields(row):
+    """
+    Reject a row whose indexed fields have types the indexes cannot hold.
+    """
+    for field in ('name', 'cuisine', 'location'):
+        if not isinstance(row.get(field), str):
+            raise ValueError(f"Invalid {field}: {row.get(field)!r}")
+    rating = row.get('rating')
+    if isinstance(rating, bool) or not isinstance(rating, (int, float)):
+        raise ValueError(f"Invalid rating: {rating!r}")
+    menu = row.get('menu', ())
+    if not isinstance(menu, (list, tuple)) or not all(isinstance(item, str) for item in menu):
+        raise ValueError(f"Invalid menu: {menu!r}")
 
 
 class RestaurantSearch:
@@ -150,16 +894,22 @@ class RestaurantSearch:
 
     Attributes:
         browsing (RestaurantBrowsing): An instance of RestaurantBrowsing used to perform searches.
+        cache (SearchResultCache): The result cache consulted before querying, or None to disable caching.
     """
 
-    def __init__(self, browsing):
+    def __init__(self, browsing, cache=None, use_cache=True):
         """
         Initialize the RestaurantSearch with a reference to a RestaurantBrowsing instance.
 
         Args:
             browsing (RestaurantBrowsing): An instance of the RestaurantBrowsing class.
+            cache (SearchResultCache, optional): A cache to share; a private one is created by default.
+            use_cache (bool): Set to False to always query the database.
         """
         self.browsing = browsing
+        if cache is None and use_cache:
+            cache = SearchResultCache()
+        self.cache = cache
 
     def search_restaurants(self, cuisine=None, location=None, rating=None):
         """
@@ -171,10 +921,159 @@ class RestaurantSearch:
             rating (float, optional): The minimum rating to filter by.
 
         Returns:
-            list: A list of restaurants that match the provided search criteria.
+            list: A list of restaurants that match the provided search criteria. Every call returns its
+                  own copies, so changing them affects neither the cache nor the database.
+        """
+        if self.cache is None:
+            return self.browsing.search_by_filters(cuisine_type=cuisine, location=location, min_rating=rating)
+
+        key = (_fold(cuisine) if cuisine else None, _fold(location) if location else None,
+               None if rating is None else float(rating))
+        database = self.browsing.database
+        snapshot = self.cache.get(key, database.version, database)
+        if snapshot is None:
+            results = self.browsing.search_by_filters(cuisine_type=cuisine, location=location, min_rating=rating)
+            snapshot = tuple(_copy_value(restaurant) for restaurant in results)
+            self.cache.put(key, database.version, snapshot, database)
+        return [_copy_value(restaurant) for restaurant in snapshot]
+
+
+class SearchResultCache:
+    """
+    A bounded LRU cache of search results with a time-to-live, invalidated on database writes.
+
+    Every entry is tagged with the database, and the database version, it was computed from. As
+    soon as a lookup arrives for another database or a newer version, all entries are dropped, so a
+    result is never served for data other than the data it was derived from.
+
+    Attributes:
+        max_entries (int): The maximum number of cached queries before the least recently used is evicted.
+        ttl (float): The number of seconds an entry stays valid, or None for no expiry.
+        hits (int): Lookups answered from the cache.
+        misses (int): Lookups that had to query the database.
+        evictions (int): Entries dropped to respect max_entries.
+        expirations (int): Entries dropped because their TTL elapsed.
+        invalidations (int): Times the cache was cleared because the database changed.
+    """
+
+    def __init__(self, max_entries=1024, ttl=60.0, clock=time.monotonic):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_entries (int): The maximum number of cached queries.
+            ttl (float, optional): Seconds before an entry expires; None disables expiry.
+            clock (callable): Returns the current time in seconds; injectable for tests.
+
+        Raises:
+            ValueError: If max_entries is not positive or ttl is not positive.
+        """
+        if max_entries <= 0:
+            raise ValueError("max_entries must be greater than 0.")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl must be greater than 0.")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._source = None
+        self._version = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def __len__(self):
+        """
+        Return the number of cached queries.
+        """
+        return len(self._entries)
+
+    def get(self, key, version, source=None):
+        """
+        Look up a cached result.
+
+        Args:
+            key (tuple): The normalized query.
+            version (int): The current database version.
+            source (object, optional): The database being queried.
+
+        Returns:
+            tuple: The cached snapshot, or None on a miss.
+        """
+        self._check_version(version, source)
+        entry = self._entries.get(key)
+        if entry is not None and self.ttl is not None and entry[0] <= self._clock():
+            del self._entries[key]
+            self.expirations += 1
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key, version, snapshot, source=None):
+        """
+        Store a result computed at the given database version.
+
+        Args:
+            key (tuple): The normalized query.
+            version (int): The database version the snapshot was computed at.
+            snapshot (tuple): The result, which callers must not modify.
+            source (object, optional): The database the snapshot was computed from.
+        """
+        self._check_version(version, source)
+        expires_at = None if self.ttl is None else self._clock() + self.ttl
+        self._entries[key] = (expires_at, snapshot)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """
+        Drop every cached entry.
+        """
+        self._entries.clear()
+
+    def stats(self):
+        """
+        Report the cache counters.
+
+        Returns:
+            dict: The size and the hit, miss, eviction, expiration and invalidation counts.
+        """
+        return {"size": len(self._entries), "hits": self.hits, "misses": self.misses,
+                "evictions": self.evictions, "expirations": self.expirations,
+                "invalidations": self.invalidations}
+
+    def _check_version(self, version, source):
+        """
+        Drop all entries if they were cached for another database or the database has changed since.
         """
-        results = self.browsing.search_by_filters(cuisine_type=cuisine, location=location, min_rating=rating)
-        return results
+        # The database itself is kept rather than its id(), which a new database could reuse.
+        if source is not self._source or version != self._version:
+            if self._entries:
+                self._entries.clear()
+                self.invalidations += 1
+            self._source = source
+            self._version = version
+
+
+def _copy_value(value):
+    """
+    Copy a restaurant field value, recursing into dicts and lists so no nested value is shared.
+    """
+    if isinstance(value, dict):
+        return {key: _copy_value(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy_value(item) for item in value]
+    if isinstance(value, tuple):
+        return tuple(_copy_value(item) for item in value)
+    return value
 
 
 # Unit tests for RestaurantBrowsing class
@@ -0,0 +1,156 @@
+import csv
+import json
+import os
+import time
+
+from Geospatial_Restaurant_Search import validate_coordinates
+
+REQUIRED_FIELDS = ("name", "cuisine", "location", "rating", "price_range", "delivery")
+PRICE_RANGES = ("$", "$$", "$$$", "$$$$")
+_TRUE = {"true", "yes", "y", "1"}
+_FALSE = {"false", "no", "n", "0"}
+
+
+def read_catalog(path, file_format=None):
+    """
+    Stream raw records from a CSV or JSON Lines catalog file, one line at a time.
+
+    Args:
+        path (str): The catalog file.
+        file_format (str, optional): "csv" or "jsonl"; inferred from the file extension when omitted.
+
+    Yields:
+        tuple: (line_number, record) where record is the dictionary read from that line.
+
+    Raises:
+        ValueError: If the format is unknown or a JSON line is not an object.
+    """
+    file_format = file_format or os.path.splitext(path)[1].lstrip(".").lower()
+    if file_format == "ndjson":
+        file_format = "jsonl"
+    if file_format not in ("csv", "jsonl"):
+        raise ValueError(f"Unsupported catalog format: {file_format!r}")
+    with open(path, newline="", encoding="utf-8") as handle:
+        if file_format == "csv":
+            reader = csv.DictReader(handle)
+            for record in reader:
+                yield reader.line_num, record
+        else:
+            for line_number, line in enumerate(handle, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError as error:
+                    raise ValueError(f"Line {line_number}: invalid JSON ({error})")
+                if not isinstance(record, dict):
+                    raise ValueError(f"Line {line_number}: expected a JSON object.")
+                yield line_number, record
+
+
+def validate_restaurant(record):
+    """
+    Check a raw catalog record and convert its fields to the types RestaurantDatabase stores.
+
+    CSV values arrive as strings: ratings and coordinates are parsed as floats, delivery accepts
+    true/false, yes/no or 1/0, and a menu is a "|"-separated list of item names (a JSON list of
+    strings is accepted too). Empty optional fields are dropped and unknown fields are kept as they are.
+
+    Args:
+        record (dict): The raw record.
+
+    Returns:
+        dict: The cleaned restaurant.
+
+    Raises:
+        ValueError: If a required field is missing or any field is invalid.
+    """
+    for field in REQUIRED_FIELDS:
+        if record.get(field) in (None, ""):
+            raise ValueError(f"Missing required field: {field}")
+    restaurant = {key: value for key, value in record.items() if key is not None and value not in (None, "")}
+    restaurant.pop("id", None)
+    for field in ("name", "cuisine", "location"):
+        restaurant[field] = str(restaurant[field]).strip()
+        if not restaurant[field]:
+            raise ValueError(f"Missing required field: {field}")
+    try:
+        restaurant["rating"] = float(restaurant["rating"])
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid rating: {record['rating']!r}")
+    if not (0 <= restaurant["rating"] <= 5):
+        raise ValueError(f"Invalid rating: {record['rating']!r}")
+    if restaurant["price_range"] not in PRICE_RANGES:
+        raise ValueError(f"Invalid price range: {record['price_range']!r}")
+    delivery = restaurant["delivery"]
+    if not isinstance(delivery, bool):
+        flag = str(delivery).strip().lower()
+        if flag not in _TRUE and flag not in _FALSE:
+            raise ValueError(f"Invalid delivery flag: {delivery!r}")
+        restaurant["delivery"] = flag in _TRUE
+    if ("latitude" in restaurant) != ("longitude" in restaurant):
+        raise ValueError("latitude and longitude must be given together.")
+    if "latitude" in restaurant:
+        try:
+            restaurant["latitude"] = float(restaurant["latitude"])
+            restaurant["longitude"] = float(restaurant["longitude"])
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid coordinates: {record['latitude']!r}, {record['longitude']!r}")
+        validate_coordinates(restaurant["latitude"], restaurant["longitude"])
+    if "menu" in restaurant:
+        menu = restaurant["menu"]
+        if isinstance(menu, str):
+            menu = menu.split("|")
+        elif not isinstance(menu, list) or not all(isinstance(item, str) for item in menu):
+            raise ValueError(f"Invalid menu: {record['menu']!r}")
+        restaurant["menu"] = [item.strip() for item in menu if item.strip()]
+    return restaurant
+
+
+def load_catalog(database, path, file_format=None, skip_invalid=False, max_errors=100):
+    """
+    Stream a catalog file into a database, validating every row.
+
+    Rows are read and validated one at a time and handed to the database's `bulk_load`, which
+    stores them as they arrive and builds the secondary indexes in a single pass once the file
+    is exhausted. Databases without `bulk_load` fall back to one add_restaurant call per row.
+
+    Args:
+        database (RestaurantDatabase): The database to load into.
+        path (str): The CSV or JSON Lines catalog file.
+        file_format (str, optional): "csv" or "jsonl"; inferred from the file extension when omitted.
+        skip_invalid (bool): Skip and report invalid rows instead of failing the whole load.
+        max_errors (int): The maximum number of error messages kept in the report.
+
+    Returns:
+        dict: {"loaded": int, "skipped": int, "errors": [str], "seconds": float, "rows_per_second": float}.
+
+    Raises:
+        ValueError: If a row is invalid and skip_invalid is False; nothing is loaded in that case
+                    when the database supports bulk_load.
+    """
+    report = {"loaded": 0, "skipped": 0, "errors": []}
+
+    def restaurants():
+        for line_number, record in read_catalog(path, file_format):
+            try:
+                restaurant = validate_restaurant(record)
+            except ValueError as error:
+                if not skip_invalid:
+                    raise ValueError(f"Line {line_number}: {error}")
+                report["skipped"] += 1
+                if len(report["errors"]) < max_errors:
+                    report["errors"].append(f"Line {line_number}: {error}")
+                continue
+            yield restaurant
+
+    start = time.perf_counter()
+    if hasattr(database, "bulk_load"):
+        report["loaded"] = database.bulk_load(restaurants())
+    else:
+        for restaurant in restaurants():
+            database.add_restaurant(restaurant)
+            report["loaded"] += 1
+    report["seconds"] = time.perf_counter() - start
+    report["rows_per_second"] = report["loaded"] / report["seconds"] if report["seconds"] else 0.0
+    return report
@@ -0,0 +1,376 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter
+import heapq
+import math
+import re
+import sys
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; trigram counting falls back to a Counter.
+    np = None
+
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+def normalize_text(text):
+    """
+    Case-fold text and collapse punctuation and runs of whitespace into single spaces.
+
+    Args:
+        text (str): The text to normalize.
+
+    Returns:
+        str: The normalized text, e.g. "Joe's  Pizza!" -> "joe s pizza".
+    """
+    return _NON_WORD.sub(" ", text.casefold()).strip()
+
+
+def trigrams(text):
+    """
+    Split normalized text into its set of character trigrams.
+
+    The text is padded with two leading spaces and one trailing space so that the start of the
+    string (where typos matter most for autocomplete-style queries) contributes extra trigrams.
+
+    Args:
+        text (str): Normalized text.
+
+    Returns:
+        set: The distinct trigrams of the text.
+    """
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SortedPrefixIndex:
+    """
+    A sorted sequence of (key, id) pairs supporting prefix range scans by binary search.
+
+    The pairs are split into chunks of at most 2 * CHUNK_SIZE sorted (key, id) tuples, with the
+    first pair of every chunk kept in a separate list. An insert or delete binary-searches the
+    chunk heads and then shifts only one chunk, so updates stay cheap at millions of entries
+    where a single flat list would have to move half its contents every time.
+    """
+
+    CHUNK_SIZE = 512
+
+    def __init__(self):
+        """
+        Initialize an empty index.
+        """
+        self._chunks = []
+        self._heads = []
+        self._size = 0
+
+    def __len__(self):
+        """
+        Return the number of (key, id) pairs.
+        """
+        return self._size
+
+    def add(self, key, item_id):
+        """
+        Insert a (key, id) pair.
+        """
+        pair = (key, item_id)
+        if not self._chunks:
+            self._chunks.append([pair])
+            self._heads.append(pair)
+            self._size = 1
+            return
+        index = max(0, bisect_right(self._heads, pair) - 1)
+        chunk = self._chunks[index]
+        chunk.insert(bisect_left(chunk, pair), pair)
+        self._heads[index] = chunk[0]
+        self._size += 1
+        if len(chunk) > 2 * self.CHUNK_SIZE:
+            tail = chunk[self.CHUNK_SIZE:]
+            del chunk[self.CHUNK_SIZE:]
+            self._chunks.insert(index + 1, tail)
+            self._heads.insert(index + 1, tail[0])
+
+    def update(self, pairs):
+        """
+        Insert many (key, id) pairs with one sort instead of one binary search each.
+        """
+        merged = [pair for chunk in self._chunks for pair in chunk]
+        merged.extend(pairs)
+        merged.sort()
+        self._chunks = [merged[start:start + self.CHUNK_SIZE] for start in range(0, len(merged), self.CHUNK_SIZE)]
+        self._heads = [chunk[0] for chunk in self._chunks]
+        self._size = len(merged)
+
+    def discard(self, key, item_id):
+        """
+        Remove a (key, id) pair if present.
+        """
+        pair = (key, item_id)
+        index = bisect_right(self._heads, pair) - 1
+        if index < 0:
+            return
+        chunk = self._chunks[index]
+        position = bisect_left(chunk, pair)
+        if position == len(chunk) or chunk[position] != pair:
+            return
+        del chunk[position]
+        self._size -= 1
+        if chunk:
+            self._heads[index] = chunk[0]
+        else:
+            del self._chunks[index]
+            del self._heads[index]
+
+    def iter_prefix(self, prefix):
+        """
+        Yield (key, id) pairs whose key starts with the prefix, in key order.
+        """
+        if not self._chunks:
+            return
+        start = (prefix,)  # sorts before every (prefix, id) pair
+        index = max(0, bisect_left(self._heads, start) - 1)
+        position = bisect_left(self._chunks[index], start)
+        for chunk_index in range(index, len(self._chunks)):
+            chunk = self._chunks[chunk_index]
+            for pair_index in range(position, len(chunk)):
+                pair = chunk[pair_index]
+                if not pair[0].startswith(prefix):
+                    return
+                yield pair
+            position = 0
+
+
+class RestaurantTextIndex:
+    """
+    A full-text index over restaurant names and menu items for fuzzy search and autocomplete.
+
+    Fuzzy search uses a trigram inverted index: every name and menu item is an entry, and each
+    trigram maps to an append-only array of the entries containing it. A query counts how many
+    of its trigrams each entry shares (vectorized with NumPy when it is installed) and ranks the
+    entries by trigram Jaccard similarity, which tolerates typos, transpositions and missing
+    letters. Autocomplete binary-searches sorted sequences of whole names and of individual
+    name words, so each keystroke costs O(log n + limit). Both structures are updated
+    incrementally; removed entries are masked out and purged from the postings in one
+    compaction pass once they outnumber the live ones, which also renumbers the live entries so
+    the per-entry arrays never grow beyond twice the live size.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty index.
+        """
+        self._postings = {}
+        self._entries = {}
+        self._entries_by_restaurant = {}
+        self._gram_counts = array('H')  # trigrams per entry, 0 once the entry is removed
+        self._dead = 0
+        self._names = SortedPrefixIndex()
+        self._words = SortedPrefixIndex()
+        self._restaurant_names = {}
+
+    def __len__(self):
+        """
+        Return the number of indexed restaurants.
+        """
+        return len(self._restaurant_names)
+
+    def add(self, restaurant_id, name, menu_items=()):
+        """
+        Index a restaurant's name and menu items, replacing any previous entries for it.
+
+        Args:
+            restaurant_id (int): The restaurant id.
+            name (str): The restaurant name.
+            menu_items (iterable, optional): The names of the dishes on its menu.
+        """
+        if restaurant_id in self._restaurant_names:
+            self.remove(restaurant_id)
+        normalized = self._add_entries(restaurant_id, name, menu_items)
+        self._names.add(normalized, restaurant_id)
+        for word in set(normalized.split()):
+            self._words.add(sys.intern(word), restaurant_id)
+
+    def add_many(self, restaurants):
+        """
+        Index many restaurants at once, sorting the autocomplete sequences a single time.
+
+        Args:
+            restaurants (iterable): (restaurant_id, name, menu_items) tuples.
+        """
+        names = []
+        words = []
+        for restaurant_id, name, menu_items in restaurants:
+            if restaurant_id in self._restaurant_names:
+                self.remove(restaurant_id)
+            normalized = self._add_entries(restaurant_id, name, menu_items)
+            names.append((normalized, restaurant_id))
+            words.extend((sys.intern(word), restaurant_id) for word in set(normalized.split()))
+        self._names.update(names)
+        self._words.update(words)
+
+    def remove(self, restaurant_id):
+        """
+        Drop every entry of a restaurant; unknown ids are ignored.
+        """
+        normalized = self._restaurant_names.pop(restaurant_id, None)
+        if normalized is None:
+            return
+        self._names.discard(normalized, restaurant_id)
+        for word in set(normalized.split()):
+            self._words.discard(word, restaurant_id)
+        for entry_id in self._entries_by_restaurant.pop(restaurant_id):
+            del self._entries[entry_id]
+            self._gram_counts[entry_id] = 0
+            self._dead += 1
+        if self._dead > max(1024, len(self._entries)):
+            self._compact()
+
+    def search(self, query, limit=10, min_similarity=0.3):
+        """
+        Rank restaurants whose name or a menu item is similar to the query.
+
+        Args:
+            query (str): The text to search for; typos are tolerated.
+            limit (int): The maximum number of restaurants to return.
+            min_similarity (float): The minimum trigram Jaccard similarity (0 to 1) of a match.
+
+        Returns:
+            list: (similarity, restaurant_id, field, matched_text) tuples, best first; field is
+                  "name" or "menu". Name matches win ties against menu matches.
+
+        Raises:
+            ValueError: If min_similarity is not within (0, 1].
+        """
+        if not (0 < min_similarity <= 1):
+            raise ValueError("min_similarity must be between 0 and 1.")
+        normalized = normalize_text(query)
+        if not normalized or limit <= 0:
+            return []
+        query_grams = trigrams(normalized)
+        postings = [self._postings[gram] for gram in query_grams if gram in self._postings]
+        if not postings:
+            return []
+        if np is not None:
+            matches = self._similar_entries_numpy(postings, len(query_grams), min_similarity)
+        else:
+            matches = self._similar_entries_python(postings, len(query_grams), min_similarity)
+
+        # Walk the entries from most to least similar, keeping each restaurant's best entry. Once
+        # `limit` restaurants are found only entries tied with the last of them can still rank.
+        matches.sort(reverse=True)
+        best = {}
+        cutoff = None
+        for similarity, entry_id in matches:
+            if cutoff is not None and similarity < cutoff:
+                break
+            restaurant_id, field, text = self._entries[entry_id]
+            rank = (similarity, field == "name", -restaurant_id)
+            if restaurant_id not in best or rank > best[restaurant_id][0]:
+                best[restaurant_id] = (rank, field, text)
+                if cutoff is None and len(best) == limit:
+                    cutoff = similarity
+        top = heapq.nlargest(limit, best.items(), key=lambda item: item[1][0])
+        return [(round(rank[0], 4), restaurant_id, field, text) for restaurant_id, (rank, field, text) in top]
+
+    def autocomplete(self, prefix, limit=10):
+        """
+        Suggest restaurants whose name, or any word of it, starts with the prefix.
+
+        Whole-name prefix matches come first, then matches on a later word of the name; within
+        each group names are in alphabetical order, so shorter completions appear first.
+
+        Args:
+            prefix (str): What the user has typed so far.
+            limit (int): The maximum number of suggestions.
+
+        Returns:
+            list: Up to `limit` restaurant ids.
+        """
+        normalized = normalize_text(prefix)
+        if not normalized or limit <= 0:
+            return []
+        suggestions = []
+        seen = set()
+        for index in (self._names, self._words):
+            for _, restaurant_id in index.iter_prefix(normalized):
+                if restaurant_id not in seen:
+                    seen.add(restaurant_id)
+                    suggestions.append(restaurant_id)
+                    if len(suggestions) == limit:
+                        return suggestions
+        return suggestions
+
+    def _add_entries(self, restaurant_id, name, menu_items):
+        """
+        Register the trigram entries of a restaurant and return its normalized name.
+        """
+        normalized = normalize_text(name)
+        self._restaurant_names[restaurant_id] = normalized
+        entry_ids = []
+        for field, text in [("name", name)] + [("menu", item) for item in menu_items]:
+            grams = trigrams(normalized if field == "name" else normalize_text(text))
+            entry_id = len(self._gram_counts)
+            self._gram_counts.append(min(len(grams), 0xFFFF))
+            self._entries[entry_id] = (restaurant_id, field, text)
+            for gram in grams:
+                posting = self._postings.get(gram)
+                if posting is None:
+                    posting = self._postings[sys.intern(gram)] = array('I')
+                posting.append(entry_id)
+            entry_ids.append(entry_id)
+        self._entries_by_restaurant[restaurant_id] = entry_ids
+        return normalized
+
+    def _similar_entries_numpy(self, postings, query_size, min_similarity):
+        """
+        Count shared trigrams for every entry at once with np.bincount over the postings.
+        """
+        shared = np.bincount(np.concatenate([np.frombuffer(posting, dtype=np.uint32) for posting in postings]),
+                             minlength=len(self._gram_counts))
+        sizes = np.frombuffer(self._gram_counts, dtype=np.uint16).astype(np.int64)
+        similarity = shared / np.maximum(query_size + sizes - shared, 1)
+        entry_ids = np.flatnonzero((similarity >= min_similarity) & (sizes > 0))
+        return list(zip(similarity[entry_ids].tolist(), entry_ids.tolist()))
+
+    def _similar_entries_python(self, postings, query_size, min_similarity):
+        """
+        Count shared trigrams with a Counter over the postings, skipping entries too short to match.
+        """
+        # Jaccard similarity >= s needs at least ceil(s * |Q|) shared trigrams.
+        required = max(1, math.ceil(min_similarity * query_size))
+        shared = Counter()
+        for posting in postings:
+            shared.update(posting)
+        gram_counts = self._gram_counts
+        matches = []
+        for entry_id, overlap in shared.items():
+            size = gram_counts[entry_id]
+            if overlap >= required and size:
+                similarity = overlap / (query_size + size - overlap)
+                if similarity >= min_similarity:
+                    matches.append((similarity, entry_id))
+        return matches
+
+    def _compact(self):
+        """
+        Renumber the live entries densely and rewrite every posting without the removed ones, so the
+        per-entry arrays shrink back to the number of live entries.
+        """
+        live = sorted(self._entries)
+        renumbered = [-1] * len(self._gram_counts)
+        for new_id, entry_id in enumerate(live):
+            renumbered[entry_id] = new_id
+        # Renumbering keeps the entries in order, so every posting stays sorted.
+        for gram in list(self._postings):
+            posting = array('I', [renumbered[entry_id] for entry_id in self._postings[gram]
+                                  if renumbered[entry_id] >= 0])
+            if posting:
+                self._postings[gram] = posting
+            else:
+                del self._postings[gram]
+        self._gram_counts = array('H', [self._gram_counts[entry_id] for entry_id in live])
+        self._entries = {renumbered[entry_id]: entry for entry_id, entry in self._entries.items()}
+        self._entries_by_restaurant = {restaurant_id: [renumbered[entry_id] for entry_id in entry_ids]
+                                       for restaurant_id, entry_ids in self._entries_by_restaurant.items()}
+        self._dead = 0
@@ -0,0 +1,491 @@
+from array import array
+from bisect import bisect_left, bisect_right
+import heapq
+from itertools import islice
+import json
+import math
+import mmap
+import os
+import sys
+
+from Geospatial_Restaurant_Search import GeoGridIndex
+from Restaurant_Browsing import Vocabulary
+from Restaurant_Name_Search import RestaurantTextIndex
+
+MAGIC = b"RESTSNAP"
+FORMAT_VERSION = 1
+_PREAMBLE = 16  # magic + little-endian uint64 header length
+_ALIGNMENT = 8
+_COLUMN_FIELDS = ("id", "name", "cuisine", "location", "rating", "price_range", "delivery", "latitude", "longitude")
+
+
+def _aligned(offset):
+    """
+    Round an offset up to the section alignment.
+    """
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+def _postings_by_key(rows, field):
+    """
+    Group row positions by the case-folded value of a field, in compressed sparse row form.
+
+    Returns:
+        tuple: (keys, labels, offsets, positions) where positions[offsets[i]:offsets[i + 1]] are
+               the ascending positions of the rows whose folded value is keys[i].
+    """
+    groups = {}
+    labels = {}
+    for position, row in enumerate(rows):
+        key = row[field].casefold()
+        groups.setdefault(key, []).append(position)
+        labels.setdefault(key, row[field])
+    offsets = array('Q', [0])
+    positions = array('I')
+    for key in groups:
+        positions.extend(groups[key])
+        offsets.append(len(positions))
+    return list(groups), [labels[key] for key in groups], offsets, positions
+
+
+def write_snapshot(database, path):
+    """
+    Write a database to a binary snapshot file that SnapshotRestaurantDatabase can memory-map.
+
+    The file is a JSON header followed by contiguous, 8-byte aligned arrays: one per column
+    (ids, ratings, dictionary codes, delivery flags, coordinates), the rating index, the
+    cuisine and location indexes in compressed sparse row form, and UTF-8 blobs with offset
+    arrays for names and any other fields. The file is written to a temporary name and moved
+    into place, so readers never see a partial snapshot.
+
+    Args:
+        database (RestaurantDatabase): Any database exposing get_restaurants() and version.
+        path (str): The snapshot file to create or replace.
+
+    Returns:
+        int: The number of restaurants written.
+    """
+    rows = sorted(database.get_restaurants(), key=lambda row: row['id'])
+    count = len(rows)
+    nan = float("nan")
+    sections = {
+        "ids": array('q', [row['id'] for row in rows]),
+        "ratings": array('d', [row['rating'] for row in rows]),
+        "delivery": array('B', [1 if row['delivery'] else 0 for row in rows]),
+        "latitudes": array('d', [nan if row.get('latitude') is None or row.get('longitude') is None
+                                 else row['latitude'] for row in rows]),
+        "longitudes": array('d', [nan if row.get('latitude') is None or row.get('longitude') is None
+                                  else row['longitude'] for row in rows]),
+    }
+    dictionaries = {}
+    for field in ("cuisine", "location", "price_range"):
+        codes = {}
+        sections[field + "_codes"] = array('I', [codes.setdefault(row[field], len(codes)) for row in rows])
+        dictionaries[field] = list(codes)
+
+    ratings = sections["ratings"]
+    order = sorted(range(count), key=lambda position: (ratings[position], position))
+    sections["rating_order"] = array('I', order)
+    sections["sorted_ratings"] = array('d', [ratings[position] for position in order])
+
+    indexes = {}
+    for field in ("cuisine", "location"):
+        keys, labels, offsets, positions = _postings_by_key(rows, field)
+        indexes[field] = {"keys": keys, "labels": labels}
+        sections[field + "_offsets"] = offsets
+        sections[field + "_positions"] = positions
+
+    for name, encode in (("name", lambda row: row['name'].encode("utf-8")),
+                         ("extra", _encode_extras)):
+        offsets = array('Q', [0])
+        chunks = []
+        for row in rows:
+            chunk = encode(row)
+            chunks.append(chunk)
+            offsets.append(offsets[-1] + len(chunk))
+        sections[name + "_offsets"] = offsets
+        sections[name + "_blob"] = b"".join(chunks)
+
+    layout = {}
+    offset = 0
+    for name, section in sections.items():
+        typecode = section.typecode if isinstance(section, array) else 'B'
+        size = len(section) * section.itemsize if isinstance(section, array) else len(section)
+        layout[name] = [typecode, offset, size]
+        offset = _aligned(offset + size)
+    header = json.dumps({
+        "format": FORMAT_VERSION,
+        "byteorder": sys.byteorder,
+        "itemsizes": {typecode: array(typecode).itemsize for typecode in "qdBIQ"},
+        "count": count,
+        "version": database.version,
+        "dictionaries": dictionaries,
+        "indexes": indexes,
+        "sections": layout,
+    }).encode("utf-8")
+
+    temporary = f"{path}.tmp"
+    with open(temporary, "wb") as handle:
+        handle.write(MAGIC + len(header).to_bytes(8, "little") + header)
+        data_start = _aligned(_PREAMBLE + len(header))
+        handle.write(b"\0" * (data_start - _PREAMBLE - len(header)))
+        for name, section in sections.items():
+            payload = section.tobytes() if isinstance(section, array) else section
+            handle.write(payload)
+            handle.write(b"\0" * (_aligned(len(payload)) - len(payload)))
+    os.replace(temporary, path)
+    return count
+
+
+def _encode_extras(row):
+    """
+    Encode the fields that have no column of their own (e.g. "menu") as a JSON object, or b"" if none.
+    """
+    extras = {key: value for key, value in row.items() if key not in _COLUMN_FIELDS}
+    return json.dumps(extras, separators=(",", ":")).encode("utf-8") if extras else b""
+
+
+class SnapshotRestaurantDatabase:
+    """
+    A read-only restaurant database served directly from a memory-mapped snapshot file.
+
+    Opening a snapshot only parses its small JSON header: every column and index is a typed
+    memoryview over the mapped file, so startup costs the same for five restaurants or five
+    million, and worker processes that open the same file share its pages through the OS page
+    cache instead of each holding a private copy. Rows are decoded on demand. The public
+    interface mirrors RestaurantDatabase's read methods, so it can be passed to
+    RestaurantBrowsing unchanged; the geo and text indexes, which have no on-disk form, are
+    built from the mapped columns the first time a distance or name query needs them.
+
+    Attributes:
+        version (int): The version of the database the snapshot was written from.
+        cuisine_vocabulary (Vocabulary): The distinct cuisines with restaurant counts.
+        location_vocabulary (Vocabulary): The distinct locations with restaurant counts.
+    """
+
+    def __init__(self, path):
+        """
+        Map a snapshot file.
+
+        Args:
+            path (str): A file written by write_snapshot.
+
+        Raises:
+            ValueError: If the file is not a snapshot or was written on an incompatible platform.
+        """
+        with open(path, "rb") as handle:
+            self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            self._mmap.close()
+            raise ValueError(f"Not a restaurant snapshot: {path}")
+        header_length = int.from_bytes(self._mmap[len(MAGIC):_PREAMBLE], "little")
+        header = json.loads(self._mmap[_PREAMBLE:_PREAMBLE + header_length].decode("utf-8"))
+        if (header["format"] != FORMAT_VERSION or header["byteorder"] != sys.byteorder
+                or any(array(typecode).itemsize != size for typecode, size in header["itemsizes"].items())):
+            self._mmap.close()
+            raise ValueError(f"Snapshot {path} was written by an incompatible format or platform.")
+        data_start = _aligned(_PREAMBLE + header_length)
+        buffer = memoryview(self._mmap)
+        self._views = [buffer]
+        columns = {}
+        for name, (typecode, offset, size) in header["sections"].items():
+            start = data_start + offset
+            columns[name] = buffer[start:start + size].cast(typecode)
+            self._views.append(columns[name])
+        self._columns = columns
+        self._count = header["count"]
+        self.version = header["version"]
+        self._dictionaries = header["dictionaries"]
+        self._ids = columns["ids"]
+        self._ratings = columns["ratings"]
+        self._rating_order = columns["rating_order"]
+        self._sorted_ratings = columns["sorted_ratings"]
+        self._postings = {}
+        for field in ("cuisine", "location"):
+            offsets = columns[field + "_offsets"]
+            keys = header["indexes"][field]["keys"]
+            self._postings[field] = {key: (offsets[i], offsets[i + 1]) for i, key in enumerate(keys)}
+        self.cuisine_vocabulary = self._vocabulary("cuisine", header)
+        self.location_vocabulary = self._vocabulary("location", header)
+        self._geo_index = None
+        self._text_index = None
+
+    def __len__(self):
+        """
+        Return the number of restaurants.
+        """
+        return self._count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """
+        Release the mapped views and unmap the file.
+        """
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._mmap.close()
+
+    @property
+    def restaurants(self):
+        """
+        list: A snapshot of all restaurant rows in insertion order.
+        """
+        return self.get_restaurants()
+
+    def get_restaurants(self):
+        """
+        Decode every restaurant.
+
+        Returns:
+            list: A list of dictionaries, where each dictionary contains restaurant information.
+        """
+        return [self._row(position) for position in range(self._count)]
+
+    def get_restaurant(self, restaurant_id):
+        """
+        Decode a single restaurant by its id, found by binary search over the id column.
+
+        Raises:
+            KeyError: If no restaurant has the given id.
+        """
+        position = bisect_left(self._ids, restaurant_id)
+        if position == self._count or self._ids[position] != restaurant_id:
+            raise KeyError(restaurant_id)
+        return self._row(position)
+
+    def facets(self):
+        """
+        Report the distinct cuisines and locations with their restaurant counts.
+        """
+        return {"cuisine": self.cuisine_vocabulary.facets(), "location": self.location_vocabulary.facets()}
+
+    @property
+    def geo_index(self):
+        """
+        GeoGridIndex: Restaurant positions keyed by row position, built on first use.
+        """
+        if self._geo_index is None:
+            index = GeoGridIndex()
+            latitudes, longitudes = self._columns["latitudes"], self._columns["longitudes"]
+            for position in range(self._count):
+                if not math.isnan(latitudes[position]):
+                    index.insert(position, latitudes[position], longitudes[position])
+            self._geo_index = index
+        return self._geo_index
+
+    @property
+    def text_index(self):
+        """
+        RestaurantTextIndex: The name and menu index keyed by restaurant id, built on first use.
+        """
+        if self._text_index is None:
+            index = RestaurantTextIndex()
+            index.add_many((self._ids[position], self._name(position), self._extras(position).get('menu', ()))
+                           for position in range(self._count))
+            self._text_index = index
+        return self._text_index
+
+    def find(self, cuisine=None, location=None, min_rating=None, max_rating=None, near=None, radius_km=None):
+        """
+        Answer a conjunctive query from the mapped indexes.
+
+        The smallest of the matching position lists and the binary-searched rating slice drives
+        the lookup; the other posting lists are probed by binary search.
+
+        Returns:
+            list: The matching restaurants in insertion order.
+        """
+        positions = self._matching_positions(cuisine, location, min_rating, max_rating, near, radius_km)
+        if positions is None:
+            return self.get_restaurants()
+        return [self._row(position) for position in sorted(positions)]
+
+    def iter_find(self, cuisine=None, location=None, min_rating=None, max_rating=None, near=None, radius_km=None):
+        """
+        Lazily yield the restaurants matching a conjunctive query.
+
+        Returns:
+            iterator: The matching restaurants, in no particular order.
+        """
+        positions = self._matching_positions(cuisine, location, min_rating, max_rating, near, radius_km)
+        for position in range(self._count) if positions is None else positions:
+            yield self._row(position)
+
+    def iter_by_rating(self, cuisine=None, location=None, min_rating=None, after=None):
+        """
+        Lazily yield matching restaurants from the highest rating down by walking the rating index.
+
+        Args:
+            cuisine (str, optional): The cuisine to match, case-insensitively.
+            location (str, optional): The location to match, case-insensitively.
+            min_rating (float, optional): Stop once ratings drop below this value.
+            after (tuple, optional): (rating, id) of the last row already seen; resume just below it.
+
+        Returns:
+            iterator: Restaurants ordered by rating descending, newest first on ties.
+        """
+        lists = self._position_lists(cuisine, location)
+        start = self._count if after is None else self._rating_position(after[0], bisect_left(self._ids, after[1]))
+        stop = 0 if min_rating is None else bisect_left(self._sorted_ratings, min_rating)
+        for index in range(start - 1, stop - 1, -1):
+            position = self._rating_order[index]
+            if all(_contains(members, position) for members in lists):
+                yield self._row(position)
+
+    def top_rated(self, limit, cuisine=None, location=None):
+        """
+        Return the highest rated restaurants matching the optional cuisine and location.
+
+        Returns:
+            list: Up to `limit` restaurants, highest rating first; ties favour the newest restaurant.
+        """
+        lists = self._position_lists(cuisine, location)
+        if not lists:
+            positions = (self._rating_order[index] for index in range(self._count - 1, -1, -1))
+        elif limit * self._count < len(lists[0]) ** 2:
+            positions = (self._rating_order[index] for index in range(self._count - 1, -1, -1)
+                         if all(_contains(members, self._rating_order[index]) for members in lists))
+        else:
+            ratings = self._ratings
+            candidates = (position for position in lists[0]
+                          if all(_contains(members, position) for members in lists[1:]))
+            positions = heapq.nlargest(limit, candidates, key=lambda position: (ratings[position], position))
+        return [self._row(position) for position in islice(positions, limit)]
+
+    def nearest(self, latitude, longitude, k, cuisine=None, location=None, min_rating=None, max_distance_km=None):
+        """
+        Find the k restaurants closest to a location that also satisfy the other predicates.
+
+        Returns:
+            list: (distance_km, restaurant) pairs, closest first.
+        """
+        lists = self._position_lists(cuisine, location)
+        accept = None
+        if lists or min_rating is not None:
+            low_rating = float("-inf") if min_rating is None else min_rating
+
+            def accept(position):
+                return (all(_contains(members, position) for members in lists)
+                        and self._ratings[position] >= low_rating)
+        return [(distance, self._row(position))
+                for distance, position in self.geo_index.nearest(latitude, longitude, k, accept=accept,
+                                                                 max_distance_km=max_distance_km)]
+
+    def count_by_rating(self, min_rating=None, max_rating=None):
+        """
+        Count restaurants within an inclusive rating range in O(log n).
+        """
+        low, high = self._rating_bounds(min_rating, max_rating)
+        return max(0, high - low)
+
+    def _vocabulary(self, field, header):
+        """
+        Rebuild a field's vocabulary from the lengths of its posting lists.
+        """
+        vocabulary = Vocabulary()
+        offsets = self._columns[field + "_offsets"]
+        for i, label in enumerate(header["indexes"][field]["labels"]):
+            vocabulary.add(label, offsets[i + 1] - offsets[i])
+        return vocabulary
+
+    def _position_lists(self, cuisine, location, near=None, radius_km=None):
+        """
+        Return the ascending position lists of the given equality and radius predicates, smallest first.
+        """
+        lists = []
+        for field, value in (("cuisine", cuisine), ("location", location)):
+            if value is not None:
+                start, end = self._postings[field].get(value.casefold(), (0, 0))
+                lists.append(self._columns[field + "_positions"][start:end])
+        if near is not None:
+            lists.append(sorted(position for _, position in self.geo_index.within_radius(near[0], near[1],
+                                                                                           radius_km)))
+        lists.sort(key=len)
+        return lists
+
+    def _matching_positions(self, cuisine, location, min_rating, max_rating, near, radius_km):
+        """
+        Return the positions matching every predicate in no particular order, or None for all rows.
+        """
+        lists = self._position_lists(cuisine, location, near, radius_km)
+        has_rating = min_rating is not None or max_rating is not None
+        if has_rating:
+            low, high = self._rating_bounds(min_rating, max_rating)
+            if not lists or high - low < len(lists[0]):
+                return [position for position in self._rating_order[low:high]
+                        if all(_contains(members, position) for members in lists)]
+        if not lists:
+            return None
+        ratings = self._ratings
+        low_rating = float("-inf") if min_rating is None else min_rating
+        high_rating = float("inf") if max_rating is None else max_rating
+        return [position for position in lists[0]
+                if low_rating <= ratings[position] <= high_rating
+                and all(_contains(members, position) for members in lists[1:])]
+
+    def _rating_bounds(self, min_rating, max_rating):
+        """
+        Binary-search the rating index for the slice covering an inclusive rating range.
+        """
+        low = 0 if min_rating is None else bisect_left(self._sorted_ratings, min_rating)
+        high = self._count if max_rating is None else bisect_right(self._sorted_ratings, max_rating)
+        return low, max(low, high)
+
+    def _rating_position(self, rating, position):
+        """
+        Locate the slot of (rating, position) in the rating index; equal ratings are ordered by position.
+        """
+        low = bisect_left(self._sorted_ratings, rating)
+        high = bisect_right(self._sorted_ratings, rating, low)
+        return bisect_left(self._rating_order, position, low, high)
+
+    def _name(self, position):
+        """
+        Decode the name stored at a row position.
+        """
+        offsets = self._columns["name_offsets"]
+        return bytes(self._columns["name_blob"][offsets[position]:offsets[position + 1]]).decode("utf-8")
+
+    def _extras(self, position):
+        """
+        Decode the fields without a column of their own stored at a row position.
+        """
+        offsets = self._columns["extra_offsets"]
+        start, end = offsets[position], offsets[position + 1]
+        return json.loads(bytes(self._columns["extra_blob"][start:end])) if end > start else {}
+
+    def _row(self, position):
+        """
+        Decode the restaurant stored at a row position into a dictionary.
+        """
+        columns = self._columns
+        dictionaries = self._dictionaries
+        row = {
+            "name": self._name(position),
+            "cuisine": dictionaries["cuisine"][columns["cuisine_codes"][position]],
+            "location": dictionaries["location"][columns["location_codes"][position]],
+            "rating": self._ratings[position],
+            "price_range": dictionaries["price_range"][columns["price_range_codes"][position]],
+            "delivery": bool(columns["delivery"][position]),
+        }
+        latitude = columns["latitudes"][position]
+        if not math.isnan(latitude):
+            row["latitude"] = latitude
+            row["longitude"] = columns["longitudes"][position]
+        row.update(self._extras(position))
+        row["id"] = self._ids[position]
+        return row
+
+
+def _contains(positions, position):
+    """
+    Check membership in an ascending sequence of positions by binary search.
+    """
+    index = bisect_left(positions, position)
+    return index < len(positions) and positions[index] == position
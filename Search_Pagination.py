@@ -0,0 +1,96 @@
+import base64
+import heapq
+import json
+
+
+def encode_cursor(sort_by, key):
+    """
+    Encode the sort key of the last row on a page into an opaque cursor.
+
+    Args:
+        sort_by (str): The sort order the key belongs to.
+        key (tuple): The sort key of the last row returned.
+
+    Returns:
+        str: A URL-safe cursor to pass back as `after` for the next page.
+    """
+    payload = json.dumps([sort_by, list(key)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor, sort_by, key_types=None):
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor (str): The cursor received from a previous page.
+        sort_by (str): The sort order of the current request.
+        key_types (tuple, optional): The type, or tuple of types, of each element of the sort order's
+            key. Without it the key may hold any strings and numbers.
+
+    Returns:
+        tuple: The sort key to resume after.
+
+    Raises:
+        ValueError: If the cursor is malformed, was issued for a different sort order, or holds a key
+            whose length or element types do not fit the sort order.
+    """
+    try:
+        cursor_sort_by, key = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (ValueError, TypeError, AttributeError):
+        raise ValueError("Invalid cursor.")
+    if cursor_sort_by != sort_by:
+        raise ValueError(f"Cursor was issued for sort order {cursor_sort_by!r}, not {sort_by!r}.")
+    if not isinstance(key, list) or (key_types is not None and len(key) != len(key_types)):
+        raise ValueError("Invalid cursor.")
+    for index, value in enumerate(key):
+        # bool is an int subclass, but no sort key holds one.
+        if isinstance(value, bool) or not isinstance(value, key_types[index] if key_types else (str, int, float)):
+            raise ValueError("Invalid cursor.")
+    return tuple(key)
+
+
+def validate_page_request(limit, sort_by, sort_keys):
+    """
+    Check the common pagination arguments.
+
+    Raises:
+        ValueError: If the limit is not a positive integer or the sort order is unknown.
+    """
+    if not isinstance(limit, int) or isinstance(limit, bool) or limit <= 0:
+        raise ValueError("Limit must be a positive integer.")
+    if sort_by not in sort_keys:
+        raise ValueError(f"Invalid sort order: {sort_by}")
+
+
+def select_page(rows, key, limit, after_key=None):
+    """
+    Select one page from an unordered stream of rows by keyset pagination.
+
+    Only rows whose key sorts strictly after `after_key` are considered, and a bounded heap keeps
+    the `limit + 1` smallest of them, so memory stays O(limit) however long the stream is.
+
+    Args:
+        rows (iterable): The candidate rows, in any order.
+        key (callable): Maps a row to its sort key; keys must be unique (include an id tie-breaker).
+        limit (int): The page size.
+        after_key (tuple, optional): The key of the last row of the previous page.
+
+    Returns:
+        tuple: (page, has_more) where page is a list of at most `limit` rows in key order.
+    """
+    if after_key is not None:
+        rows = (row for row in rows if key(row) > after_key)
+    page = heapq.nsmallest(limit + 1, rows, key=key)
+    return page[:limit], len(page) > limit
+
+
+def build_page(page, has_more, key, sort_by):
+    """
+    Wrap a page of rows with the cursor for the next one.
+
+    Returns:
+        dict: {"results": page, "next_cursor": cursor or None when this is the last page}.
+    """
+    next_cursor = encode_cursor(sort_by, key(page[-1])) if has_more else None
+    return {"results": page, "next_cursor": next_cursor}
@@ -0,0 +1,52 @@
+"""
+Synthetic restaurant catalogs shared by the benchmark scripts.
+"""
+import random
+import time
+
+CUISINES = ["Italian", "Japanese", "Fast Food", "Mexican", "Chinese", "Indian", "Thai", "French",
+            "Greek", "Korean", "Vietnamese", "Spanish", "Turkish", "Lebanese", "Ethiopian",
+            "Brazilian", "Peruvian", "American", "German", "Caribbean"]
+LOCATIONS = ["Downtown", "Midtown", "Uptown", "Harbor", "Old Town", "University", "Riverside",
+             "Airport", "West End", "East Side", "Northgate", "Southpark", "Chinatown", "Financial",
+             "Arts District", "Lakeside", "Hillcrest", "Market", "Station", "Suburb"]
+PRICE_RANGES = ["$", "$$", "$$$", "$$$$"]
+
+
+def synthetic_restaurants(count, seed=42, coordinates=False):
+    """
+    Generate a deterministic catalog of restaurant dictionaries.
+
+    Args:
+        count (int): The number of restaurants to generate.
+        seed (int): The random seed, so every run benchmarks the same data.
+        coordinates (bool): Also scatter the restaurants over a 50 x 50 km metro area.
+
+    Returns:
+        list: Restaurant dictionaries shaped like the RestaurantDatabase rows.
+    """
+    rng = random.Random(seed)
+    restaurants = [{"name": f"Restaurant {i}",
+                    "cuisine": rng.choice(CUISINES),
+                    "location": rng.choice(LOCATIONS),
+                    "rating": round(rng.uniform(1.0, 5.0), 1),
+                    "price_range": rng.choice(PRICE_RANGES),
+                    "delivery": rng.random() < 0.7}
+                   for i in range(count)]
+    if coordinates:
+        for restaurant in restaurants:
+            restaurant["latitude"] = 40.7 + rng.uniform(-0.225, 0.225)
+            restaurant["longitude"] = -74.0 + rng.uniform(-0.3, 0.3)
+    return restaurants
+
+
+def best_of(function, repeat=5):
+    """
+    Time a callable and return the best wall-clock duration in seconds.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
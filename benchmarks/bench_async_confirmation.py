@@ -0,0 +1,60 @@
+"""
+Compare order confirmation throughput against a slow payment gateway: the synchronous
+confirm_order loop versus confirm_orders_async at several concurrency limits.
+
+FakePaymentGateway injects the latency, so the numbers reflect waiting on the gateway rather than
+network or CPU limits. The synchronous path is measured on a smaller slice of the orders, since
+it takes one full round trip per order.
+
+Run from the repository root:
+    python -m benchmarks.bench_async_confirmation [--latency-ms N] [orders...]
+"""
+import asyncio
+import sys
+import time
+
+from Order_Placement import Cart, FakePaymentGateway, OrderPlacement, RestaurantMenu, UserProfile
+
+
+def build_orders(count):
+    """
+    Build `count` single-item orders from one restaurant.
+    """
+    menu = RestaurantMenu(["Burger"])
+    profile = UserProfile(delivery_address="123 Main St")
+    orders = []
+    for _ in range(count):
+        cart = Cart()
+        cart.add_item("Burger", 8.99, 1)
+        orders.append(OrderPlacement(cart, profile, menu))
+    return orders
+
+
+def main(sizes, latency):
+    print(f"{'orders':>8} {'mode':<22} {'seconds':>8} {'orders/s':>10} {'max in flight':>14}")
+    for size in sizes:
+        orders = build_orders(size)
+        gateway = FakePaymentGateway(latency=latency, jitter=latency / 2, seed=42)
+        sample = orders[:max(1, min(size, int(2 / latency)))]
+        start = time.perf_counter()
+        for order in sample:
+            order.confirm_order(gateway)
+        seconds = time.perf_counter() - start
+        print(f"{len(sample):>8} {'sync':<22} {seconds:>8.2f} {len(sample) / seconds:>10.0f} "
+              f"{gateway.max_in_flight:>14}")
+        for concurrency in (100, 1000, 10000):
+            gateway = FakePaymentGateway(latency=latency, jitter=latency / 2, seed=42)
+            start = time.perf_counter()
+            asyncio.run(OrderPlacement.confirm_orders_async(orders, gateway, concurrency=concurrency, timeout=5))
+            seconds = time.perf_counter() - start
+            print(f"{size:>8} {f'async, concurrency {concurrency}':<22} {seconds:>8.2f} {size / seconds:>10.0f} "
+                  f"{gateway.max_in_flight:>14}")
+
+
+if __name__ == "__main__":
+    arguments = sys.argv[1:]
+    latency_ms = 50.0
+    if arguments[:1] == ["--latency-ms"]:
+        latency_ms = float(arguments[1])
+        arguments = arguments[2:]
+    main([int(arg) for arg in arguments] or [20_000], latency_ms / 1000)
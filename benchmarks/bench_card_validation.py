@@ -0,0 +1,53 @@
+"""
+Compare validating stored cards one at a time with validate_credit_card against the batch
+validate_credit_cards, with NumPy and with its pure-Python fallback.
+
+Run from the repository root:
+    python -m benchmarks.bench_card_validation [cards]
+"""
+import random
+import sys
+import time
+from unittest import mock
+
+import Payment_Processing
+from Payment_Processing import PaymentProcessing
+
+
+def build_cards(count, rng):
+    """
+    Build `count` card details with random 16-digit numbers, about a tenth of which pass Luhn.
+    """
+    return [{"card_number": "".join(rng.choices("0123456789", k=16)), "expiry_date": "12/25", "cvv": "123"}
+            for _ in range(count)]
+
+
+def report(name, count, seconds, valid):
+    print(f"{name:<26} {count:>10} {seconds:>8.3f} {count / seconds / 1e6:>12.2f} {valid:>8}")
+
+
+def main(count):
+    cards = build_cards(count, random.Random(42))
+    processing = PaymentProcessing()
+    print(f"{'mode':<26} {'cards':>10} {'seconds':>8} {'M cards/s':>12} {'valid':>8}")
+
+    validate = processing.validate_credit_card
+    start = time.perf_counter()
+    expected = [validate(details) for details in cards]
+    report("validate_credit_card loop", count, time.perf_counter() - start, sum(expected))
+
+    with mock.patch.object(Payment_Processing, "np", None):
+        start = time.perf_counter()
+        mask = processing.validate_credit_cards(cards)
+        report("batch, pure Python", count, time.perf_counter() - start, sum(mask))
+        assert mask == expected
+
+    if Payment_Processing.np is not None:
+        start = time.perf_counter()
+        mask = processing.validate_credit_cards(cards)
+        report("batch, NumPy", count, time.perf_counter() - start, int(mask.sum()))
+        assert mask.tolist() == expected
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if sys.argv[1:] else 1_000_000)
@@ -0,0 +1,85 @@
+"""
+Compare the memory retained per cart line by a Cart of dict-backed items (the old CartItem), a
+Cart of slotted CartItem objects and a CompactCart.
+
+Lines are spread over many carts, as with one cart per connected session, and item names and
+prices come from a shared menu, so only the cart structures themselves are counted.
+
+Run from the repository root:
+    python -m benchmarks.bench_cart_memory [--lines-per-cart N] [total lines...]
+"""
+import random
+import sys
+import time
+import tracemalloc
+from unittest import mock
+
+import Order_Placement
+from Order_Placement import Cart, CompactCart
+
+
+class DictCartItem:
+    """
+    CartItem as it was before __slots__: same validation, one __dict__ per instance.
+    """
+    def __init__(self, name, price, quantity):
+        if price <= 0:
+            raise ValueError("Price must be greater than 0.")
+        if quantity < 0:
+            raise ValueError("Quantity must be greater than or equal to 0.")
+        self.name = name
+        self.price = price
+        self.quantity = quantity
+
+    def update_quantity(self, new_quantity):
+        if new_quantity < 0:
+            raise ValueError("Quantity cannot be less than 0.")
+        self.quantity = new_quantity
+
+    def get_subtotal(self):
+        return self.price * self.quantity
+
+
+def build_carts(factory, total_lines, lines_per_cart, menu):
+    """
+    Fill enough carts to hold `total_lines` lines and return them with the bytes they retain and the build time.
+    """
+    rng = random.Random(42)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    carts = []
+    for first in range(0, total_lines, lines_per_cart):
+        cart = factory()
+        for name, price in rng.sample(menu, min(lines_per_cart, total_lines - first)):
+            cart.add_item(name, price, rng.randint(1, 3))
+        carts.append(cart)
+    seconds = time.perf_counter() - start
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return carts, retained, seconds
+
+
+def main(sizes, lines_per_cart):
+    rng = random.Random(7)
+    menu = [(f"Dish {index}", round(rng.uniform(1, 40), 2)) for index in range(max(1000, lines_per_cart))]
+    print(f"{'lines':>9} {'per cart':>8} {'layout':<16} {'bytes/line':>11} {'build s':>8}")
+    for size in sizes:
+        for name in ("dict CartItem", "slotted CartItem", "CompactCart"):
+            if name == "dict CartItem":
+                with mock.patch.object(Order_Placement, "CartItem", DictCartItem):
+                    carts, retained, seconds = build_carts(Cart, size, lines_per_cart, menu)
+            else:
+                factory = Cart if name == "slotted CartItem" else CompactCart
+                carts, retained, seconds = build_carts(factory, size, lines_per_cart, menu)
+            print(f"{size:>9} {lines_per_cart:>8} {name:<16} {retained / size:>11.1f} {seconds:>8.2f}")
+            del carts
+
+
+if __name__ == "__main__":
+    arguments = sys.argv[1:]
+    lines_per_cart = 20
+    if arguments[:1] == ["--lines-per-cart"]:
+        lines_per_cart = int(arguments[1])
+        arguments = arguments[2:]
+    main([int(arg) for arg in arguments] or [1_000_000], lines_per_cart)
@@ -0,0 +1,62 @@
+"""
+Compare streaming a catalog file through load_catalog (bulk index build) with per-row add_restaurant.
+
+Run from the repository root:
+    python -m benchmarks.bench_catalog_loader [sizes...]
+"""
+import csv
+import os
+import resource
+import sys
+import tempfile
+import time
+
+from Restaurant_Browsing import RestaurantDatabase
+from Restaurant_Catalog_Loader import load_catalog, read_catalog, validate_restaurant
+from benchmarks._catalog import synthetic_restaurants
+
+FIELDS = ["name", "cuisine", "location", "rating", "price_range", "delivery", "latitude", "longitude"]
+
+
+def write_csv(path, count):
+    """
+    Write a synthetic catalog as CSV.
+    """
+    with open(path, "w", newline="", encoding="utf-8") as handle:
+        writer = csv.DictWriter(handle, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(synthetic_restaurants(count, coordinates=True))
+
+
+def per_row(path):
+    """
+    Load the catalog by validating and inserting one row at a time.
+    """
+    database = RestaurantDatabase(restaurants=[])
+    for _, record in read_catalog(path):
+        database.add_restaurant(validate_restaurant(record))
+    return database
+
+
+def main(sizes):
+    print(f"{'rows':>9} {'method':<22} {'seconds':>9} {'rows/s':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            path = os.path.join(directory, f"catalog_{size}.csv")
+            write_csv(path, size)
+            if size <= 200_000:
+                start = time.perf_counter()
+                per_row(path)
+                seconds = time.perf_counter() - start
+                print(f"{size:>9} {'add_restaurant per row':<22} {seconds:>9.2f} {size / seconds:>10,.0f}")
+            else:
+                print(f"{size:>9} {'add_restaurant per row':<22} {'skipped':>9}")
+            report = load_catalog(RestaurantDatabase(restaurants=[]), path)
+            print(f"{size:>9} {'load_catalog (bulk)':<22} {report['seconds']:>9.2f} "
+                  f"{report['rows_per_second']:>10,.0f}")
+    # ru_maxrss is in kilobytes on Linux.
+    print(f"peak RSS: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MB")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000])
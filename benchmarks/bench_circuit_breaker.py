@@ -0,0 +1,73 @@
+"""
+Show how the circuit breaker keeps checkout responsive through a gateway brownout: payments arrive
+at a steady rate and run through process_payment_async against the local stand-in gateway, whose
+latency jumps for a few seconds partway through, with and without a CircuitBreaker. Without the
+breaker, payments pile up waiting for the slow gateway.
+
+Run from the repository root:
+    python -m benchmarks.bench_circuit_breaker [payments per second]
+"""
+import asyncio
+import sys
+import time
+
+from Circuit_Breaker import CircuitBreaker
+from Payment_Gateway_Client import LocalGatewayServer, PooledGatewayClient
+from Payment_Processing import PaymentProcessing
+
+CARD = {"card_number": "4532015112830366", "expiry_date": "12/25", "cvv": "123"}
+DURATION = 6.0
+NORMAL_LATENCY = 0.02
+BROWNOUT_LATENCY = 2.0
+BROWNOUT = (1.0, 4.0)  # Seconds after the start during which the gateway is slow.
+
+
+async def run(rate, breaker):
+    server = LocalGatewayServer(latency=NORMAL_LATENCY, jitter=NORMAL_LATENCY / 2, seed=42)
+    host, port = await server.start_async()
+    client = PooledGatewayClient(host, port, pool_size=4, pipeline_depth=64, timeout=5.0)
+    processing = PaymentProcessing(gateway_client=client, circuit_breaker=breaker)
+    latencies, messages, tasks = [], [], []
+    in_flight = [0, 0]  # Current and peak payments waiting on the gateway.
+
+    async def pay(i):
+        began = time.perf_counter()
+        in_flight[0] += 1
+        in_flight[1] = max(in_flight[1], in_flight[0])
+        messages.append(await processing.process_payment_async({"total_amount": 10 + i % 50}, "credit_card", CARD))
+        in_flight[0] -= 1
+        latencies.append(time.perf_counter() - began)
+
+    start = time.perf_counter()
+    for i in range(int(DURATION * rate)):
+        # Open loop: payments keep arriving on schedule however slowly earlier ones complete.
+        delay = start + i / rate - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        elapsed = time.perf_counter() - start
+        server.latency = BROWNOUT_LATENCY if BROWNOUT[0] <= elapsed < BROWNOUT[1] else NORMAL_LATENCY
+        tasks.append(asyncio.ensure_future(pay(i)))
+    await asyncio.gather(*tasks)
+    seconds = time.perf_counter() - start
+    await client.close_async()
+    await server.close_async()
+    return seconds, sorted(latencies), messages, in_flight[1]
+
+
+def main(rate):
+    print(f"{'mode':<16} {'seconds':>8} {'ok':>6} {'failed fast':>12} {'timed out':>10} {'peak waiting':>13} "
+          f"{'p50 ms':>8} {'p99 ms':>8}")
+    for name, breaker in (("no breaker", None),
+                          ("circuit breaker", CircuitBreaker(window=100, min_calls=20, open_seconds=0.5))):
+        seconds, latencies, messages, peak = asyncio.run(run(rate, breaker))
+        ok = messages.count("Payment successful, Order confirmed")
+        fast = sum(message.startswith("Error: Payment gateway is unavailable") for message in messages)
+        timed_out = sum("within" in message for message in messages)
+        print(f"{name:<16} {seconds:>8.2f} {ok:>6} {fast:>12} {timed_out:>10} {peak:>13} "
+              f"{latencies[len(latencies) // 2] * 1000:>8.0f} {latencies[int(len(latencies) * 0.99)] * 1000:>8.0f}")
+        if breaker is not None:
+            print(breaker.stats())
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if sys.argv[1:] else 500)
@@ -0,0 +1,49 @@
+"""
+Compare memory footprint and query latency of the row store and the columnar backend.
+
+Run from the repository root:
+    python -m benchmarks.bench_columnar_storage [sizes...]
+"""
+import sys
+import tracemalloc
+
+from Columnar_Restaurant_Database import ColumnarRestaurantDatabase
+from Restaurant_Browsing import RestaurantBrowsing, RestaurantDatabase
+from benchmarks._catalog import best_of, synthetic_restaurants
+
+
+def measure_build(factory, rows):
+    """
+    Build a database and return it with the number of bytes it retains.
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    database = factory(rows)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return database, after - before
+
+
+def main(sizes):
+    queries = {
+        "cuisine+location+rating": dict(cuisine_type="Thai", location="Harbor", min_rating=4.0),
+        "location+rating": dict(location="Harbor", min_rating=3.0),
+        "rating >= 4.5": dict(min_rating=4.5),
+    }
+    print(f"{'rows':>9} {'backend':<9} {'bytes/row':>10} " + " ".join(f"{name:>24}" for name in queries))
+    for size in sizes:
+        rows = synthetic_restaurants(size)
+        for name, factory in (("rows", RestaurantDatabase), ("columnar", ColumnarRestaurantDatabase)):
+            database, retained = measure_build(factory, rows)
+            browsing = RestaurantBrowsing(database)
+            timings = [best_of(lambda: browsing.database.find(cuisine=query.get("cuisine_type"),
+                                                               location=query.get("location"),
+                                                               min_rating=query.get("min_rating")), repeat=3)
+                       for query in queries.values()]
+            print(f"{size:>9} {name:<9} {retained / size:>10.1f} "
+                  + " ".join(f"{timing * 1e3:>21.3f} ms" for timing in timings))
+            del database, browsing
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000])
@@ -0,0 +1,79 @@
+"""
+Measure what dynamic delivery pricing adds to checkout: proceed_to_checkout with the flat fee
+versus with a DeliveryPricingEngine, and the engine's quotes with a warm versus a cold cache.
+
+Delivery addresses are scattered around one restaurant, so most checkouts land in a zone that has
+already been quoted in the current time bucket.
+
+Run from the repository root:
+    python -m benchmarks.bench_delivery_pricing [checkouts]
+"""
+import random
+import sys
+import time
+
+from Delivery_Pricing import DeliveryPricingEngine
+from Order_Placement import Cart, OrderPlacement, RestaurantMenu, UserProfile
+
+RESTAURANT = (40.7128, -74.0060)
+
+
+def build_orders(count, engine, rng):
+    """
+    Build `count` two-item orders delivered to random points within about 5 km of the restaurant.
+    """
+    menu = RestaurantMenu(["Burger", "Fries"])
+    orders = []
+    for _ in range(count):
+        cart = Cart()
+        cart.add_item("Burger", 8.99, 1)
+        cart.add_item("Fries", 2.99, 2)
+        profile = UserProfile("123 Main St", RESTAURANT[0] + rng.uniform(-0.04, 0.04),
+                              RESTAURANT[1] + rng.uniform(-0.04, 0.04))
+        orders.append(OrderPlacement(cart, profile, menu, delivery_pricing=engine, restaurant_id=1))
+    return orders
+
+
+def time_checkouts(orders):
+    start = time.perf_counter()
+    for order in orders:
+        order.proceed_to_checkout()
+    return time.perf_counter() - start
+
+
+def main(count):
+    rng = random.Random(42)
+    engine = DeliveryPricingEngine(clock=lambda: 1_704_099_600)
+    engine.add_restaurant(1, *RESTAURANT)
+    points = [(RESTAURANT[0] + rng.uniform(-0.04, 0.04), RESTAURANT[1] + rng.uniform(-0.04, 0.04))
+              for _ in range(count)]
+    print(f"{'mode':<28} {'calls':>8} {'us/call':>8}")
+
+    start = time.perf_counter()
+    for latitude, longitude in points:
+        engine._quotes.clear()
+        engine.quote(1, latitude, longitude)
+    print(f"{'quote, cold cache':<28} {count:>8} {(time.perf_counter() - start) / count * 1e6:>8.2f}")
+    start = time.perf_counter()
+    for latitude, longitude in points:
+        engine.quote(1, latitude, longitude)
+    print(f"{'quote, warm cache':<28} {count:>8} {(time.perf_counter() - start) / count * 1e6:>8.2f}")
+    start = time.perf_counter()
+    for index, (latitude, longitude) in enumerate(points):
+        engine.set_restaurant_load(1, index % 20)
+        engine.quote(1, latitude, longitude)
+    print(f"{'quote, load changing':<28} {count:>8} {(time.perf_counter() - start) / count * 1e6:>8.2f}")
+    engine.set_restaurant_load(1, 0)
+
+    flat = build_orders(count, None, random.Random(7))
+    priced = build_orders(count, engine, random.Random(7))
+    flat_seconds = time_checkouts(flat)
+    priced_seconds = time_checkouts(priced)
+    print(f"{'checkout, flat fee':<28} {count:>8} {flat_seconds / count * 1e6:>8.2f}")
+    print(f"{'checkout, dynamic pricing':<28} {count:>8} {priced_seconds / count * 1e6:>8.2f}")
+    print(f"overhead per checkout: {(priced_seconds - flat_seconds) / count * 1e6:.2f} us, "
+          f"cache hit rate {engine.hits / (engine.hits + engine.misses):.1%}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if sys.argv[1:] else 100_000)
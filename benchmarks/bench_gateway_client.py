@@ -0,0 +1,85 @@
+"""
+Measure payment throughput against the local stand-in gateway: blocking process_payment calls one
+at a time, a fresh connection per payment, and PooledGatewayClient with pipelining at several pool
+sizes.
+
+Run from the repository root:
+    python -m benchmarks.bench_gateway_client [--latency-ms N] [payments]
+"""
+import asyncio
+import sys
+import time
+
+from Money import Money
+from Payment_Gateway_Client import LocalGatewayServer, PooledGatewayClient
+from Payment_Processing import PaymentProcessing
+
+CARD = {"card_number": "4532015112830366", "expiry_date": "12/25", "cvv": "123"}
+
+
+def report(name, count, seconds, connections):
+    print(f"{name:<30} {count:>8} {seconds:>8.2f} {count / seconds:>10.0f} {connections:>12}")
+
+
+async def charge_all(client, count):
+    return await asyncio.gather(*[client.charge_async("credit_card", CARD, Money(100 + i)) for i in range(count)])
+
+
+async def unpooled(host, port, count, concurrency):
+    """
+    Charge with a new single-connection client per payment, `concurrency` payments at a time.
+    """
+    limiter = asyncio.Semaphore(concurrency)
+
+    async def charge(i):
+        async with limiter:
+            client = PooledGatewayClient(host, port, pool_size=1)
+            try:
+                return await client.charge_async("credit_card", CARD, Money(100 + i))
+            finally:
+                await client.close_async()
+
+    return await asyncio.gather(*[charge(i) for i in range(count)])
+
+
+def main(count, latency):
+    print(f"{'mode':<30} {'payments':>8} {'seconds':>8} {'payments/s':>10} {'connections':>12}")
+
+    server = LocalGatewayServer(latency=latency, jitter=latency / 2, seed=42)
+    host, port = server.start()
+    client = PooledGatewayClient(host, port, pool_size=1)
+    processing = PaymentProcessing(gateway_client=client)
+    sample = max(1, min(count, int(1 / latency)))
+    start = time.perf_counter()
+    for _ in range(sample):
+        processing.process_payment({"total_amount": 19.99}, "credit_card", CARD)
+    report("process_payment, sequential", sample, time.perf_counter() - start, server.connections)
+    client.close()
+    server.close()
+
+    async def run():
+        server = LocalGatewayServer(latency=latency, jitter=latency / 2, seed=42)
+        host, port = await server.start_async()
+        start = time.perf_counter()
+        await unpooled(host, port, count, 100)
+        report("connection per payment, 100", count, time.perf_counter() - start, server.connections)
+        for pool_size in (1, 4, 16):
+            server.connections = 0
+            client = PooledGatewayClient(host, port, pool_size=pool_size, pipeline_depth=64, timeout=10)
+            start = time.perf_counter()
+            responses = await charge_all(client, count)
+            report(f"pooled, {pool_size} connections", count, time.perf_counter() - start, server.connections)
+            assert all(response["status"] == "success" for response in responses)
+            await client.close_async()
+        await server.close_async()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    arguments = sys.argv[1:]
+    latency_ms = 20.0
+    if arguments[:1] == ["--latency-ms"]:
+        latency_ms = float(arguments[1])
+        arguments = arguments[2:]
+    main(int(arguments[0]) if arguments else 10_000, latency_ms / 1000)
@@ -0,0 +1,64 @@
+"""
+Compare routing policies across three local stand-in card gateways with different latency
+profiles: "steady" (15 ms), "flaky" (15 ms, but 10% of requests take 400 ms) and "slow" (60 ms).
+Payments arrive at a steady rate and go through process_payment_async with a GatewayRouter.
+
+Run from the repository root:
+    python -m benchmarks.bench_gateway_router [payments per second] [seconds]
+"""
+import asyncio
+import sys
+import time
+
+from Payment_Gateway_Client import LocalGatewayServer, PooledGatewayClient
+from Payment_Gateway_Router import GatewayRouter
+from Payment_Processing import PaymentProcessing
+
+CARD = {"card_number": "4532015112830366", "expiry_date": "12/25", "cvv": "123"}
+PROFILES = {"steady": {"latency": 0.012, "jitter": 0.006},
+            "flaky": {"latency": 0.012, "jitter": 0.006, "slow_rate": 0.1, "slow_latency": 0.4},
+            "slow": {"latency": 0.05, "jitter": 0.02}}
+
+
+async def run(policy, rate, duration):
+    servers, router = [], GatewayRouter(policy=policy)
+    for name, profile in PROFILES.items():
+        server = LocalGatewayServer(seed=7, **profile)
+        host, port = await server.start_async()
+        servers.append(server)
+        router.add_backend(name, PooledGatewayClient(host, port, pool_size=2, pipeline_depth=64, timeout=5.0))
+    processing = PaymentProcessing(gateway_client=router)
+    latencies, tasks = [], []
+
+    async def pay(i):
+        began = time.perf_counter()
+        await processing.process_payment_async({"total_amount": 10 + i % 50}, "credit_card", CARD)
+        latencies.append(time.perf_counter() - began)
+
+    start = time.perf_counter()
+    for i in range(int(rate * duration)):
+        delay = start + i / rate - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.ensure_future(pay(i)))
+    await asyncio.gather(*tasks)
+    stats = router.stats()
+    await router.close_async()
+    for server in servers:
+        await server.close_async()
+    return sorted(latencies), stats
+
+
+def main(rate, duration):
+    print(f"{'policy':<18} {'p50 ms':>7} {'p90 ms':>7} {'p99 ms':>7} {'max ms':>7}   share steady/flaky/slow")
+    for policy in ("round_robin", "least_outstanding", "ewma"):
+        latencies, stats = asyncio.run(run(policy, rate, duration))
+        count = len(latencies)
+        p = lambda fraction: latencies[min(count - 1, int(count * fraction))] * 1000
+        share = "/".join(f"{stats[name]['requests'] / count:.0%}" for name in PROFILES)
+        print(f"{policy:<18} {p(0.5):>7.0f} {p(0.9):>7.0f} {p(0.99):>7.0f} {latencies[-1] * 1000:>7.0f}   {share}")
+
+
+if __name__ == "__main__":
+    arguments = sys.argv[1:]
+    main(int(arguments[0]) if arguments else 300, float(arguments[1]) if arguments[1:] else 10.0)
@@ -0,0 +1,52 @@
+"""
+Compare k-nearest and radius queries on the GeoGridIndex with brute-force haversine scans.
+
+Run from the repository root:
+    python -m benchmarks.bench_geospatial [sizes...]
+"""
+import heapq
+import random
+import sys
+import time
+
+from Geospatial_Restaurant_Search import GeoGridIndex, haversine_km
+from benchmarks._catalog import synthetic_restaurants
+
+
+def main(sizes):
+    rng = random.Random(1)
+    queries = [(40.7 + rng.uniform(-0.2, 0.2), -74.0 + rng.uniform(-0.25, 0.25)) for _ in range(50)]
+    print(f"{'rows':>9} {'cell':>6} {'query':<18} {'brute ms':>10} {'grid ms':>10} {'speedup':>8}")
+    for size in sizes:
+        restaurants = synthetic_restaurants(size, coordinates=True)
+        points = [(i, r["latitude"], r["longitude"]) for i, r in enumerate(restaurants)]
+        # Keep roughly 100 points per cell: the metro area is 0.45 x 0.6 degrees.
+        cell_size = max(0.0005, (0.27 / (size / 100)) ** 0.5)
+        index = GeoGridIndex(cell_size=cell_size)
+        for point_id, latitude, longitude in points:
+            index.insert(point_id, latitude, longitude)
+
+        cases = {
+            "10 nearest": (
+                lambda lat, lon: heapq.nsmallest(10, ((haversine_km(lat, lon, a, b), i) for i, a, b in points)),
+                lambda lat, lon: index.nearest(lat, lon, 10)),
+            "within 1 km": (
+                lambda lat, lon: [(d, i) for d, i in ((haversine_km(lat, lon, a, b), i) for i, a, b in points)
+                                  if d <= 1.0],
+                lambda lat, lon: index.within_radius(lat, lon, 1.0)),
+        }
+        for name, (brute, grid) in cases.items():
+            start = time.perf_counter()
+            for latitude, longitude in queries[:3]:
+                brute(latitude, longitude)
+            brute_time = (time.perf_counter() - start) / 3
+            start = time.perf_counter()
+            for latitude, longitude in queries:
+                grid(latitude, longitude)
+            grid_time = (time.perf_counter() - start) / len(queries)
+            print(f"{size:>9} {cell_size:>6.4f} {name:<18} {brute_time * 1e3:>10.3f} {grid_time * 1e3:>10.3f} "
+                  f"{brute_time / grid_time:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000])
@@ -0,0 +1,82 @@
+"""
+Measure what idempotency keys save when clients retry checkout: gateway calls and time for a
+stream of payments where some are retried, without keys, with the in-memory store and with the
+SQLite-backed store. Also reports the cost of answering a retry from each store.
+
+Run from the repository root:
+    python -m benchmarks.bench_idempotency [payments]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+from Idempotency_Store import IdempotencyStore
+from Payment_Processing import PaymentProcessing
+
+CARD = {"card_number": "4532015112830366", "expiry_date": "12/25", "cvv": "123"}
+GATEWAY_LATENCY = 0.001
+RETRY_RATE = 0.3
+
+
+class CountingGateway:
+    """
+    Stands in for mock_payment_gateway, sleeping for the gateway latency and counting calls.
+    """
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, method, details, amount):
+        self.calls += 1
+        time.sleep(GATEWAY_LATENCY)
+        return {"status": "success", "transaction_id": f"txn{self.calls}"}
+
+
+def build_attempts(count, rng):
+    """
+    Build (key, order) attempts: every payment once, plus a retry for about RETRY_RATE of them.
+    """
+    attempts = []
+    for i in range(count):
+        order = {"total_amount": round(rng.uniform(5, 80), 2)}
+        attempts.append((f"checkout-{i}", order))
+        if rng.random() < RETRY_RATE:
+            attempts.append((f"checkout-{i}", order))
+    return attempts
+
+
+def run(name, attempts, store, use_keys):
+    processing = PaymentProcessing(idempotency_store=store)
+    gateway = processing.mock_payment_gateway = CountingGateway()
+    start = time.perf_counter()
+    for key, order in attempts:
+        processing.process_payment(order, "credit_card", CARD, idempotency_key=key if use_keys else None)
+    seconds = time.perf_counter() - start
+    print(f"{name:<18} {len(attempts):>9} {gateway.calls:>9} {seconds:>8.2f}")
+    return processing
+
+
+def time_hits(name, processing, attempts):
+    start = time.perf_counter()
+    for key, order in attempts:
+        processing.process_payment(order, "credit_card", CARD, idempotency_key=key)
+    print(f"{name:<30} {(time.perf_counter() - start) / len(attempts) * 1e6:>8.1f} us")
+
+
+def main(count):
+    attempts = build_attempts(count, random.Random(42))
+    print(f"{'mode':<18} {'attempts':>9} {'charges':>9} {'seconds':>8}")
+    run("no keys", attempts, None, False)
+    memory = run("in-memory store", attempts, IdempotencyStore(max_entries=count), True)
+    with tempfile.TemporaryDirectory() as directory:
+        store = IdempotencyStore(max_entries=count, path=os.path.join(directory, "idempotency.db"))
+        persistent = run("SQLite store", attempts, store, True)
+        print()
+        time_hits("retry answered, in-memory", memory, attempts)
+        time_hits("retry answered, SQLite", persistent, attempts)
+        store.close()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if sys.argv[1:] else 5_000)
@@ -0,0 +1,92 @@
+"""
+Compare float, decimal.Decimal and Money when totalling orders: line subtotals, 10% tax rounded to
+the cent, a flat delivery fee, and the amount in cents handed to the payment gateway.
+
+Every backend totals the same orders from the same menu. The float amounts are checked against
+the exact Decimal ones to count how many orders would be charged the wrong number of cents.
+
+Run from the repository root:
+    python -m benchmarks.bench_money [orders...]
+"""
+import random
+import sys
+import time
+from decimal import ROUND_HALF_UP, Decimal
+
+from Money import Money
+
+CENT = Decimal("0.01")
+
+
+def float_charges(orders, menu):
+    prices = [cents / 100 for cents in menu]
+    charges = []
+    for lines in orders:
+        subtotal = 0.0
+        for item, quantity in lines:
+            subtotal += prices[item] * quantity
+        total = subtotal + subtotal * 0.10 + 5.0
+        charges.append(int(round(total * 100)))
+    return charges
+
+
+def decimal_charges(orders, menu):
+    prices = [Decimal(cents).scaleb(-2) for cents in menu]
+    rate, fee = Decimal("0.10"), Decimal("5.00")
+    charges = []
+    for lines in orders:
+        subtotal = Decimal(0)
+        for item, quantity in lines:
+            subtotal += prices[item] * quantity
+        total = subtotal + (subtotal * rate).quantize(CENT, rounding=ROUND_HALF_UP) + fee
+        charges.append(int(total.scaleb(2)))
+    return charges
+
+
+def money_operator_charges(orders, menu):
+    prices = [Money(cents) for cents in menu]
+    rate, fee = Decimal("0.10"), Money(500)
+    charges = []
+    for lines in orders:
+        subtotal = Money(0)
+        for item, quantity in lines:
+            subtotal += prices[item] * quantity
+        charges.append((subtotal + subtotal.scale(rate) + fee).cents)
+    return charges
+
+
+def money_charges(orders, menu):
+    # The way Cart keeps its running subtotal: add up integer cents, using Money only for the tax rule.
+    prices = [Money(cents) for cents in menu]
+    rate, fee = Decimal("0.10"), Money(500)
+    charges = []
+    for lines in orders:
+        cents = 0
+        for item, quantity in lines:
+            cents += prices[item].cents * quantity
+        charges.append(cents + Money(cents).scale(rate).cents + fee.cents)
+    return charges
+
+
+def main(sizes):
+    rng = random.Random(42)
+    menu = [rng.randint(99, 4999) for _ in range(500)]
+    backends = (("Decimal", decimal_charges), ("float", float_charges),
+                ("Money ops", money_operator_charges), ("Money", money_charges))
+    print(f"{'orders':>9} {'type':<10} {'seconds':>8} {'ns/order':>9} {'wrong cents':>12}")
+    for size in sizes:
+        orders = [[(rng.randrange(len(menu)), rng.randint(1, 3)) for _ in range(rng.randint(1, 5))]
+                  for _ in range(size)]
+        exact = None
+        for name, function in backends:
+            start = time.perf_counter()
+            charges = function(orders, menu)
+            seconds = time.perf_counter() - start
+            if exact is None:
+                exact = charges
+            wrong = sum(1 for charged, expected in zip(charges, exact) if charged != expected)
+            print(f"{size:>9} {name:<10} {seconds:>8.2f} {seconds / size * 1e9:>9.0f} {wrong:>12}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1_000_000])
@@ -0,0 +1,83 @@
+"""
+Time fuzzy name search and per-keystroke autocomplete on the RestaurantTextIndex against linear scans.
+
+Run from the repository root:
+    python -m benchmarks.bench_name_search [sizes...]
+"""
+import difflib
+import random
+import sys
+import time
+
+from Restaurant_Name_Search import RestaurantTextIndex, normalize_text
+from benchmarks._catalog import CUISINES, LOCATIONS
+
+WORDS = ["Golden", "Dragon", "Palace", "Garden", "Kitchen", "Grill", "House", "Corner", "Bistro", "Cafe",
+         "Tavern", "Noodle", "Burger", "Pizza", "Taco", "Curry", "Sushi", "Bagel", "Bakery", "Diner",
+         "Smokehouse", "Lotus", "Olive", "Harvest", "Spice", "Lucky", "Royal", "Little", "Blue", "Red"]
+
+
+def restaurant_names(count, seed=3):
+    """
+    Generate distinct, realistic-looking restaurant names such as "Lucky Dragon Kitchen 8412".
+    """
+    rng = random.Random(seed)
+    vocabulary = WORDS + CUISINES + LOCATIONS
+    return [f"{rng.choice(vocabulary)} {rng.choice(vocabulary)} {rng.choice(WORDS)} {i}" for i in range(count)]
+
+
+def misspell(text, rng):
+    """
+    Apply one random deletion, insertion or transposition to a word longer than three letters.
+    """
+    words = text.split()
+    position = rng.choice([i for i, word in enumerate(words) if len(word) > 3])
+    word = words[position]
+    i = rng.randrange(1, len(word) - 2)
+    words[position] = rng.choice([word[:i] + word[i + 1:], word[:i] + "x" + word[i:],
+                                  word[:i] + word[i + 1] + word[i] + word[i + 2:]])
+    return " ".join(words)
+
+
+def main(sizes):
+    rng = random.Random(5)
+    print(f"{'rows':>9} {'build s':>8} {'query':<22} {'scan ms':>10} {'index ms':>10} {'recall':>7}")
+    for size in sizes:
+        names = restaurant_names(size)
+        start = time.perf_counter()
+        index = RestaurantTextIndex()
+        for restaurant_id, name in enumerate(names):
+            index.add(restaurant_id, name)
+        build_time = time.perf_counter() - start
+        normalized = [normalize_text(name) for name in names]
+
+        targets = rng.sample(range(size), 20)
+        typos = [misspell(names[i], rng) for i in targets]
+        scan_ms = "skipped"  # difflib takes tens of seconds per query beyond 100k names
+        if size <= 100_000:
+            start = time.perf_counter()
+            for query in typos[:2]:
+                difflib.get_close_matches(normalize_text(query), normalized, n=10, cutoff=0.6)
+            scan_ms = f"{(time.perf_counter() - start) / 2 * 1e3:.2f}"
+        start = time.perf_counter()
+        found = sum(target in [match[1] for match in index.search(query)] for target, query in zip(targets, typos))
+        fuzzy_time = (time.perf_counter() - start) / len(typos)
+        print(f"{size:>9} {build_time:>8.2f} {'fuzzy (1 typo)':<22} {scan_ms:>10} "
+              f"{fuzzy_time * 1e3:>10.3f} {found / len(typos):>7.0%}")
+
+        # Every keystroke of a few names, as a user typing into the search box would send them.
+        keystrokes = [names[i][:length].lower() for i in targets[:5] for length in range(1, 12)]
+        start = time.perf_counter()
+        for prefix in keystrokes[:11]:
+            [i for i, name in enumerate(normalized) if name.startswith(prefix)][:10]
+        prefix_scan_time = (time.perf_counter() - start) / 11
+        start = time.perf_counter()
+        for prefix in keystrokes:
+            index.autocomplete(prefix, 10)
+        autocomplete_time = (time.perf_counter() - start) / len(keystrokes)
+        print(f"{size:>9} {'':>8} {'autocomplete keystroke':<22} {prefix_scan_time * 1e3:>10.2f} "
+              f"{autocomplete_time * 1e3:>10.3f} {'':>7}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000])
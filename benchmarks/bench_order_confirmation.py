@@ -0,0 +1,78 @@
+"""
+Compare confirming orders one at a time with OrderPlacement.confirm_order against the batch
+OrderPlacement.confirm_orders, using a fake gateway that charges a fixed round trip per call.
+
+Run from the repository root:
+    python -m benchmarks.bench_order_confirmation [--round-trip-ms N] [orders...]
+"""
+import random
+import sys
+import time
+
+from Order_Placement import Cart, OrderPlacement, PaymentFailedException, PaymentMethod, RestaurantMenu, UserProfile
+
+
+class FakeGateway(PaymentMethod):
+    """
+    A payment method whose every call, single or batched, waits one network round trip.
+    """
+    def __init__(self, round_trip):
+        self.round_trip = round_trip
+
+    def process_payment(self, amount):
+        time.sleep(self.round_trip)
+        return amount > 0
+
+    def process_payments(self, amounts):
+        time.sleep(self.round_trip)
+        return [amount > 0 for amount in amounts]
+
+
+def build_orders(count, rng):
+    """
+    Build `count` orders of one to five items from a handful of restaurants.
+    """
+    dishes = [f"Dish {index}" for index in range(200)]
+    menus = [RestaurantMenu(rng.sample(dishes, 150)) for _ in range(20)]
+    profile = UserProfile(delivery_address="123 Main St")
+    orders = []
+    for _ in range(count):
+        cart = Cart()
+        for name in rng.sample(dishes, rng.randint(1, 5)):
+            cart.add_item(name, rng.randint(199, 2999) / 100, rng.randint(1, 3))
+        orders.append(OrderPlacement(cart, profile, rng.choice(menus)))
+    return orders
+
+
+def confirm_one_by_one(orders, gateway):
+    results = []
+    for order in orders:
+        try:
+            results.append(order.confirm_order(gateway))
+        except PaymentFailedException as error:
+            results.append({"success": False, "message": "Payment failed", "error": error})
+    return results
+
+
+def main(sizes, round_trip):
+    rng = random.Random(42)
+    gateway = FakeGateway(round_trip)
+    print(f"{'orders':>8} {'mode':<12} {'seconds':>8} {'orders/s':>10} {'confirmed':>10}")
+    for size in sizes:
+        orders = build_orders(size, rng)
+        for name, function in (("one by one", confirm_one_by_one),
+                               ("batch", lambda batch, payment: OrderPlacement.confirm_orders(batch, payment))):
+            start = time.perf_counter()
+            results = function(orders, gateway)
+            seconds = time.perf_counter() - start
+            confirmed = sum(1 for result in results if result["success"])
+            print(f"{size:>8} {name:<12} {seconds:>8.2f} {size / seconds:>10.0f} {confirmed:>10}")
+
+
+if __name__ == "__main__":
+    arguments = sys.argv[1:]
+    round_trip_ms = 0.2
+    if arguments[:1] == ["--round-trip-ms"]:
+        round_trip_ms = float(arguments[1])
+        arguments = arguments[2:]
+    main([int(arg) for arg in arguments] or [10_000], round_trip_ms / 1000)
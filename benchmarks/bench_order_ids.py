@@ -0,0 +1,71 @@
+"""
+Measure order ID throughput: one ID per call, blocks of IDs, several threads sharing one generator,
+and several forked worker processes, checking that every ID is unique.
+
+Run from the repository root:
+    python -m benchmarks.bench_order_ids [ids per run]
+"""
+import multiprocessing
+import sys
+import threading
+import time
+
+from Order_ID_Generator import OrderIdGenerator, default_generator
+
+
+def worker_ids(count, queue):
+    """
+    Generate `count` IDs in blocks from the default generator a forked worker inherits.
+    """
+    start = time.perf_counter()
+    ids = []
+    while len(ids) < count:
+        ids.extend(default_generator.next_ids(min(1000, count - len(ids))))
+    queue.put((time.perf_counter() - start, ids))
+
+
+def report(name, count, seconds, ids):
+    print(f"{name:<26} {count:>10} {seconds:>8.3f} {count / seconds / 1e6:>10.2f} {len(set(ids)) == count!s:>7}")
+
+
+def main(count):
+    generator = OrderIdGenerator()
+    print(f"{'mode':<26} {'ids':>10} {'seconds':>8} {'M ids/s':>10} {'unique':>7}")
+
+    next_id = generator.next_id
+    start = time.perf_counter()
+    ids = [next_id() for _ in range(count)]
+    report("next_id", count, time.perf_counter() - start, ids)
+
+    start = time.perf_counter()
+    ids = []
+    for _ in range(count // 1000):
+        ids.extend(generator.next_ids(1000))
+    report("next_ids(1000)", len(ids), time.perf_counter() - start, ids)
+
+    batches = []
+    threads = [threading.Thread(target=lambda: batches.append([next_id() for _ in range(count // 4)]))
+               for _ in range(4)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    ids = [order_id for batch in batches for order_id in batch]
+    report("next_id, 4 threads", len(ids), time.perf_counter() - start, ids)
+
+    if "fork" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("fork")
+        queue = context.Queue()
+        workers = [context.Process(target=worker_ids, args=(count, queue)) for _ in range(4)]
+        for worker in workers:
+            worker.start()
+        results = [queue.get() for _ in workers]
+        for worker in workers:
+            worker.join()
+        ids = [order_id for _, batch in results for order_id in batch]
+        report("next_ids, 4 processes", len(ids), max(seconds for seconds, _ in results), ids)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if sys.argv[1:] else 1_000_000)
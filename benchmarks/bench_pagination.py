@@ -0,0 +1,41 @@
+"""
+Compare peak memory and latency of a broad search returned as a full list versus one 20-row page.
+
+Run from the repository root:
+    python -m benchmarks.bench_pagination [sizes...]
+"""
+import sys
+import tracemalloc
+
+from Restaurant_Browsing import RestaurantBrowsing, RestaurantDatabase
+from benchmarks._catalog import best_of, synthetic_restaurants
+
+
+def peak_bytes(function):
+    """
+    Return the peak traced allocation while running a callable.
+    """
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def main(sizes):
+    print(f"{'rows':>9} {'request':<32} {'peak KiB':>10} {'ms':>9}")
+    for size in sizes:
+        browsing = RestaurantBrowsing(RestaurantDatabase(synthetic_restaurants(size)))
+        second_cursor = browsing.search_page(limit=20, min_rating=0)["next_cursor"]
+        requests = {
+            "search_by_rating(0)": lambda: browsing.search_by_rating(0),
+            "search_page(rating, page 2)": lambda: browsing.search_page(limit=20, after=second_cursor, min_rating=0),
+            "search_page(name, Harbor)": lambda: browsing.search_page(limit=20, sort_by="name", location="Harbor"),
+        }
+        for name, request in requests.items():
+            print(f"{size:>9} {name:<32} {peak_bytes(request) / 1024:>10.1f} "
+                  f"{best_of(request, repeat=3) * 1e3:>9.3f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000])
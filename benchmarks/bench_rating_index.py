@@ -0,0 +1,43 @@
+"""
+Compare rating-range and top-K queries on the sorted rating index with list scans and sorts.
+
+Run from the repository root:
+    python -m benchmarks.bench_rating_index [sizes...]
+"""
+import sys
+
+from Restaurant_Browsing import RestaurantDatabase
+from benchmarks._catalog import best_of, synthetic_restaurants
+
+
+def main(sizes):
+    print(f"{'rows':>9} {'query':<30} {'scan ms':>10} {'index ms':>10} {'speedup':>8}")
+    for size in sizes:
+        rows = synthetic_restaurants(size)
+        database = RestaurantDatabase(rows)
+        cases = [
+            ("rating >= 4.9",
+             lambda: [r for r in rows if r['rating'] >= 4.9],
+             lambda: database.find(min_rating=4.9)),
+            ("4.9 <= rating, Harbor",
+             lambda: [r for r in rows if r['location'].lower() == "harbor" and r['rating'] >= 4.9],
+             lambda: database.find(location="Harbor", min_rating=4.9)),
+            ("top 10 in Downtown",
+             lambda: sorted((r for r in rows if r['location'].lower() == "downtown"),
+                            key=lambda r: r['rating'], reverse=True)[:10],
+             lambda: database.top_rated(10, location="Downtown")),
+            ("top 10 Thai in Downtown",
+             lambda: sorted((r for r in rows if r['location'].lower() == "downtown"
+                             and r['cuisine'].lower() == "thai"),
+                            key=lambda r: r['rating'], reverse=True)[:10],
+             lambda: database.top_rated(10, cuisine="Thai", location="Downtown")),
+        ]
+        for name, scan, indexed in cases:
+            scan_time = best_of(scan, repeat=3)
+            index_time = best_of(indexed)
+            print(f"{size:>9} {name:<30} {scan_time * 1e3:>10.3f} {index_time * 1e3:>10.3f} "
+                  f"{scan_time / index_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000])
@@ -0,0 +1,51 @@
+"""
+Compare the inverted-index lookups of RestaurantDatabase with the original full-table scans.
+
+Run from the repository root:
+    python -m benchmarks.bench_restaurant_indexes [sizes...]
+"""
+import sys
+
+from Restaurant_Browsing import RestaurantBrowsing, RestaurantDatabase
+from benchmarks._catalog import best_of, synthetic_restaurants
+
+
+def scan_search_by_filters(rows, cuisine_type=None, location=None, min_rating=None):
+    """
+    The pre-index implementation: lowercase every row on every query.
+    """
+    results = rows
+    if cuisine_type:
+        results = [r for r in results if r['cuisine'].lower() == cuisine_type.lower()]
+    if location:
+        results = [r for r in results if r['location'].lower() == location.lower()]
+    if min_rating is not None:
+        results = [r for r in results if r['rating'] >= min_rating]
+    return results
+
+
+def main(sizes):
+    print(f"{'rows':>9} {'query':<28} {'scan ms':>10} {'index ms':>10} {'speedup':>8}")
+    for size in sizes:
+        rows = synthetic_restaurants(size)
+        browsing = RestaurantBrowsing(RestaurantDatabase(rows))
+        queries = {
+            "cuisine": lambda: browsing.search_by_cuisine("Thai"),
+            "cuisine+location": lambda: browsing.database.find(cuisine="Thai", location="Harbor"),
+            "cuisine+location+rating": lambda: browsing.database.find(cuisine="Thai", location="Harbor",
+                                                                      min_rating=4.0),
+        }
+        scans = {
+            "cuisine": lambda: scan_search_by_filters(rows, cuisine_type="Thai"),
+            "cuisine+location": lambda: scan_search_by_filters(rows, "Thai", "Harbor"),
+            "cuisine+location+rating": lambda: scan_search_by_filters(rows, "Thai", "Harbor", 4.0),
+        }
+        for name, query in queries.items():
+            scan_time = best_of(scans[name], repeat=3)
+            index_time = best_of(query)
+            print(f"{size:>9} {name:<28} {scan_time * 1e3:>10.3f} {index_time * 1e3:>10.3f} "
+                  f"{scan_time / index_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000])
@@ -0,0 +1,112 @@
+"""
+Compare worker start-up time and memory when each worker rebuilds RestaurantDatabase from a
+JSON Lines catalog versus memory-mapping a shared snapshot file.
+
+Several workers are started at once and kept alive together, so the proportional set size
+(PSS) shows how much of each worker's resident memory is shared with the others. The snapshot
+file is freshly written, so start-up is measured with a warm page cache.
+
+Run from the repository root (Linux, for /proc/self/smaps_rollup):
+    python -m benchmarks.bench_snapshot [--workers N] [sizes...]
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from Restaurant_Browsing import RestaurantBrowsing, RestaurantDatabase
+from Restaurant_Catalog_Loader import load_catalog
+from Restaurant_Snapshot import SnapshotRestaurantDatabase, write_snapshot
+from benchmarks._catalog import synthetic_restaurants
+
+
+def memory_mb():
+    """
+    Read this process's Rss, Pss and private memory in megabytes from /proc/self/smaps_rollup.
+    """
+    fields = {}
+    with open("/proc/self/smaps_rollup") as handle:
+        for line in handle:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1]) / 1024
+    return {"rss": fields["Rss"], "pss": fields["Pss"],
+            "private": fields["Private_Clean"] + fields["Private_Dirty"]}
+
+
+def worker(mode, path):
+    """
+    Start a database the given way, run a few queries, then report once the parent says all workers are up.
+    """
+    start = time.perf_counter()
+    if mode == "rebuild":
+        database = RestaurantDatabase(restaurants=[])
+        load_catalog(database, path)
+    else:
+        database = SnapshotRestaurantDatabase(path)
+    startup = time.perf_counter() - start
+    browsing = RestaurantBrowsing(database)
+    start = time.perf_counter()
+    browsing.search_by_filters(cuisine_type="Italian", location="Harbor", min_rating=4.5)
+    browsing.top_rated(10, cuisine_type="Thai")
+    browsing.search_page(limit=20, min_rating=4.0)
+    queries = time.perf_counter() - start
+    print("ready", flush=True)
+    sys.stdin.readline()
+    print(json.dumps(dict(memory_mb(), startup=startup, queries=queries)), flush=True)
+
+
+def run_workers(mode, path, count):
+    """
+    Run `count` workers concurrently and return their reports.
+    """
+    processes = [subprocess.Popen([sys.executable, "-m", "benchmarks.bench_snapshot", "--worker", mode, path],
+                                  stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+                 for _ in range(count)]
+    for process in processes:
+        process.stdout.readline()
+    reports = []
+    for process in processes:
+        process.stdin.write("\n")
+        process.stdin.flush()
+        reports.append(json.loads(process.stdout.readline()))
+        process.wait()
+    return reports
+
+
+def main(sizes, workers):
+    print(f"{'rows':>9} {'mode':<9} {'startup s':>10} {'queries ms':>11} {'RSS MB':>8} {'PSS MB':>8} "
+          f"{'private MB':>11}")
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            catalog = os.path.join(directory, f"catalog_{size}.jsonl")
+            with open(catalog, "w", encoding="utf-8") as handle:
+                for restaurant in synthetic_restaurants(size, coordinates=True):
+                    handle.write(json.dumps(restaurant) + "\n")
+            snapshot = os.path.join(directory, f"catalog_{size}.snap")
+            database = RestaurantDatabase(restaurants=[])
+            load_catalog(database, catalog)
+            start = time.perf_counter()
+            write_snapshot(database, snapshot)
+            print(f"{size:>9} wrote {os.path.getsize(snapshot) / 2 ** 20:.1f} MB snapshot in "
+                  f"{time.perf_counter() - start:.2f} s")
+            del database
+            for mode, path in (("rebuild", catalog), ("snapshot", snapshot)):
+                reports = run_workers(mode, path, workers)
+                averages = {key: sum(report[key] for report in reports) / len(reports) for key in reports[0]}
+                print(f"{size:>9} {mode:<9} {averages['startup']:>10.3f} {averages['queries'] * 1e3:>11.2f} "
+                      f"{averages['rss']:>8.1f} {averages['pss']:>8.1f} {averages['private']:>11.1f}")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--worker"]:
+        worker(sys.argv[2], sys.argv[3])
+    else:
+        arguments = sys.argv[1:]
+        workers = 4
+        if arguments[:1] == ["--workers"]:
+            workers = int(arguments[1])
+            arguments = arguments[2:]
+        main([int(arg) for arg in arguments] or [100_000], workers)
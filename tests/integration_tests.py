@@ -1,6 +1,7 @@
 import unittest
 from unittest import mock
 
+from Money import Money
 from Order_Placement import (Cart, CartItem, OrderPlacement, PaymentFailedException,
                              PaymentMethod, RestaurantMenu, UserProfile)
 
@@ -30,22 +31,20 @@ class TestOrderPlacementIntegration(unittest.TestCase):
         # Check out
         checkout_result = self.order.proceed_to_checkout()
         expected_checkout_result = {
-            "items": [{"name": "Burger", "quantity": 2, "subtotal": 17.98}, {"name": "Pizza", "quantity": 1, "subtotal": 12.99}],
-            "total_info": {"subtotal": 30.97, "tax": 3.1, "delivery_fee": 5.0, "total": 39.07},
+            "items": [{"name": "Burger", "quantity": 2, "subtotal": Money(1798)}, {"name": "Pizza", "quantity": 1, "subtotal": Money(1299)}],
+            "total_info": {"subtotal": Money(3097), "tax": Money(310), "delivery_fee": Money(500), "total": Money(3907)},
             "delivery_address": "123 Main St"
         }
         self.assertEqual(checkout_result["items"], expected_checkout_result["items"])
         self.assertEqual(checkout_result["delivery_address"], expected_checkout_result["delivery_address"])
-        self.assertAlmostEqual(checkout_result["total_info"]["subtotal"], expected_checkout_result["total_info"]["subtotal"], places=2)
-        self.assertAlmostEqual(checkout_result["total_info"]["tax"], expected_checkout_result["total_info"]["tax"], places=2)
-        self.assertAlmostEqual(checkout_result["total_info"]["total"], expected_checkout_result["total_info"]["total"], places=2)
+        self.assertEqual(checkout_result["total_info"], expected_checkout_result["total_info"])
 
         # Simulate successful payment and confirm the order
         with mock.patch.object(self.payment_method, 'process_payment', return_value=True):
             confirm_result = self.order.confirm_order(self.payment_method)
             self.assertTrue(confirm_result["success"])
             self.assertEqual(confirm_result["message"], "Order confirmed")
-            self.assertEqual(confirm_result["order_id"], "ORD123456")
+            self.assertRegex(confirm_result["order_id"], r"^ORD[0-9a-f]{24}$")
 
     def test_order_process_with_unavailable_item(self):
         """
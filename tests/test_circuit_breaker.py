@@ -0,0 +1,119 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from Circuit_Breaker import CircuitBreaker, CircuitOpenError
+from Payment_Gateway_Client import GatewayUnavailableError
+from Payment_Processing import PaymentProcessing
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """
+    Unit tests for the CircuitBreaker class.
+    """
+
+    def setUp(self):
+        """
+        Set up a breaker with a controllable clock.
+        """
+        self.now = [0.0]
+        self.breaker = CircuitBreaker(window=10, min_calls=4, failure_rate_threshold=0.5, open_seconds=30,
+                                      half_open_probes=2, min_timeout=0.01, max_timeout=1.0,
+                                      clock=lambda: self.now[0])
+
+    def call(self, seconds, error=None):
+        """
+        Make a call through the breaker that takes `seconds` on the fake clock and optionally raises.
+        """
+        def function():
+            self.now[0] += seconds
+            if error is not None:
+                raise error
+            return "ok"
+        return self.breaker.call(function)
+
+    def test_opens_on_failures_then_probes_and_closes(self):
+        """
+        Test closed -> open -> half-open -> closed, and that a failed probe reopens the breaker.
+        """
+        self.call(0.01)
+        self.call(0.01)
+        for _ in range(2):
+            with self.assertRaises(ConnectionError):
+                self.call(0.01, ConnectionError("down"))
+        self.assertEqual(self.breaker.state, "open")
+        with self.assertRaises(CircuitOpenError):
+            self.call(0.01)
+
+        self.now[0] += 31
+        with self.assertRaises(ConnectionError):
+            self.call(0.01, ConnectionError("still down"))
+        self.assertEqual(self.breaker.state, "open")
+
+        self.now[0] += 31
+        self.assertEqual(self.call(0.01), "ok")
+        self.assertEqual(self.breaker.stats()["state"], "half_open")
+        self.assertEqual(self.call(0.01), "ok")
+        self.assertEqual(self.breaker.state, "closed")
+        stats = self.breaker.stats()
+        self.assertEqual((stats["calls"], stats["failures"], stats["rejected"], stats["opened"]), (7, 3, 1, 2))
+
+    def test_timeout_follows_p99_latency_and_slow_calls_fail(self):
+        """
+        Test that the timeout is derived from recent latency and that calls slower than it count as failures.
+        """
+        self.assertEqual(self.breaker.timeout, 1.0)
+        for latency in (0.010, 0.012, 0.011, 0.040):
+            self.call(latency)
+        self.assertAlmostEqual(self.breaker.percentile(0.99), 0.040)
+        self.assertAlmostEqual(self.breaker.timeout, 0.080)
+        self.assertEqual(self.call(0.5), "ok")
+        self.assertEqual(self.breaker.stats()["timeouts"], 1)
+
+        async def slow():
+            await asyncio.sleep(1)
+
+        breaker = CircuitBreaker(min_calls=1, min_timeout=0.01, max_timeout=0.05)
+        with self.assertRaises(TimeoutError):
+            asyncio.run(breaker.call_async(slow))
+        self.assertEqual(breaker.stats()["timeouts"], 1)
+
+    def test_blocking_calls_get_the_admitted_timeout(self):
+        """
+        Test that a blocking call is handed the timeout it was admitted with and its TimeoutError counts as one.
+        """
+        for latency in (0.010, 0.012, 0.011, 0.040):
+            self.call(latency)
+        timeouts = []
+
+        def gateway(amount, timeout=None):
+            timeouts.append(timeout)
+            self.now[0] += timeout
+            raise TimeoutError("no response")
+
+        with self.assertRaises(TimeoutError):
+            self.breaker.call(gateway, 100, pass_timeout=True)
+        self.assertAlmostEqual(timeouts[0], 0.080)
+        stats = self.breaker.stats()
+        self.assertEqual((stats["failures"], stats["timeouts"]), (1, 1))
+        with self.assertRaises(ConnectionError):
+            self.call(0.01, ConnectionError("down"))
+        self.assertEqual(self.breaker.stats()["timeouts"], 1)
+
+    def test_process_payment_fails_fast_while_open(self):
+        """
+        Test that process_payment stops calling a failing gateway once the breaker opens.
+        """
+        processing = PaymentProcessing(circuit_breaker=self.breaker)
+        order = {"total_amount": 100.00}
+        payment_details = {"card_number": "4532015112830366", "expiry_date": "12/25", "cvv": "123"}
+        with mock.patch.object(processing, 'mock_payment_gateway',
+                               side_effect=GatewayUnavailableError("Gateway unreachable")) as gateway:
+            results = [processing.process_payment(order, "credit_card", payment_details) for _ in range(6)]
+        self.assertEqual(gateway.call_count, 4)
+        self.assertEqual(results[0], "Error: Gateway unreachable")
+        self.assertTrue(results[-1].startswith("Error: Payment gateway is unavailable"))
+
+
+if __name__ == "__main__":
+    unittest.main()
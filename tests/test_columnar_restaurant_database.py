@@ -0,0 +1,112 @@
+import unittest
+from unittest import mock
+
+import Columnar_Restaurant_Database
+from Columnar_Restaurant_Database import ColumnarRestaurantDatabase
+from Restaurant_Browsing import RestaurantBrowsing, RestaurantDatabase
+
+
+class TestColumnarRestaurantDatabase(unittest.TestCase):
+    """
+    Unit tests checking that the columnar backend answers RestaurantBrowsing queries like the row store.
+    """
+
+    def setUp(self):
+        """
+        Set up a row-store and a columnar database holding the same restaurants.
+        """
+        self.rows = RestaurantDatabase()
+        self.columns = ColumnarRestaurantDatabase(self.rows.get_restaurants())
+
+    def run_searches(self):
+        """
+        Run the same searches against both backends and compare the returned rows.
+        """
+        for database in (self.rows, self.columns):
+            browsing = RestaurantBrowsing(database)
+            yield (browsing.search_by_cuisine("italian"),
+                   browsing.search_by_location("Downtown"),
+                   browsing.search_by_rating(4.2),
+                   browsing.search_by_filters(cuisine_type="Italian", location="Uptown", min_rating=3.0),
+                   browsing.top_rated(3, location="Downtown"))
+
+    def test_queries_match_row_store(self):
+        """
+        Test that every search returns the same rows from both backends.
+        """
+        expected, actual = self.run_searches()
+        self.assertEqual(expected, actual)
+
+    def test_queries_without_numpy(self):
+        """
+        Test the pure Python predicate fallback used when NumPy is not installed.
+        """
+        with mock.patch.object(Columnar_Restaurant_Database, "np", None):
+            expected, actual = self.run_searches()
+        self.assertEqual(expected, actual)
+
+    def test_mutations(self):
+        """
+        Test that updates re-encode values and deletes hide rows from every query.
+        """
+        self.columns.update_restaurant(0, cuisine="Greek", rating=4.9)
+        self.assertEqual(self.columns.find(cuisine="greek")[0]['name'], "Italian Bistro")
+        self.assertEqual(self.columns.top_rated(1)[0]['name'], "Italian Bistro")
+
+        self.columns.remove_restaurant(0)
+        self.assertEqual(len(self.columns), 4)
+        self.assertEqual(self.columns.top_rated(1)[0]['name'], "Sushi House")
+        self.assertEqual(self.columns.find(cuisine="Greek"), [])
+        with self.assertRaises(KeyError):
+            self.columns.get_restaurant(0)
+
+    def test_invalid_rows_leave_the_columns_aligned(self):
+        """
+        Test that a rejected insert or update changes no column, so later rows keep their own values.
+        """
+        valid = {"name": "Corner Cafe", "cuisine": "French", "location": "Uptown", "rating": 4.1,
+                 "price_range": "$$", "delivery": True}
+        version = self.columns.version
+        with self.assertRaises(ValueError):
+            self.columns.add_restaurant({"name": "Bad", "cuisine": "Thai", "location": "Downtown"})
+        with self.assertRaises(ValueError):
+            self.columns.add_restaurant(dict(valid, name="Bad", menu=["Soup", 3]))
+        with self.assertRaises(ValueError):
+            self.columns.update_restaurant(0, name="Bad", cuisine=None)
+        with self.assertRaises(ValueError):
+            self.columns.update_restaurant(0, name="Bad", latitude=91.0, longitude=0.0)
+        self.assertEqual(self.columns.version, version)
+        self.assertEqual(self.columns.get_restaurant(0), self.rows.get_restaurant(0))
+
+        restaurant_id = self.columns.add_restaurant(valid)
+        self.assertEqual(self.columns.get_restaurant(restaurant_id)['name'], "Corner Cafe")
+        self.assertEqual(RestaurantBrowsing(self.columns).autocomplete("corn"),
+                         [self.columns.get_restaurant(restaurant_id)])
+        self.assertEqual(len(self.columns), 6)
+
+    def test_search_page_matches_row_store(self):
+        """
+        Test that keyset pagination over the columnar backend yields the row store's pages.
+        """
+        for sort_by in ("rating", "name"):
+            pages = []
+            for database in (self.rows, self.columns):
+                browsing = RestaurantBrowsing(database)
+                first = browsing.search_page(limit=2, sort_by=sort_by)
+                second = browsing.search_page(limit=2, after=first["next_cursor"], sort_by=sort_by)
+                pages.append(first["results"] + second["results"])
+            self.assertEqual(pages[0], pages[1])
+
+    def test_facets_match_row_store(self):
+        """
+        Test that both backends maintain the same vocabularies through updates and deletes.
+        """
+        for database in (self.rows, self.columns):
+            database.update_restaurant(4, location="Harbor")
+            database.remove_restaurant(1)
+        self.assertEqual(self.columns.facets(), self.rows.facets())
+        self.assertEqual(self.columns.facets()["location"], {"Downtown": 2, "Uptown": 1, "Harbor": 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
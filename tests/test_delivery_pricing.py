@@ -0,0 +1,93 @@
+import unittest
+
+from Delivery_Pricing import DeliveryPricingEngine
+from Money import Money
+from Order_Placement import Cart, OrderPlacement, PaymentMethod, RestaurantMenu, UserProfile
+
+# 2024-01-01 09:00 and 18:00 UTC.
+MORNING = 1_704_099_600
+EVENING = 1_704_132_000
+
+
+class TestDeliveryPricing(unittest.TestCase):
+    """
+    Unit tests for delivery fee and ETA quotes and their use at checkout.
+    """
+
+    def setUp(self):
+        """
+        Set up an engine with one restaurant in lower Manhattan and a fixed clock.
+        """
+        self.now = [MORNING]
+        self.engine = DeliveryPricingEngine(clock=lambda: self.now[0])
+        self.engine.add_restaurant(1, 40.7128, -74.0060, prep_minutes=12)
+
+    def test_fee_grows_with_distance_and_peak_hours(self):
+        """
+        Test distance bands, the per-kilometre fee beyond them and the dinner peak multiplier.
+        """
+        near = self.engine.quote(1, 40.7150, -74.0050)
+        far = self.engine.quote(1, 40.7831, -73.9712)
+        self.assertEqual(near["delivery_fee"], Money(299))
+        self.assertGreater(far["delivery_fee"], Money(699))
+        self.assertLess(near["eta_minutes"], far["eta_minutes"])
+        evening = self.engine.quote(1, 40.7150, -74.0050, when=EVENING)
+        self.assertEqual(evening["delivery_fee"], Money(374))
+        self.assertGreaterEqual(evening["eta_minutes"], near["eta_minutes"])
+        with self.assertRaises(ValueError):
+            self.engine.quote(1, 41.5, -74.0)
+        with self.assertRaises(ValueError):
+            self.engine.quote(99, 40.7150, -74.0050)
+
+    def test_quotes_are_memoized_per_zone_and_bucket(self):
+        """
+        Test that repeated quotes hit the cache until the bucket moves on, and that load changes reuse it.
+        """
+        first = self.engine.quote(1, 40.7160, -74.0060)
+        self.assertEqual(self.engine.quote(1, 40.7162, -74.0062), first)
+        self.assertEqual((self.engine.hits, self.engine.misses), (1, 1))
+        self.now[0] += 15 * 60
+        self.engine.quote(1, 40.7160, -74.0060)
+        self.assertEqual(self.engine.misses, 2)
+        self.engine.set_restaurant_load(1, 12)
+        busy = self.engine.quote(1, 40.7160, -74.0060)
+        self.assertEqual((self.engine.hits, self.engine.misses), (2, 2))
+        self.assertEqual(busy["delivery_fee"], Money(399))
+        self.assertEqual(busy["eta_minutes"], first["eta_minutes"] + 18)
+        self.engine.set_restaurant_load(1, 0)
+        self.assertEqual(self.engine.quote(1, 40.7160, -74.0060), first)
+        self.assertEqual(self.engine.misses, 2)
+
+    def test_checkout_uses_quote(self):
+        """
+        Test that checkout and confirmation use the quoted fee and ETA instead of the flat defaults.
+        """
+        cart = Cart()
+        cart.add_item("Burger", 10.0, 1)
+        profile = UserProfile("1 Chambers St", latitude=40.7150, longitude=-74.0050)
+        order = OrderPlacement(cart, profile, RestaurantMenu(["Burger"]), delivery_pricing=self.engine,
+                               restaurant_id=1)
+        checkout = order.proceed_to_checkout()
+        quote = self.engine.quote(1, 40.7150, -74.0050)
+        self.assertEqual(checkout["total_info"]["delivery_fee"], Money(299))
+        self.assertEqual(checkout["total_info"]["total"], Money(1000 + 100 + 299))
+        self.assertEqual(checkout["estimated_delivery"], f"{quote['eta_minutes']} minutes")
+
+        # The fee shown at checkout is charged even if the quote would now be higher.
+        self.engine.set_restaurant_load(1, 12)
+        charged = []
+        payment_method = PaymentMethod()
+        payment_method.process_payment = lambda amount: charged.append(amount) or True
+        self.assertTrue(order.confirm_order(payment_method)["success"])
+        self.assertEqual(charged, [Money(1000 + 100 + 299)])
+
+        profile.latitude = 40.7160
+        self.assertEqual(order.validate_order()["message"], "Delivery address changed since checkout; check out again.")
+        profile.latitude = 41.5
+        self.assertEqual(order.validate_order()["message"], "Delivery address is outside the delivery area.")
+        result = OrderPlacement.confirm_orders([order], PaymentMethod())[0]
+        self.assertEqual(result["reason"], "Delivery address is outside the delivery area.")
+
+
+if __name__ == "__main__":
+    unittest.main()
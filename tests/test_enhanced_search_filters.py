@@ -0,0 +1,88 @@
+import unittest
+
+from Enhanced_Search_Filters import Restaurant, RestaurantSearch2
+
+
+class TestRestaurantSearch2(unittest.TestCase):
+    """
+    Unit tests for the planned RestaurantSearch2.search.
+    """
+
+    def setUp(self):
+        """
+        Set up a catalog where cuisine is unselective and delivery speed is highly selective.
+        """
+        self.restaurants = [Restaurant(f"R{i}", "Italian" if i % 2 else "Thai", 3.0 + (i % 20) / 10,
+                                       "express" if i == 7 else "standard") for i in range(40)]
+        self.search = RestaurantSearch2(self.restaurants)
+
+    def test_results_match_sequential_filters(self):
+        """
+        Test that planned searches return the same rows, in the same order, as filtering one predicate at a time.
+        """
+        expected = [r for r in self.restaurants if r.cuisine == "Italian" and r.rating >= 4.0]
+        self.assertEqual(self.search.search(cuisine="Italian", min_rating=4.0), expected)
+        expected = [r for r in self.restaurants if 3.5 <= r.rating <= 3.8 and r.delivery_speed == "standard"]
+        self.assertEqual(self.search.search(min_rating=3.5, max_rating=3.8, delivery_speed="standard"), expected)
+        self.assertEqual(self.search.search(), self.restaurants)
+
+    def test_most_selective_predicate_runs_first(self):
+        """
+        Test that the plan leads with the most selective predicate and reports it.
+        """
+        results = self.search.search(cuisine="Italian", delivery_speed="express", min_rating=3.0)
+        self.assertEqual([r.name for r in results], ["R7"])
+        plan = self.search.last_plan
+        self.assertEqual(plan.access, "index")
+        self.assertEqual(plan.predicates[0].attribute, "delivery_speed")
+        self.assertTrue(self.search.explain(name="R3")[0].startswith("index name == 'R3'"))
+
+    def test_statistics_refresh_and_unknown_attributes(self):
+        """
+        Test that added restaurants are picked up and unknown attributes are rejected.
+        """
+        self.assertEqual(len(self.search.search(delivery_speed="express")), 1)
+        self.restaurants.append(Restaurant("New", "Thai", 4.9, "express"))
+        self.assertEqual(len(self.search.search(delivery_speed="express")), 2)
+        with self.assertRaises(ValueError):
+            self.search.search(parking=True)
+
+    def test_edited_and_replaced_rows_are_not_served_from_stale_statistics(self):
+        """
+        Test that stale statistics never return rows that stopped matching, and that invalidate picks up edits.
+        """
+        self.assertEqual([r.name for r in self.search.search(delivery_speed="express")], ["R7"])
+        self.restaurants[7].delivery_speed = "standard"
+        self.restaurants[3].delivery_speed = "express"
+        self.assertEqual(self.search.search(delivery_speed="express"), [])
+        self.search.invalidate("delivery_speed")
+        self.assertEqual([r.name for r in self.search.search(delivery_speed="express")], ["R3"])
+
+        replacement = Restaurant("R3b", "Thai", 4.0, "standard")
+        self.assertEqual(len(self.search.search(delivery_speed="express")), 1)
+        self.restaurants[3] = replacement
+        self.assertEqual(self.search.search(delivery_speed="express"), [])
+        self.restaurants[5] = Restaurant("R5b", "Thai", 4.0, "express")
+        self.search.invalidate()
+        self.assertEqual([r.name for r in self.search.search(delivery_speed="express")], ["R5b"])
+
+    def test_search_page(self):
+        """
+        Test cursor pagination across sort keys and the lazy iter_search variant.
+        """
+        for sort_by in ("rating", "name", "delivery_speed"):
+            expected = sorted(self.search.search(cuisine="Italian"),
+                              key=lambda r: RestaurantSearch2.SORT_KEYS[sort_by](self.restaurants.index(r), r))
+            collected, cursor = [], None
+            while True:
+                page = self.search.search_page(limit=6, after=cursor, sort_by=sort_by, cuisine="Italian")
+                collected.extend(page["results"])
+                cursor = page["next_cursor"]
+                if cursor is None:
+                    break
+            self.assertEqual(collected, expected)
+        self.assertEqual(list(self.search.iter_search(min_rating=4.8)), self.search.search(min_rating=4.8))
+
+
+if __name__ == '__main__':
+    unittest.main()
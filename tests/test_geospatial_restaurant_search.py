@@ -0,0 +1,77 @@
+import random
+import time
+import unittest
+
+from Geospatial_Restaurant_Search import GeoGridIndex, haversine_km
+
+
+class TestGeoGridIndex(unittest.TestCase):
+    """
+    Unit tests comparing the grid index with brute-force haversine scans.
+    """
+
+    def setUp(self):
+        """
+        Set up a grid holding random points around a city centre.
+        """
+        rng = random.Random(7)
+        self.points = {i: (40.7 + rng.uniform(-0.2, 0.2), -74.0 + rng.uniform(-0.2, 0.2)) for i in range(3000)}
+        self.index = GeoGridIndex(cell_size=0.01)
+        for point_id, (latitude, longitude) in self.points.items():
+            self.index.insert(point_id, latitude, longitude)
+        self.queries = [(40.7 + rng.uniform(-0.3, 0.3), -74.0 + rng.uniform(-0.3, 0.3)) for _ in range(25)]
+
+    def brute_force(self, latitude, longitude):
+        """
+        Return every (distance, id) pair sorted by distance.
+        """
+        return sorted((haversine_km(latitude, longitude, *position), point_id)
+                      for point_id, position in self.points.items())
+
+    def test_nearest_matches_brute_force(self):
+        """
+        Test k-nearest queries, with and without a predicate, against a full scan.
+        """
+        for latitude, longitude in self.queries:
+            expected = self.brute_force(latitude, longitude)
+            self.assertEqual(self.index.nearest(latitude, longitude, 5), expected[:5])
+            even = [pair for pair in expected if pair[1] % 2 == 0]
+            self.assertEqual(self.index.nearest(latitude, longitude, 3, accept=lambda i: i % 2 == 0), even[:3])
+
+    def test_far_away_queries_scan_the_occupied_cells(self):
+        """
+        Test that a query far from every point, e.g. Los Angeles against New York data, is answered quickly.
+        """
+        for latitude, longitude in ((34.05, -118.24), (-33.87, 151.21), (40.3, -74.0)):
+            expected = self.brute_force(latitude, longitude)
+            started = time.perf_counter()
+            self.assertEqual(self.index.nearest(latitude, longitude, 5), expected[:5])
+            self.assertLess(time.perf_counter() - started, 1.0)
+            self.assertEqual(self.index.nearest(latitude, longitude, 2, accept=lambda i: i % 2 == 0),
+                             [pair for pair in expected if pair[1] % 2 == 0][:2])
+        self.assertEqual(self.index.nearest(34.05, -118.24, 5, max_distance_km=1000), [])
+
+    def test_within_radius_matches_brute_force(self):
+        """
+        Test radius queries against a full scan.
+        """
+        for latitude, longitude in self.queries:
+            expected = [pair for pair in self.brute_force(latitude, longitude) if pair[0] <= 2.5]
+            self.assertEqual(sorted(self.index.within_radius(latitude, longitude, 2.5)), expected)
+
+    def test_remove_and_validation(self):
+        """
+        Test that removed points disappear and invalid input is rejected.
+        """
+        nearest_id = self.index.nearest(40.7, -74.0, 1)[0][1]
+        self.index.remove(nearest_id)
+        self.assertNotIn(nearest_id, self.index)
+        self.assertNotEqual(self.index.nearest(40.7, -74.0, 1)[0][1], nearest_id)
+        with self.assertRaises(ValueError):
+            self.index.insert(-1, 91, 0)
+        with self.assertRaises(ValueError):
+            self.index.nearest(40.7, -74.0, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
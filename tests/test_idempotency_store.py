@@ -0,0 +1,155 @@
+import asyncio
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from Idempotency_Store import IdempotencyStore
+
+
+class TestIdempotencyStore(unittest.TestCase):
+    """
+    Unit tests for the IdempotencyStore class.
+    """
+
+    def setUp(self):
+        """
+        Set up a store with a controllable clock.
+        """
+        self.now = [1000.0]
+        self.store = IdempotencyStore(max_entries=2, ttl=60, clock=lambda: self.now[0])
+
+    def test_outcomes_are_reused_until_they_expire_or_are_evicted(self):
+        """
+        Test that repeats get the stored outcome, and that TTL and max_entries bound the store.
+        """
+        calls = []
+        compute = lambda: calls.append(1) or len(calls)
+        self.assertEqual(self.store.run("a", compute), 1)
+        self.assertEqual(self.store.run("a", compute), 1)
+        self.now[0] += 61
+        self.assertEqual(self.store.run("a", compute), 2)
+        self.store.run("b", compute)
+        self.store.run("c", compute)
+        self.assertIsNone(self.store.get("a"))
+        self.assertEqual(self.store.stats(), {"size": 2, "hits": 1, "misses": 4, "coalesced": 0,
+                                              "evictions": 1, "expirations": 1})
+
+    def test_errors_are_not_stored_and_fingerprints_must_match(self):
+        """
+        Test that a failed request can be retried, and that a key cannot be reused for other content.
+        """
+        def fail():
+            raise ConnectionError("gateway down")
+
+        with self.assertRaises(ConnectionError):
+            self.store.run("a", fail, fingerprint="x")
+        self.assertEqual(self.store.run("a", lambda: "ok", fingerprint="x"), "ok")
+        with self.assertRaises(ValueError):
+            self.store.run("a", lambda: "other", fingerprint="y")
+
+    def test_provisional_outcomes_are_run_again(self):
+        """
+        Test that a provisional outcome is stored, and that the next request with the key runs again.
+        """
+        outcomes = ["unknown", "charged"]
+        provisional = lambda outcome: outcome == "unknown"
+        compute = lambda: outcomes.pop(0)
+        self.assertEqual(self.store.run("a", compute, fingerprint="x", provisional=provisional), "unknown")
+        self.assertEqual(self.store.get("a"), "unknown")
+        with self.assertRaises(ValueError):
+            self.store.run("a", compute, fingerprint="y", provisional=provisional)
+        self.assertEqual(self.store.run("a", compute, fingerprint="x", provisional=provisional), "charged")
+        self.assertEqual(self.store.run("a", compute, fingerprint="x", provisional=provisional), "charged")
+        self.assertEqual(self.store.stats()["misses"], 2)
+
+    def test_concurrent_requests_share_one_computation(self):
+        """
+        Test that threads and tasks with the same key wait for the running request instead of repeating it.
+        """
+        calls = []
+
+        def slow():
+            calls.append(1)
+            time.sleep(0.1)
+            return "done"
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(self.store.run("k", slow))) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, ["done"] * 5)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(self.store.coalesced + self.store.hits, 4)
+
+        async def slow_async():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "async"
+
+        async def run():
+            return await asyncio.gather(*[self.store.run_async("j", slow_async) for _ in range(5)])
+
+        self.assertEqual(asyncio.run(run()), ["async"] * 5)
+        self.assertEqual(len(calls), 2)
+
+    def test_sqlite_outcomes_survive_a_restart(self):
+        """
+        Test that a store backed by SQLite finds outcomes stored by an earlier instance.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "idempotency.db")
+            store = IdempotencyStore(ttl=60, path=path, clock=lambda: self.now[0])
+            store.run("a", lambda: {"message": "charged"}, fingerprint="x")
+            store.close()
+
+            store = IdempotencyStore(ttl=60, path=path, clock=lambda: self.now[0])
+            self.assertEqual(store.run("a", lambda: {"message": "again"}, fingerprint="x"), {"message": "charged"})
+            store.close()
+
+            self.now[0] += 61
+            store = IdempotencyStore(ttl=60, path=path, clock=lambda: self.now[0])
+            self.assertEqual(store.run("a", lambda: {"message": "again"}, fingerprint="x"), {"message": "again"})
+            store.close()
+
+    def test_stores_sharing_a_file_wait_for_each_other(self):
+        """
+        Test that stores on one SQLite file, as separate processes have, run a request once between them.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "idempotency.db")
+            first = IdempotencyStore(path=path, poll_interval=0.01)
+            second = IdempotencyStore(path=path, poll_interval=0.01)
+            calls = []
+            started = threading.Event()
+
+            def slow():
+                calls.append(1)
+                started.set()
+                time.sleep(0.2)
+                return "charged"
+
+            results = []
+            thread = threading.Thread(target=lambda: results.append(first.run("k", slow, fingerprint="x")))
+            thread.start()
+            started.wait()
+            results.append(second.run("k", lambda: calls.append(1) or "again", fingerprint="x"))
+            thread.join()
+            self.assertEqual(results, ["charged", "charged"])
+            self.assertEqual(len(calls), 1)
+            with self.assertRaises(ValueError):
+                second.run("k", lambda: "other", fingerprint="y")
+
+            # A claim left behind by a process that died lapses after its claim_ttl.
+            crashed = IdempotencyStore(path=path, claim_ttl=0.1)
+            self.assertEqual(crashed._acquire("j", "x"), (True, None))
+            self.assertEqual(second.run("j", lambda: "retried", fingerprint="x"), "retried")
+            for store in (first, second, crashed):
+                store.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import threading
+import unittest
+
+from Menu_Availability import MenuAvailabilityStore
+from Order_Placement import Cart, OrderPlacement, UserProfile
+
+
+class TestMenuAvailability(unittest.TestCase):
+    """
+    Unit tests for the versioned menu availability store.
+    """
+
+    def setUp(self):
+        """
+        Set up a store with three available items.
+        """
+        self.store = MenuAvailabilityStore(["Burger", "Pizza", "Salad"])
+
+    def test_updates_publish_new_snapshots(self):
+        """
+        Test that bulk updates bump the version while earlier snapshots stay unchanged.
+        """
+        before = self.store.snapshot()
+        self.assertEqual(self.store.update(available=["Soup"], unavailable=["Pizza", "Salad"]), 1)
+        self.assertEqual(self.store.are_items_available(["Burger", "Pizza", "Soup"]), [True, False, True])
+        self.assertEqual(before.version, 0)
+        self.assertTrue(before.is_item_available("Pizza"))
+        self.assertEqual(self.store.replace(["Tacos"]), 2)
+        self.assertEqual(self.store.available_items, frozenset(["Tacos"]))
+        with self.assertRaises(ValueError):
+            self.store.update(available=["Soup"], unavailable=["Soup"])
+
+    def test_validate_order_uses_store(self):
+        """
+        Test that OrderPlacement validates a whole cart against the store's current snapshot.
+        """
+        cart = Cart()
+        cart.add_item("Burger", 8.99, 1)
+        cart.add_item("Pizza", 12.99, 1)
+        order = OrderPlacement(cart, UserProfile("123 Main St"), self.store)
+        self.assertTrue(order.validate_order()["success"])
+        self.store.update(unavailable=["Pizza"])
+        self.assertEqual(order.validate_order()["message"], "Pizza is not available")
+
+    def test_readers_never_see_partial_updates(self):
+        """
+        Test that readers checking a pair of items always see both or neither while a writer flips them together.
+        """
+        pair, mixed, done = ["Burger", "Pizza"], [], threading.Event()
+
+        def read():
+            while not done.is_set():
+                first, second = self.store.are_items_available(pair)
+                if first != second:
+                    mixed.append((first, second))
+
+        readers = [threading.Thread(target=read) for _ in range(3)]
+        for reader in readers:
+            reader.start()
+        for index in range(2000):
+            if index % 2:
+                self.store.update(available=pair)
+            else:
+                self.store.update(unavailable=pair)
+        done.set()
+        for reader in readers:
+            reader.join()
+        self.assertEqual(mixed, [])
+        self.assertEqual(self.store.version, 2000)
+
+
+if __name__ == "__main__":
+    unittest.main()
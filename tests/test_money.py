@@ -0,0 +1,75 @@
+import unittest
+from decimal import ROUND_DOWN, ROUND_HALF_EVEN, Decimal
+
+from Advanced_Payment_Options import PaymentProcessor2
+from Money import Money
+
+
+class TestMoney(unittest.TestCase):
+    """
+    Unit tests for the Money fixed-point type and the payment code that uses it.
+    """
+
+    def test_from_amount_rounds_to_cents(self):
+        """
+        Test conversion from floats, strings, integers and Decimals, including half-cent rounding.
+        """
+        self.assertEqual(Money.from_amount(12.99).cents, 1299)
+        self.assertEqual(Money.from_amount("1.005").cents, 101)
+        self.assertEqual(Money.from_amount(1.005).cents, 101)
+        self.assertEqual(Money.from_amount("-1.005").cents, -101)
+        self.assertEqual(Money.from_amount(Decimal("2.345"), rounding=ROUND_HALF_EVEN).cents, 234)
+        self.assertEqual(Money.from_amount(7).cents, 700)
+        with self.assertRaises(ValueError):
+            Money.from_amount(float("nan"))
+        with self.assertRaises(TypeError):
+            Money.from_amount(True)
+        with self.assertRaises(TypeError):
+            Money(12.99)
+
+    def test_arithmetic_is_exact(self):
+        """
+        Test that sums that drift in floating point come out exact, and that Money compares with numbers.
+        """
+        self.assertNotEqual(sum([0.1] * 10), 1.0)
+        self.assertEqual(sum([Money.from_amount(0.1)] * 10), Money(100))
+        self.assertEqual(Money(1299) * 3 - Money(97), 38.0)
+        self.assertEqual(Money(1299), Decimal("12.99"))
+        self.assertNotEqual(Money(1299), 12.99)  # The float is only close to 12.99, so it is not equal.
+        self.assertEqual(float(Money(1299)), 12.99)
+        self.assertEqual(len({Money(500), 5, 5.0, Decimal("5.00")}), 1)
+        self.assertTrue(Money(1) > 0 and Money(-1) < 0.0)
+        self.assertEqual(hash(Money(500)), hash(5))
+        self.assertEqual(str(Money(-5)), "-0.05")
+        self.assertEqual(f"{Money(1299):>8}", "   12.99")
+        with self.assertRaises(TypeError):
+            Money(100) + 1.5
+
+    def test_scale_and_split(self):
+        """
+        Test explicit rounding when applying rates and penny-exact bill splitting.
+        """
+        self.assertEqual(Money(1299).scale(0.10).cents, 130)
+        self.assertEqual(Money(125).scale(Decimal("0.1"), ROUND_HALF_EVEN).cents, 12)
+        self.assertEqual(Money(135).scale(Decimal("0.1"), ROUND_HALF_EVEN).cents, 14)
+        self.assertEqual(Money(-125).scale(Decimal("0.1")).cents, -13)
+        self.assertEqual(Money(199).scale(Decimal("0.1"), ROUND_DOWN).cents, 19)
+        shares = Money(1000).split(3)
+        self.assertEqual([share.cents for share in shares], [334, 333, 333])
+        self.assertEqual(sum(shares), Money(1000))
+        with self.assertRaises(ValueError):
+            Money(1000).split(0)
+
+    def test_payment_processor_uses_money(self):
+        """
+        Test that split and gift card payments are exact to the cent.
+        """
+        processor = PaymentProcessor2()
+        self.assertEqual(processor.split_payment(100.0, 3), [Money(3334), Money(3333), Money(3333)])
+        self.assertEqual(processor.gift_card_payment(0.3, 0.5), Money(20))
+        with self.assertRaises(ValueError):
+            processor.gift_card_payment(10.01, 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
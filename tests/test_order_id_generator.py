@@ -0,0 +1,76 @@
+import multiprocessing
+import threading
+import unittest
+
+from Order_ID_Generator import EPOCH_MS, OrderIdGenerator, parse_order_id
+
+
+def _ids_in_child(queue):
+    """
+    Generate a few IDs from the inherited default generator in a child process.
+    """
+    from Order_ID_Generator import default_generator
+    queue.put(default_generator.next_ids(100))
+
+
+class TestOrderIdGenerator(unittest.TestCase):
+    """
+    Unit tests for the time-sortable order ID generator.
+    """
+
+    def test_ids_sort_by_time_and_round_trip(self):
+        """
+        Test that IDs sort by timestamp then sequence, and parse back into their parts.
+        """
+        now = [(EPOCH_MS + 5) * 1_000_000]
+        generator = OrderIdGenerator(node_id=42, clock=lambda: now[0])
+        first = generator.next_ids(3)
+        now[0] += 1_000_000
+        second = generator.next_id()
+        self.assertEqual(sorted(first + [second]), first + [second])
+        self.assertEqual(parse_order_id(first[1]), {"timestamp_ms": EPOCH_MS + 5, "node_id": 42, "sequence": 1})
+        self.assertEqual(parse_order_id(second)["timestamp_ms"], EPOCH_MS + 6)
+        with self.assertRaises(ValueError):
+            parse_order_id("ORD123456")
+        with self.assertRaises(ValueError):
+            OrderIdGenerator(node_id=1 << 24)
+
+    def test_unique_across_threads(self):
+        """
+        Test that threads sharing one generator never receive the same ID.
+        """
+        generator, batches = OrderIdGenerator(), []
+
+        def work():
+            batches.append([generator.next_id() for _ in range(5000)] + generator.next_ids(5000))
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        ids = [order_id for batch in batches for order_id in batch]
+        self.assertEqual(len(set(ids)), 40000)
+
+    @unittest.skipUnless("fork" in multiprocessing.get_all_start_methods(), "needs fork")
+    def test_forked_children_pick_new_nodes(self):
+        """
+        Test that forked workers do not inherit the parent's node id.
+        """
+        from Order_ID_Generator import default_generator
+        context = multiprocessing.get_context("fork")
+        queue = context.Queue()
+        children = [context.Process(target=_ids_in_child, args=(queue,)) for _ in range(3)]
+        for child in children:
+            child.start()
+        batches = [queue.get(timeout=30) for _ in children]
+        for child in children:
+            child.join()
+        nodes = {parse_order_id(batch[0])["node_id"] for batch in batches}
+        nodes.add(default_generator.node_id)
+        self.assertEqual(len(nodes), 4)
+        self.assertEqual(len({order_id for batch in batches for order_id in batch}), 300)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,13 @@
+import asyncio
+import random
+import time
 import unittest
 from unittest import mock
 
-from Order_Placement import (Cart, CartItem, OrderPlacement, PaymentFailedException,
-                             PaymentMethod, RestaurantMenu, UserProfile)
+from Money import Money
+from Order_ID_Generator import parse_order_id
+from Order_Placement import (PAYMENT_OUTCOME_UNKNOWN, Cart, CartItem, CompactCart, FakePaymentGateway,
+                             OrderPlacement, PaymentFailedException, PaymentMethod, RestaurantMenu, UserProfile)
 
 
 class TestOrderPlacement(unittest.TestCase):
@@ -52,15 +57,14 @@ class TestOrderPlacement(unittest.TestCase):
         self.cart.add_item("Pizza", 12.99, 1)
         result = self.order.proceed_to_checkout()
         expected_result = {
-            "items": [{"name": "Pizza", "quantity": 1, "subtotal": 12.99}],
-            "total_info": {"subtotal": 12.99, "tax": 1.3, "delivery_fee": 5.0, "total": 19.29},
+            "items": [{"name": "Pizza", "quantity": 1, "subtotal": Money(1299)}],
+            "total_info": {"subtotal": Money(1299), "tax": Money(130), "delivery_fee": Money(500),
+                           "total": Money(1929)},
             "delivery_address": "123 Main St"
         }
         self.assertEqual(result["items"], expected_result["items"])
         self.assertEqual(result["delivery_address"], expected_result["delivery_address"])
-        self.assertAlmostEqual(result["total_info"]["subtotal"], expected_result["total_info"]["subtotal"], places=2)
-        self.assertAlmostEqual(result["total_info"]["tax"], expected_result["total_info"]["tax"], places=2)
-        self.assertAlmostEqual(result["total_info"]["total"], expected_result["total_info"]["total"], places=2)
+        self.assertEqual(result["total_info"], expected_result["total_info"])
 
     def test_confirm_order_success(self):
         """
@@ -71,7 +75,8 @@ class TestOrderPlacement(unittest.TestCase):
         result = self.order.confirm_order(payment_method)
         self.assertTrue(result["success"])
         self.assertEqual(result["message"], "Order confirmed")
-        self.assertEqual(result["order_id"], "ORD123456")
+        self.assertEqual(parse_order_id(result["order_id"])["node_id"], self.order.order_ids.node_id)
+        self.assertNotEqual(self.order.confirm_order(payment_method)["order_id"], result["order_id"])
 
     def test_confirm_order_failed_payment(self):
         """
@@ -97,6 +102,183 @@ class TestOrderPlacement(unittest.TestCase):
         result = self.cart.remove_item("Pizza")
         self.assertEqual(result, "Pizza not found in cart")
 
+    def test_cart_keeps_insertion_order(self):
+        """
+        Test that updating or re-adding an item keeps its place and removing one keeps the others in order.
+        """
+        for name in ("Burger", "Pizza", "Salad"):
+            self.cart.add_item(name, 5.0, 1)
+        self.assertEqual(self.cart.add_item("Burger", 5.0, 2), "Updated Burger quantity to 3")
+        self.cart.update_item_quantity("Pizza", 4)
+        self.assertEqual([item["name"] for item in self.cart.view_cart()], ["Burger", "Pizza", "Salad"])
+        self.cart.remove_item("Pizza")
+        self.cart.add_item("Pizza", 5.0, 1)
+        self.assertEqual([item.name for item in self.cart.items], ["Burger", "Salad", "Pizza"])
+        self.assertEqual(self.cart.update_item_quantity("Soup", 1), "Soup not found in cart")
+
+    def test_running_totals_are_exact(self):
+        """
+        Test that the running subtotal tracks every mutation in exact cents and matches a full recompute.
+        """
+        cart = Cart(self_check=True)
+        for _ in range(10):
+            cart.add_item("Soda", 0.1, 1)
+        cart.add_item("Fries", 0.2, 3)
+        self.assertEqual(cart.calculate_total(), {"subtotal": Money(160), "tax": Money(16), "delivery_fee": Money(500),
+                                                 "total": Money(676)})
+        cart.update_item_quantity("Soda", 2)
+        self.assertEqual(cart.calculate_total()["subtotal"], Money(80))
+        cart.remove_item("Fries")
+        self.assertEqual(cart.calculate_total(), {"subtotal": Money(20), "tax": Money(2), "delivery_fee": Money(500),
+                                                 "total": Money(522)})
+
+    def test_calculate_total_is_cached(self):
+        """
+        Test that the breakdown is cached between mutations and cannot be corrupted through the returned dict.
+        """
+        self.cart.add_item("Burger", 8.99, 2)
+        with mock.patch.object(CartItem, "get_subtotal", side_effect=AssertionError):
+            first = self.cart.calculate_total()
+            first["total"] = 0
+            self.assertEqual(self.cart.calculate_total()["total"], Money(2478))
+
+    def test_self_check_detects_drift(self):
+        """
+        Test that self-check mode reports a quantity changed behind the cart's back.
+        """
+        cart = Cart(self_check=True)
+        cart.add_item("Burger", 8.99, 1)
+        cart.items[0].update_quantity(5)
+        with self.assertRaises(RuntimeError):
+            cart.calculate_total()
+
+    def test_cart_item_has_no_instance_dict(self):
+        """
+        Test that CartItem is slotted and still validates its arguments.
+        """
+        item = CartItem("Burger", 8.99, 2)
+        self.assertFalse(hasattr(item, "__dict__"))
+        self.assertEqual(item.get_subtotal(), Money(1798))
+        with self.assertRaises(ValueError):
+            CartItem("Burger", 0, 1)
+
+    def test_compact_cart_matches_cart(self):
+        """
+        Test that CompactCart gives the same messages, views and totals as Cart over random mutations,
+        including enough removals to trigger compaction.
+        """
+        rng = random.Random(7)
+        cart, compact = Cart(self_check=True), CompactCart(self_check=True)
+        names = [f"Dish {index}" for index in range(300)]
+        for _ in range(3000):
+            name, action = rng.choice(names), rng.random()
+            if action < 0.5:
+                price, quantity = rng.choice((0.99, 4.5, 12.99)), rng.randint(0, 3)
+                self.assertEqual(compact.add_item(name, price, quantity), cart.add_item(name, price, quantity))
+            elif action < 0.8:
+                self.assertEqual(compact.remove_item(name), cart.remove_item(name))
+            else:
+                quantity = rng.randint(0, 5)
+                self.assertEqual(compact.update_item_quantity(name, quantity), cart.update_item_quantity(name, quantity))
+            self.assertEqual(compact.calculate_total(), cart.calculate_total())
+        self.assertEqual(compact.view_cart(), cart.view_cart())
+        self.assertEqual([(item.name, item.quantity) for item in compact.items],
+                         [(item.name, item.quantity) for item in cart.items])
+        self.assertLessEqual(len(compact._names), 2 * max(64, len(compact._slots)) + 1)
+
+    def test_confirm_orders_batch(self):
+        """
+        Test that a batch returns per-order results for confirmed, invalid and declined orders,
+        checks each menu once and submits payments in batches.
+        """
+        menu = RestaurantMenu(available_items=["Burger", "Pizza"])
+        orders = []
+        for names in (["Burger"], ["Pizza", "Burger"], [], ["Pasta"], ["Pizza"], ["Burger", "Pizza"]):
+            cart = Cart()
+            for name in names:
+                cart.add_item(name, 10.0 if name != "Pizza" else 13.0, 1)
+            orders.append(OrderPlacement(cart, self.user_profile, menu))
+        payment_method = PaymentMethod()
+        with mock.patch.object(menu, "are_items_available", wraps=menu.are_items_available) as lookups, \
+                mock.patch.object(payment_method, "process_payment", side_effect=lambda amount: amount < 20):
+            with mock.patch.object(payment_method, "process_payments",
+                                   wraps=payment_method.process_payments) as batches:
+                results = OrderPlacement.confirm_orders(orders, payment_method, batch_size=2)
+        self.assertEqual(lookups.call_count, 1)
+        self.assertEqual(sorted(lookups.call_args.args[0]), ["Burger", "Pasta", "Pizza"])
+        self.assertEqual([len(call.args[0]) for call in batches.call_args_list], [2, 2])
+        self.assertEqual(results[0]["message"], "Order confirmed")
+        self.assertEqual(results[1]["message"], "Payment failed")
+        self.assertIsInstance(results[1]["error"], PaymentFailedException)
+        self.assertEqual(results[2]["reason"], "Cart is empty")
+        self.assertEqual(results[3], {"success": False, "message": "Order validation failed",
+                                      "reason": "Pasta is not available"})
+        self.assertTrue(results[4]["success"])
+        self.assertFalse(results[5]["success"])
+
+    def test_confirm_orders_isolates_gateway_errors(self):
+        """
+        Test that a gateway exception fails only its own order when charging one order at a time.
+        """
+        class SingleChargeGateway:
+            def process_payment(self, amount):
+                if amount > 20:
+                    raise ConnectionError("gateway timeout")
+                return True
+
+        orders = []
+        for price in (10.0, 30.0, 12.0):
+            cart = Cart()
+            cart.add_item("Burger", price, 1)
+            orders.append(OrderPlacement(cart, self.user_profile, self.restaurant_menu))
+        results = OrderPlacement.confirm_orders(orders, SingleChargeGateway())
+        self.assertEqual([result["success"] for result in results], [True, False, True])
+        self.assertIsInstance(results[1]["error"], ConnectionError)
+        with self.assertRaises(ValueError):
+            OrderPlacement.confirm_orders(orders, SingleChargeGateway(), batch_size=0)
+
+    def test_confirm_order_async(self):
+        """
+        Test async confirmation with an async gateway, a plain PaymentMethod and a timeout.
+        """
+        self.cart.add_item("Pizza", 12.99, 1)
+        result = asyncio.run(self.order.confirm_order_async(FakePaymentGateway(latency=0.001)))
+        self.assertEqual(result["message"], "Order confirmed")
+        self.assertTrue(asyncio.run(self.order.confirm_order_async(PaymentMethod()))["success"])
+        with self.assertRaises(PaymentFailedException):
+            asyncio.run(self.order.confirm_order_async(FakePaymentGateway(latency=0.001, decline_over=10)))
+        with self.assertRaises(PaymentFailedException):
+            asyncio.run(self.order.confirm_order_async(FakePaymentGateway(latency=1), timeout=0.01))
+
+        # A blocking payment cannot be stopped when it times out, so it is not reported as failed.
+        charged = []
+        slow = PaymentMethod()
+        slow.process_payment = lambda amount: time.sleep(0.2) or charged.append(amount) or True
+        result = asyncio.run(self.order.confirm_order_async(slow, timeout=0.01))
+        self.assertEqual(result["message"], PAYMENT_OUTCOME_UNKNOWN)
+        self.assertFalse(result["success"])
+        self.assertEqual(charged, [Money(1929)])
+
+    def test_confirm_orders_async_limits_concurrency(self):
+        """
+        Test that concurrent confirmation caps payments in flight and reports every order.
+        """
+        orders = []
+        for price in [10.0] * 30 + [50.0] * 5:
+            cart = Cart()
+            cart.add_item("Burger", price, 1)
+            orders.append(OrderPlacement(cart, self.user_profile, self.restaurant_menu))
+        orders.append(OrderPlacement(Cart(), self.user_profile, self.restaurant_menu))
+        gateway = FakePaymentGateway(latency=0.01, jitter=0.005, decline_over=40, seed=1)
+        results = asyncio.run(OrderPlacement.confirm_orders_async(orders, gateway, concurrency=8))
+        self.assertEqual(gateway.max_in_flight, 8)
+        self.assertEqual(gateway.calls, 35)
+        self.assertEqual(sum(result["success"] for result in results), 30)
+        self.assertIsInstance(results[34]["error"], PaymentFailedException)
+        self.assertEqual(results[35]["message"], "Order validation failed")
+        with self.assertRaises(ValueError):
+            asyncio.run(OrderPlacement.confirm_orders_async(orders, gateway, concurrency=0))
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,141 @@
+import asyncio
+import time
+import unittest
+
+from Money import Money
+from Payment_Gateway_Client import LocalGatewayServer, PaymentGatewayClient, PooledGatewayClient
+from Payment_Processing import PAYMENT_OUTCOME_UNKNOWN, PaymentProcessing
+
+VALID_CARD = {"card_number": "4532015112830366", "expiry_date": "12/25", "cvv": "123"}
+DECLINED_CARD = {"card_number": "1111222233334444", "expiry_date": "12/25", "cvv": "123"}
+
+
+class TestPooledGatewayClient(unittest.TestCase):
+    """
+    Unit tests for the pooled gateway client against the local stand-in gateway.
+    """
+
+    def test_requests_are_pipelined_over_a_bounded_pool(self):
+        """
+        Test that many concurrent charges share at most pool_size connections.
+        """
+        async def run():
+            server = LocalGatewayServer(latency=0.02, jitter=0.02, seed=1)
+            host, port = await server.start_async()
+            client = PooledGatewayClient(host, port, pool_size=2)
+            try:
+                responses = await asyncio.gather(
+                    *[client.charge_async("credit_card", VALID_CARD, Money(100 + i)) for i in range(50)],
+                    client.charge_async("credit_card", DECLINED_CARD, Money(100)))
+                message = await PaymentProcessing(gateway_client=client).process_payment_async(
+                    {"total_amount": 19.99}, "credit_card", VALID_CARD)
+            finally:
+                await client.close_async()
+                await server.close_async()
+            return server, responses, message
+
+        server, responses, message = asyncio.run(run())
+        self.assertEqual(message, "Payment successful, Order confirmed")
+        self.assertTrue(all(response["status"] == "success" for response in responses[:-1]))
+        self.assertEqual(len({response["transaction_id"] for response in responses[:-1]}), 50)
+        self.assertEqual(responses[-1], {"status": "failure", "message": "Card declined"})
+        self.assertLessEqual(server.connections, 2)
+        self.assertGreater(server.max_in_flight, 2)
+
+    def test_timeout_leaves_the_connection_usable(self):
+        """
+        Test that a slow response times out, and the late answer does not confuse later requests.
+        """
+        async def run():
+            server = LocalGatewayServer(latency=0.2)
+            host, port = await server.start_async()
+            client = PooledGatewayClient(host, port, pool_size=1, timeout=0.05)
+            try:
+                with self.assertRaises(TimeoutError):
+                    await client.charge_async("credit_card", VALID_CARD, Money(100))
+                server.latency = 0.0
+                await asyncio.sleep(0.25)
+                response = await client.charge_async("credit_card", DECLINED_CARD, Money(100))
+            finally:
+                await client.close_async()
+                await server.close_async()
+            return server, response
+
+        server, response = asyncio.run(run())
+        self.assertEqual(response["message"], "Card declined")
+        self.assertEqual(server.connections, 1)
+
+    def test_process_payment_through_the_client(self):
+        """
+        Test that process_payment keeps its messages when charging through a gateway client.
+        """
+        server = LocalGatewayServer(latency=0.001)
+        host, port = server.start()
+        client = PooledGatewayClient(host, port)
+        try:
+            processing = PaymentProcessing(gateway_client=client)
+            order = {"total_amount": 19.99}
+            self.assertEqual(processing.process_payment(order, "credit_card", VALID_CARD),
+                             "Payment successful, Order confirmed")
+            self.assertEqual(processing.process_payment(order, "credit_card", DECLINED_CARD),
+                             "Payment failed, please try again")
+            server.error_rate = 1.0
+            self.assertEqual(processing.process_payment(order, "credit_card", VALID_CARD),
+                             "Payment failed, please try again")
+        finally:
+            client.close()
+            server.close()
+        self.assertEqual(server.requests, 3)
+
+        # Nothing is listening any more, so the charge fails with a connection error.
+        client = PooledGatewayClient(host, port)
+        try:
+            message = PaymentProcessing(gateway_client=client).process_payment(order, "credit_card", VALID_CARD)
+        finally:
+            client.close()
+        self.assertTrue(message.startswith("Error: "))
+
+    def test_retry_after_a_timeout_charges_once(self):
+        """
+        Test that a payment whose response timed out is not charged again when retried with its key.
+        """
+        server = LocalGatewayServer(latency=0.3)
+        host, port = server.start()
+        client = PooledGatewayClient(host, port, timeout=0.1)
+        try:
+            processing = PaymentProcessing(gateway_client=client)
+            order = {"total_amount": 19.99}
+            pay = lambda: processing.process_payment(order, "credit_card", VALID_CARD, idempotency_key="order-1")
+            self.assertEqual(pay(), PAYMENT_OUTCOME_UNKNOWN)
+            self.assertEqual(processing.idempotency_store.get("order-1"), PAYMENT_OUTCOME_UNKNOWN)
+            # The resend reaches the gateway while the first charge is still in progress.
+            self.assertEqual(pay(), PAYMENT_OUTCOME_UNKNOWN)
+            server.latency = 0.0
+            time.sleep(0.4)
+            self.assertEqual(pay(), "Payment successful, Order confirmed")
+            self.assertEqual(pay(), "Payment successful, Order confirmed")
+        finally:
+            client.close()
+            server.close()
+        self.assertEqual(server.charges, 1)
+        self.assertEqual(server.requests, 3)
+
+    def test_clients_must_implement_charge(self):
+        """
+        Test that a client without charge cannot be built, and that charge_async defaults to charge.
+        """
+        class Incomplete(PaymentGatewayClient):
+            pass
+
+        class Approving(PaymentGatewayClient):
+            def charge(self, method, details, amount, timeout=None, idempotency_key=None):
+                return {"status": "success", "key": idempotency_key}
+
+        with self.assertRaises(TypeError):
+            Incomplete()
+        response = asyncio.run(Approving().charge_async("credit_card", VALID_CARD, Money(100), idempotency_key="k"))
+        self.assertEqual(response, {"status": "success", "key": "k"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+import asyncio
+import unittest
+
+from Circuit_Breaker import CircuitBreaker
+from Money import Money
+from Payment_Gateway_Client import GatewayUnavailableError, LocalGatewayServer, PooledGatewayClient
+from Payment_Gateway_Router import GatewayRouter
+from Payment_Processing import PaymentProcessing
+
+VALID_CARD = {"card_number": "4532015112830366", "expiry_date": "12/25", "cvv": "123"}
+
+
+class TestGatewayRouter(unittest.TestCase):
+    """
+    Unit tests for routing payments across local stand-in gateways.
+    """
+
+    def setUp(self):
+        """
+        Start a fast and a slow card gateway and a PayPal gateway.
+        """
+        self.servers = {"fast": LocalGatewayServer(latency=0.002), "slow": LocalGatewayServer(latency=0.05),
+                        "paypal": LocalGatewayServer(latency=0.002)}
+        self.addresses = {name: server.start() for name, server in self.servers.items()}
+        self.clients = []
+
+    def tearDown(self):
+        """
+        Close the clients and stop the gateways.
+        """
+        for client in self.clients:
+            client.close()
+        for server in self.servers.values():
+            server.close()
+
+    def client(self, address):
+        """
+        Create a client for a gateway, closed after the test.
+        """
+        client = PooledGatewayClient(*address, timeout=1.0)
+        self.clients.append(client)
+        return client
+
+    def router(self, policy="ewma"):
+        """
+        Build a router over all three gateways.
+        """
+        router = GatewayRouter(policy=policy)
+        router.add_backend("slow", self.client(self.addresses["slow"]))
+        router.add_backend("fast", self.client(self.addresses["fast"]))
+        router.add_backend("paypal", self.client(self.addresses["paypal"]), payment_methods=["paypal"])
+        return router
+
+    def test_routes_by_method_and_prefers_the_faster_gateway(self):
+        """
+        Test that payments go to a backend for their method, mostly the faster one once latencies are known.
+        """
+        processing = PaymentProcessing(gateway_client=self.router())
+        self.assertEqual(processing.available_gateways, ["credit_card", "paypal"])
+        for _ in range(20):
+            self.assertEqual(processing.process_payment({"total_amount": 10}, "credit_card", VALID_CARD),
+                             "Payment successful, Order confirmed")
+        self.assertEqual(processing.process_payment({"total_amount": 10}, "paypal", {"email": "a@example.com"}),
+                         "Payment successful, Order confirmed")
+        with self.assertRaises(ValueError):
+            processing.process_payment({"total_amount": 10}, "bitcoin", {})
+        self.assertEqual(self.servers["paypal"].requests, 1)
+        self.assertGreaterEqual(self.servers["fast"].requests, 18)
+
+    def test_least_outstanding_spreads_concurrent_payments(self):
+        """
+        Test that concurrent payments are spread over the card backends by outstanding requests.
+        """
+        router = self.router(policy="least_outstanding")
+
+        async def run():
+            return await asyncio.gather(*[router.charge_async("credit_card", VALID_CARD, Money(100))
+                                          for _ in range(40)])
+
+        responses = asyncio.run(run())
+        self.assertEqual({response["gateway"] for response in responses}, {"fast", "slow"})
+        stats = router.stats()
+        self.assertEqual(stats["fast"]["requests"] + stats["slow"]["requests"], 40)
+        self.assertEqual(stats["fast"]["outstanding"], 0)
+
+    def test_concurrent_payments_at_start_up_spread_out(self):
+        """
+        Test that the ewma policy spreads concurrent payments over backends that have no latency yet.
+        """
+        router = self.router()
+
+        async def run():
+            return await asyncio.gather(*[router.charge_async("credit_card", VALID_CARD, Money(100))
+                                          for _ in range(2)])
+
+        self.assertEqual({response["gateway"] for response in asyncio.run(run())}, {"fast", "slow"})
+
+    def test_skips_a_backend_whose_breaker_is_open(self):
+        """
+        Test that an unreachable backend is failed over, opens its breaker and is then routed around.
+        """
+        dead = LocalGatewayServer()
+        dead_address = dead.start()
+        dead.close()
+        router = GatewayRouter(policy="round_robin")
+        router.add_backend("dead", self.client(dead_address),
+                           circuit_breaker=CircuitBreaker(min_calls=1, open_seconds=60))
+        router.add_backend("fast", self.client(self.addresses["fast"]))
+        self.assertEqual(router.charge("credit_card", VALID_CARD, Money(100))["gateway"], "fast")
+        self.assertEqual(router.stats()["dead"]["failures"], 1)
+        gateways = {router.charge("credit_card", VALID_CARD, Money(100))["gateway"] for _ in range(4)}
+        self.assertEqual(gateways, {"fast"})
+        self.assertEqual(router.stats()["dead"]["state"], "open")
+
+        for charge in (lambda router: router.charge("credit_card", VALID_CARD, Money(100)),
+                       lambda router: asyncio.run(router.charge_async("credit_card", VALID_CARD, Money(100)))):
+            alone = GatewayRouter()
+            alone.add_backend("dead", self.client(dead_address))
+            with self.assertRaises(GatewayUnavailableError):
+                charge(alone)
+
+
+if __name__ == "__main__":
+    unittest.main()
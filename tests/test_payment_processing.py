@@ -1,6 +1,10 @@
+import asyncio
+import random
 import unittest
 from unittest import mock
 
+from Money import Money
+import Payment_Processing
 from Payment_Processing import PaymentProcessing
 
 
@@ -83,6 +87,69 @@ class TestPaymentProcessing(unittest.TestCase):
         with self.assertRaises(ValueError):
             self.payment_processing.process_payment(order, "bitcoin", payment_details)
 
+    def test_process_payment_charges_exact_cents(self):
+        """
+        Test that the gateway is charged a Money amount rounded to the cent.
+        """
+        order = {"total_amount": 19.285}
+        payment_details = {"card_number": "4532015112830366", "expiry_date": "12/25", "cvv": "123"}
+        with mock.patch.object(self.payment_processing, 'mock_payment_gateway',
+                               return_value={"status": "success"}) as gateway:
+            self.payment_processing.process_payment(order, "credit_card", payment_details)
+        self.assertEqual(gateway.call_args[0][2], Money(1929))
+
+    def test_validate_credit_cards_matches_single_validation(self):
+        """
+        Test that the batch validator agrees with validate_credit_card, with and without NumPy.
+        """
+        rng = random.Random(7)
+        details_list = [{"card_number": "".join(rng.choice("0123456789") for _ in range(16)),
+                         "expiry_date": "12/25", "cvv": "123"} for _ in range(500)]
+        details_list += [
+            {"card_number": "4532015112830366", "expiry_date": "12/25", "cvv": "123"},
+            {"card_number": "4532015112830366", "expiry_date": "", "cvv": "123"},
+            {"card_number": "4532015112830366", "expiry_date": "12/25", "cvv": "12"},
+            {"card_number": "453201511283036", "expiry_date": "12/25", "cvv": "123"},
+            {"card_number": "0000000000000000", "expiry_date": "12/25", "cvv": "123"},
+            {"expiry_date": "12/25", "cvv": "123"},
+        ]
+        expected = [self.payment_processing.validate_credit_card(details) for details in details_list]
+        self.assertIn(True, expected)
+        self.assertEqual(list(self.payment_processing.validate_credit_cards(details_list)), expected)
+        with mock.patch.object(Payment_Processing, "np", None):
+            self.assertEqual(self.payment_processing.validate_credit_cards(details_list), expected)
+
+        # Non-digit card numbers are invalid instead of raising.
+        odd = [{"card_number": number, "expiry_date": "12/25", "cvv": "123"}
+               for number in ("45320151128303a6", "4532 01511283036", "453201511283036\u0666")]
+        self.assertEqual(list(self.payment_processing.validate_credit_cards(odd)), [False] * 3)
+        with mock.patch.object(Payment_Processing, "np", None):
+            self.assertEqual(self.payment_processing.validate_credit_cards(odd), [False] * 3)
+        self.assertEqual(len(self.payment_processing.validate_credit_cards([])), 0)
+
+    def test_process_payment_with_idempotency_key_charges_once(self):
+        """
+        Test that retries with the same idempotency key get the first outcome without charging again.
+        """
+        order = {"total_amount": 100.00}
+        payment_details = {"card_number": "4532015112830366", "expiry_date": "12/25", "cvv": "123"}
+        with mock.patch.object(self.payment_processing, 'mock_payment_gateway',
+                               return_value={"status": "success"}) as gateway:
+            for _ in range(3):
+                result = self.payment_processing.process_payment(order, "credit_card", payment_details,
+                                                                 idempotency_key="checkout-1")
+                self.assertEqual(result, "Payment successful, Order confirmed")
+            result = asyncio.run(self.payment_processing.process_payment_async(
+                order, "credit_card", payment_details, idempotency_key="checkout-1"))
+            self.assertEqual(result, "Payment successful, Order confirmed")
+            self.assertEqual(gateway.call_count, 1)
+
+            # The same key for a different amount is refused rather than answered with the old outcome.
+            result = self.payment_processing.process_payment({"total_amount": 5.00}, "credit_card", payment_details,
+                                                             idempotency_key="checkout-1")
+            self.assertTrue(result.startswith("Error: "))
+            self.assertEqual(gateway.call_count, 1)
+
 
 if __name__ == "__main__":
     unittest.main()  # Run the unit tests.
\ No newline at end of file
@@ -1,6 +1,8 @@
+import base64
+import json
 import unittest
 
-from Restaurant_Browsing import RestaurantBrowsing, RestaurantDatabase
+from Restaurant_Browsing import RestaurantBrowsing, RestaurantDatabase, RestaurantSearch, SearchResultCache
 
 
 class TestRestaurantBrowsing(unittest.TestCase):
@@ -95,6 +97,246 @@ class TestRestaurantBrowsing(unittest.TestCase):
         with self.assertRaises(ValueError):
             self.browsing.search_by_filters(cuisine_type="Italian", location="Downtown", min_rating=-1)
 
+    def test_indexes_follow_mutations(self):
+        """
+        Test that the cuisine and location indexes stay in sync with inserts, updates and deletes.
+        """
+        restaurant_id = self.database.add_restaurant({"name": "Curry Corner", "cuisine": "Indian",
+                                                      "location": "Midtown", "rating": 4.4,
+                                                      "price_range": "$", "delivery": True})
+        self.assertEqual([r['name'] for r in self.browsing.search_by_cuisine("INDIAN")], ["Curry Corner"])
+
+        self.database.update_restaurant(restaurant_id, cuisine="Italian", location="Downtown")
+        self.assertEqual(self.browsing.search_by_cuisine("Indian"), [])
+        self.assertNotIn("indian", self.database.cuisine_index)
+        results = self.browsing.search_by_filters(cuisine_type="italian", location="downtown")
+        self.assertEqual([r['name'] for r in results], ["Italian Bistro", "Curry Corner"])
+
+        self.database.remove_restaurant(restaurant_id)
+        self.assertEqual(len(self.browsing.search_by_location("Downtown")), 2)
+        with self.assertRaises(KeyError):
+            self.database.get_restaurant(restaurant_id)
+
+    def test_invalid_rows_are_rejected_before_indexing(self):
+        """
+        Test that an insert or update with a missing or mistyped indexed field changes nothing.
+        """
+        before = (self.database.get_restaurants(), self.database.facets(), self.database.version)
+        with self.assertRaises(ValueError):
+            self.database.add_restaurant({"name": "X", "cuisine": "Thai", "location": "Downtown"})
+        with self.assertRaises(ValueError):
+            self.database.update_restaurant(0, cuisine=None)
+        with self.assertRaises(ValueError):
+            self.database.update_restaurant(0, latitude=91.0, longitude=0.0)
+        self.assertEqual((self.database.get_restaurants(), self.database.facets(), self.database.version), before)
+        self.assertEqual(self.browsing.search_by_name("X"), [])
+        self.assertEqual(self.database.find(cuisine="Italian")[0]['id'], 0)
+        self.assertEqual(self.database.remove_restaurant(0)['id'], 0)
+
+    def test_search_by_rating_range(self):
+        """
+        Test inclusive rating range queries and that rating updates move a restaurant in the index.
+        """
+        results = self.browsing.search_by_rating_range(4.0, 4.5)
+        self.assertEqual([r['name'] for r in results], ["Italian Bistro", "Burger King", "Taco Town"])
+        self.assertEqual(self.database.count_by_rating(4.0, 4.5), 3)
+
+        sushi = self.browsing.search_by_cuisine("Japanese")[0]
+        self.database.update_restaurant(sushi['id'], rating=4.1)
+        self.assertEqual(len(self.browsing.search_by_rating_range(4.0, 4.5)), 4)
+        self.assertEqual(len(self.browsing.search_by_rating(4.6)), 0)
+
+        with self.assertRaises(ValueError):
+            self.browsing.search_by_rating_range(4.5, 4.0)
+
+    def test_top_rated(self):
+        """
+        Test top-K queries with and without cuisine/location filters.
+        """
+        self.assertEqual([r['name'] for r in self.browsing.top_rated(2)], ["Sushi House", "Italian Bistro"])
+        results = self.browsing.top_rated(5, location="Downtown")
+        self.assertEqual([r['name'] for r in results], ["Italian Bistro", "Taco Town"])
+        results = self.browsing.top_rated(1, cuisine_type="Italian", location="Uptown")
+        self.assertEqual([r['name'] for r in results], ["Pizza Palace"])
+        with self.assertRaises(ValueError):
+            self.browsing.top_rated(0)
+
+    def test_facets_follow_mutations(self):
+        """
+        Test that the cuisine/location vocabularies drive validation and facets as rows change.
+        """
+        self.assertEqual(self.browsing.get_facets()["cuisine"],
+                         {"Italian": 2, "Japanese": 1, "Fast Food": 1, "Mexican": 1})
+        version = self.database.version
+
+        restaurant_id = self.database.add_restaurant({"name": "Pho Place", "cuisine": "Vietnamese",
+                                                      "location": "Suburb", "rating": 4.1,
+                                                      "price_range": "$", "delivery": False})
+        self.assertGreater(self.database.version, version)
+        self.assertEqual(len(self.browsing.search_by_filters(cuisine_type="vietnamese", location="Suburb")), 1)
+        self.assertEqual(self.database.location_vocabulary.count("suburb"), 1)
+
+        self.database.remove_restaurant(restaurant_id)
+        self.assertNotIn("Vietnamese", self.browsing.get_facets()["cuisine"])
+        with self.assertRaises(ValueError):
+            self.browsing.search_by_filters(location="Suburb")
+
+    def test_search_page_walks_all_results(self):
+        """
+        Test that following next_cursor visits every match exactly once, in sort order, for each sort key.
+        """
+        for i in range(30):
+            self.database.add_restaurant({"name": f"Diner {i:02d}", "cuisine": "American",
+                                          "location": "Downtown" if i % 3 else "Uptown",
+                                          "rating": 3.0 + (i % 7) / 5, "price_range": "$", "delivery": True})
+        for sort_by in ("rating", "name", "id"):
+            expected = sorted(self.browsing.search_by_filters(location="Downtown", min_rating=3.5),
+                              key=RestaurantBrowsing.SORT_KEYS[sort_by])
+            collected, cursor = [], None
+            while True:
+                page = self.browsing.search_page(limit=4, after=cursor, sort_by=sort_by,
+                                                 location="Downtown", min_rating=3.5)
+                self.assertLessEqual(len(page["results"]), 4)
+                collected.extend(page["results"])
+                cursor = page["next_cursor"]
+                if cursor is None:
+                    break
+            self.assertEqual(collected, expected)
+
+        rating_cursor = self.browsing.search_page(limit=1, sort_by="rating")["next_cursor"]
+        with self.assertRaises(ValueError):
+            self.browsing.search_page(limit=4, after=rating_cursor, sort_by="name")
+        with self.assertRaises(ValueError):
+            self.browsing.search_page(limit=0)
+
+    def test_tampered_cursors_are_rejected(self):
+        """
+        Test that a cursor whose key has the wrong shape or element types raises ValueError, not TypeError.
+        """
+        self.database.add_restaurant({"name": "Diner", "cuisine": "American", "location": "Downtown",
+                                      "rating": 4.0, "price_range": "$", "delivery": True})
+        for sort_by, key in (("rating", 5), ("rating", {"a": 1}), ("rating", ["x", 1]), ("rating", [-4.0]),
+                             ("name", [1, 1]), ("name", ["Diner", "1"]), ("id", [True]), ("id", [1, 2])):
+            payload = json.dumps([sort_by, key]).encode("utf-8")
+            cursor = base64.urlsafe_b64encode(payload).decode("ascii")
+            with self.assertRaises(ValueError):
+                self.browsing.search_page(limit=4, after=cursor, sort_by=sort_by)
+
+    def test_iter_search_is_lazy(self):
+        """
+        Test that iter_search returns an iterator over the same matches as search_by_filters.
+        """
+        results = self.browsing.iter_search(cuisine_type="Italian")
+        self.assertIs(iter(results), results)
+        self.assertCountEqual(list(results), self.browsing.search_by_cuisine("Italian"))
+
+    def test_geospatial_search(self):
+        """
+        Test nearest-restaurant and radius queries combined with the other filters.
+        """
+        results = self.browsing.search_nearby(40.7130, -74.0062, limit=2)
+        self.assertEqual([r['name'] for r in results], ["Taco Town", "Italian Bistro"])
+        self.assertLess(results[0]['distance_km'], results[1]['distance_km'])
+
+        results = self.browsing.search_nearby(40.7130, -74.0062, limit=1, cuisine_type="Italian", min_rating=4.0)
+        self.assertEqual([r['name'] for r in results], ["Italian Bistro"])
+        within = [r for r in self.browsing.search_nearby(40.7130, -74.0062) if r['distance_km'] <= 0.5]
+        self.assertEqual(self.browsing.search_nearby(40.7130, -74.0062, radius_km=0.5), within)
+
+        results = self.browsing.search_by_filters(cuisine_type="Italian", near=(40.785, -73.973), radius_km=2)
+        self.assertEqual([r['name'] for r in results], ["Pizza Palace"])
+        with self.assertRaises(ValueError):
+            self.browsing.search_by_filters(near=(40.785, -73.973))
+
+        pizza = results[0]
+        self.database.update_restaurant(pizza['id'], latitude=40.7076, longitude=-74.0112)
+        self.assertEqual(self.browsing.search_by_filters(cuisine_type="Italian", near=(40.785, -73.973),
+                                                         radius_km=2), [])
+        with self.assertRaises(ValueError):
+            self.database.update_restaurant(pizza['id'], latitude=123)
+        self.assertEqual(self.database.get_restaurant(pizza['id'])['latitude'], 40.7076)
+
+
+
+class TestRestaurantSearch(unittest.TestCase):
+    """
+    Unit tests for RestaurantSearch and its result cache.
+    """
+
+    def setUp(self):
+        """
+        Set up a RestaurantSearch with a cache driven by a fake clock.
+        """
+        self.now = 0.0
+        self.database = RestaurantDatabase()
+        self.cache = SearchResultCache(max_entries=2, ttl=10, clock=lambda: self.now)
+        self.search = RestaurantSearch(RestaurantBrowsing(self.database), cache=self.cache)
+
+    def test_repeated_queries_hit_cache(self):
+        """
+        Test that equivalent queries share one cache entry and changing results does not affect it.
+        """
+        first = self.search.search_restaurants(cuisine="Italian", location="Downtown", rating=4)
+        second = self.search.search_restaurants(cuisine="italian", location="DOWNTOWN", rating=4.0)
+        self.assertEqual(first, second)
+        self.assertEqual(self.cache.stats()["hits"], 1)
+        self.assertEqual(self.cache.stats()["misses"], 1)
+
+        first.clear()
+        second[0]['name'] = "Corrupted"
+        self.assertEqual(self.search.search_restaurants(cuisine="Italian", location="Downtown",
+                                                        rating=4)[0]['name'], "Italian Bistro")
+
+    def test_results_are_plain_independent_copies(self):
+        """
+        Test that nested fields are copied, so results serialize as JSON and edits reach neither cache nor row.
+        """
+        self.database.add_restaurant({"name": "Trattoria", "cuisine": "Italian", "location": "Midtown",
+                                      "rating": 4.3, "price_range": "$$", "delivery": True, "menu": ["Risotto"]})
+        search = lambda: self.search.search_restaurants(cuisine="Italian", location="Midtown")
+        result = search()
+        self.assertIsInstance(result[0], dict)
+        self.assertIn('"menu": ["Risotto"]', json.dumps(result))
+        result[0]["menu"].append("Ravioli")
+        self.assertEqual(search()[0]["menu"], ["Risotto"])
+        self.assertEqual(self.database.get_restaurant(result[0]["id"])["menu"], ["Risotto"])
+
+    def test_shared_cache_keeps_databases_apart(self):
+        """
+        Test that a cache shared by two databases at the same version never serves one's rows for the other.
+        """
+        other = RestaurantDatabase([{"name": "Pasta Place", "cuisine": "Italian", "location": "Harbor",
+                                     "rating": 4.1, "price_range": "$", "delivery": True}])
+        self.assertEqual(other.version, self.database.version)
+        other_search = RestaurantSearch(RestaurantBrowsing(other), cache=self.cache)
+        self.assertEqual(len(self.search.search_restaurants(cuisine="Italian")), 2)
+        self.assertEqual([row["name"] for row in other_search.search_restaurants(cuisine="Italian")],
+                         ["Pasta Place"])
+
+    def test_writes_invalidate_cache(self):
+        """
+        Test that a database mutation is visible to the very next search.
+        """
+        self.assertEqual(len(self.search.search_restaurants(cuisine="Italian")), 2)
+        self.database.add_restaurant({"name": "Trattoria", "cuisine": "Italian", "location": "Midtown",
+                                      "rating": 4.3, "price_range": "$$", "delivery": True})
+        self.assertEqual(len(self.search.search_restaurants(cuisine="Italian")), 3)
+        self.assertEqual(self.cache.stats()["invalidations"], 1)
+
+    def test_eviction_and_expiry(self):
+        """
+        Test that the cache respects its size bound and TTL.
+        """
+        for cuisine in ("Italian", "Japanese", "Mexican"):
+            self.search.search_restaurants(cuisine=cuisine)
+        self.assertEqual(len(self.cache), 2)
+        self.assertEqual(self.cache.stats()["evictions"], 1)
+
+        self.now = 11
+        self.search.search_restaurants(cuisine="Mexican")
+        self.assertEqual(self.cache.stats()["expirations"], 1)
+        self.assertEqual(self.cache.stats()["hits"], 0)
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
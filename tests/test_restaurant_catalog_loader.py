@@ -0,0 +1,155 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from Columnar_Restaurant_Database import ColumnarRestaurantDatabase
+from Restaurant_Browsing import RestaurantBrowsing, RestaurantDatabase
+from Restaurant_Catalog_Loader import load_catalog, read_catalog, validate_restaurant
+
+CSV_CATALOG = """name,cuisine,location,rating,price_range,delivery,latitude,longitude,menu
+Pho Saigon,Vietnamese,Midtown,4.6,$$,yes,40.75,-73.98,Pho Bo|Spring Rolls
+Curry Corner,Indian,Downtown,4.1,$,false,,,
+Bad Row,Thai,Uptown,7.5,$$,true,,,
+Kebab King,Turkish,Uptown,3.8,$,1,40.78,-73.97,
+"""
+
+
+class TestRestaurantCatalogLoader(unittest.TestCase):
+    """
+    Unit tests for streaming catalogs from CSV and JSON Lines files into a database.
+    """
+
+    def setUp(self):
+        """
+        Set up a temporary directory holding a CSV catalog with one invalid row.
+        """
+        self.directory = tempfile.mkdtemp()
+        self.csv_path = self.write("catalog.csv", CSV_CATALOG)
+
+    def tearDown(self):
+        """
+        Remove the temporary directory.
+        """
+        shutil.rmtree(self.directory)
+
+    def write(self, name, content):
+        """
+        Write a file into the temporary directory and return its path.
+        """
+        path = os.path.join(self.directory, name)
+        with open(path, "w", encoding="utf-8", newline="") as handle:
+            handle.write(content)
+        return path
+
+    def test_validate_restaurant_converts_fields(self):
+        """
+        Test that CSV strings become ratings, flags, coordinates and menus.
+        """
+        record = next(read_catalog(self.csv_path))[1]
+        restaurant = validate_restaurant(record)
+        self.assertEqual(restaurant["rating"], 4.6)
+        self.assertIs(restaurant["delivery"], True)
+        self.assertEqual((restaurant["latitude"], restaurant["longitude"]), (40.75, -73.98))
+        self.assertEqual(restaurant["menu"], ["Pho Bo", "Spring Rolls"])
+        for field, value in (("rating", "7.5"), ("price_range", "$$$$$"), ("delivery", "maybe"),
+                             ("name", " "), ("latitude", "95")):
+            with self.assertRaises(ValueError):
+                validate_restaurant(dict(record, **{field: value}))
+
+    def test_invalid_row_aborts_load(self):
+        """
+        Test that an invalid row reports its line and leaves the database untouched.
+        """
+        database = RestaurantDatabase()
+        with self.assertRaisesRegex(ValueError, "Line 4: Invalid rating"):
+            load_catalog(database, self.csv_path)
+        self.assertEqual(len(database.get_restaurants()), 5)
+        self.assertEqual(len(database.find(min_rating=0)), 5)
+
+    def test_skip_invalid_rows(self):
+        """
+        Test that skipped rows are counted and the rest are loaded and indexed.
+        """
+        database = RestaurantDatabase(restaurants=[])
+        report = load_catalog(database, self.csv_path, skip_invalid=True)
+        self.assertEqual((report["loaded"], report["skipped"]), (3, 1))
+        self.assertEqual(report["errors"], ["Line 4: Invalid rating: '7.5'"])
+        self.assertGreater(report["rows_per_second"], 0)
+        browsing = RestaurantBrowsing(database)
+        self.assertEqual([r["name"] for r in browsing.search_by_location("Uptown")], ["Kebab King"])
+        self.assertEqual(browsing.top_rated(1)[0]["name"], "Pho Saigon")
+        self.assertEqual(browsing.search_nearby(40.78, -73.97, limit=1)[0]["name"], "Kebab King")
+        self.assertEqual(browsing.search_by_name("spring rols")[0]["name"], "Pho Saigon")
+
+    def test_jsonl_catalog(self):
+        """
+        Test loading JSON Lines into both database backends.
+        """
+        lines = [json.dumps(restaurant) for restaurant in RestaurantDatabase().get_restaurants()]
+        path = self.write("catalog.jsonl", "\n".join(lines) + "\n\n")
+        for database in (RestaurantDatabase(restaurants=[]), ColumnarRestaurantDatabase()):
+            report = load_catalog(database, path)
+            self.assertEqual(report["loaded"], 5)
+            self.assertEqual([r["name"] for r in database.top_rated(2)], ["Sushi House", "Italian Bistro"])
+        with self.assertRaises(ValueError):
+            list(read_catalog(self.write("catalog.xml", "<catalog/>")))
+
+    def test_menus_must_be_lists_of_names(self):
+        """
+        Test that a menu of the wrong type is reported as an invalid row instead of breaking the load.
+        """
+        good = {"name": "Pho Saigon", "cuisine": "Vietnamese", "location": "Midtown", "rating": 4.6,
+                "price_range": "$$", "delivery": True, "menu": ["Pho Bo"]}
+        lines = [json.dumps(dict(good, menu=[1, 2])), json.dumps(dict(good, menu={"Pho": 1})), json.dumps(good)]
+        path = self.write("menus.jsonl", "\n".join(lines) + "\n")
+        database = RestaurantDatabase(restaurants=[])
+        report = load_catalog(database, path, skip_invalid=True)
+        self.assertEqual((report["loaded"], report["skipped"]), (1, 2))
+        self.assertEqual(report["errors"][0], "Line 1: Invalid menu: [1, 2]")
+        self.assertEqual(RestaurantBrowsing(database).search_by_name("pho bo")[0]["name"], "Pho Saigon")
+
+    def test_failed_bulk_load_rolls_back_indexes(self):
+        """
+        Test that a row the indexes cannot hold, or a failure while indexing, leaves the database as it was.
+        """
+        database = RestaurantDatabase()
+        before = (database.get_restaurants(), database.facets(), list(database._rating_ids))
+        row = dict(database.get_restaurants()[0], name="Extra", id=None)
+        with self.assertRaisesRegex(ValueError, "Invalid menu"):
+            database.bulk_load([row, dict(row, menu=[1, 2])])
+
+        def fail(rows):
+            raise MemoryError("out of memory")
+
+        database.text_index.add_many = fail
+        with self.assertRaises(MemoryError):
+            database.bulk_load([row])
+        self.assertEqual((database.get_restaurants(), database.facets(), list(database._rating_ids)), before)
+        fresh = RestaurantDatabase()
+        self.assertEqual(database.find(cuisine="Italian", min_rating=0), fresh.find(cuisine="Italian", min_rating=0))
+        self.assertEqual(database.text_index.autocomplete("ex"), [])
+        self.assertEqual(database.bulk_load([row]), 1)
+
+    def test_bulk_load_matches_per_row_inserts(self):
+        """
+        Test that bulk loading builds the same indexes as inserting row by row.
+        """
+        restaurants = RestaurantDatabase().get_restaurants() * 3
+        incremental = RestaurantDatabase(restaurants=[])
+        for restaurant in restaurants:
+            incremental.add_restaurant(restaurant)
+        bulk = RestaurantDatabase(restaurants=restaurants[:4])
+        self.assertEqual(bulk.bulk_load(restaurants[4:]), 11)
+        self.assertEqual(bulk.get_restaurants(), incremental.get_restaurants())
+        self.assertEqual(list(bulk._rating_ids), list(incremental._rating_ids))
+        self.assertEqual(bulk.cuisine_index, incremental.cuisine_index)
+        self.assertEqual(bulk.facets(), incremental.facets())
+        self.assertEqual(bulk.find(cuisine="Italian", min_rating=4.0),
+                         incremental.find(cuisine="Italian", min_rating=4.0))
+        self.assertEqual(bulk.text_index.autocomplete("ta"), incremental.text_index.autocomplete("ta"))
+
+
+if __name__ == "__main__":
+    unittest.main()
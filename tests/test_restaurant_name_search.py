@@ -0,0 +1,165 @@
+import unittest
+from unittest import mock
+
+import Restaurant_Name_Search
+from Restaurant_Browsing import RestaurantBrowsing, RestaurantDatabase
+from Columnar_Restaurant_Database import ColumnarRestaurantDatabase
+from Restaurant_Name_Search import RestaurantTextIndex, normalize_text
+
+
+class TestRestaurantTextIndex(unittest.TestCase):
+    """
+    Unit tests for the trigram fuzzy search and prefix autocomplete index.
+    """
+
+    def setUp(self):
+        """
+        Set up an index with a few restaurants and menus.
+        """
+        self.index = RestaurantTextIndex()
+        self.index.add(0, "Pizza Palace", ["Margherita Pizza", "Garlic Bread"])
+        self.index.add(1, "Pizzeria Napoli", ["Calzone"])
+        self.index.add(2, "Sushi House", ["Salmon Nigiri", "California Roll"])
+        self.index.add(3, "Joe's Burger Palace", ["Cheeseburger"])
+
+    def test_normalize_text(self):
+        """
+        Test that case and punctuation are ignored.
+        """
+        self.assertEqual(normalize_text("  Joe's   PIZZA! "), "joe s pizza")
+
+    def test_search_tolerates_typos(self):
+        """
+        Test that misspelled queries still rank the intended restaurant first.
+        """
+        self.assertEqual(self.index.search("piza palce")[0][1], 0)
+        self.assertEqual(self.index.search("suhsi house")[0][1], 2)
+        self.assertEqual(self.index.search("Pizza Palace")[0][:3], (1.0, 0, "name"))
+
+    def test_search_without_numpy(self):
+        """
+        Test that the Counter fallback ranks exactly like the NumPy path.
+        """
+        queries = ["piza palce", "palace", "californa roll", "burger"]
+        expected = [self.index.search(query) for query in queries]
+        with mock.patch.object(Restaurant_Name_Search, "np", None):
+            self.assertEqual([self.index.search(query) for query in queries], expected)
+
+    def test_search_matches_menu_items(self):
+        """
+        Test that menu items are searchable and reported as such.
+        """
+        score, restaurant_id, field, text = self.index.search("californa roll")[0]
+        self.assertEqual((restaurant_id, field, text), (2, "menu", "California Roll"))
+        self.assertGreater(score, 0.3)
+
+    def test_search_limits_and_thresholds(self):
+        """
+        Test the result limit, the similarity threshold and invalid thresholds.
+        """
+        self.assertEqual(len(self.index.search("palace", limit=1)), 1)
+        self.assertEqual(self.index.search("xyzzy"), [])
+        self.assertEqual(self.index.search(""), [])
+        with self.assertRaises(ValueError):
+            self.index.search("pizza", min_similarity=0)
+
+    def test_autocomplete(self):
+        """
+        Test whole-name matches ranking ahead of later-word matches.
+        """
+        self.assertEqual(self.index.autocomplete("piz"), [0, 1])
+        self.assertEqual(self.index.autocomplete("pal"), [0, 3])
+        self.assertEqual(self.index.autocomplete("JOE'S B"), [3])
+        self.assertEqual(self.index.autocomplete("piz", limit=1), [0])
+        self.assertEqual(self.index.autocomplete("zzz"), [])
+
+    def test_incremental_updates(self):
+        """
+        Test that removed and renamed restaurants leave no stale entries.
+        """
+        self.index.remove(0)
+        self.assertEqual(self.index.autocomplete("piz"), [1])
+        self.assertNotIn(0, [match[1] for match in self.index.search("garlic bread")])
+        self.index.add(1, "Taco Town")
+        self.assertEqual(self.index.autocomplete("piz"), [])
+        self.assertEqual(self.index.autocomplete("tac"), [1])
+        self.assertEqual(len(self.index), 3)
+
+    def test_compaction_purges_removed_entries(self):
+        """
+        Test that churn compacts the postings and leaves search results intact.
+        """
+        for restaurant_id in range(10, 1500):
+            self.index.add(restaurant_id, f"Noodle Bar {restaurant_id}")
+        indexed = sum(len(posting) for posting in self.index._postings.values())
+        for restaurant_id in range(10, 1500):
+            self.index.remove(restaurant_id)
+        self.assertLess(sum(len(posting) for posting in self.index._postings.values()), indexed / 2)
+        self.assertEqual(self.index.search("noodle bar"), [])
+        self.assertEqual(self.index.search("sushi house")[0][1], 2)
+
+    def test_renames_do_not_grow_the_index(self):
+        """
+        Test that compaction renumbers entries, so repeatedly renaming a restaurant keeps the index bounded.
+        """
+        for generation in range(5000):
+            self.index.add(1, f"Pizzeria Napoli {generation}", ["Calzone"])
+        self.assertLessEqual(len(self.index._gram_counts), 2 * max(1024, len(self.index._entries)) + 2)
+        self.assertEqual(self.index.search("pizzeria napoli 4999")[0][1:], (1, "name", "Pizzeria Napoli 4999"))
+        self.assertEqual(self.index.search("california roll")[0][1:], (2, "menu", "California Roll"))
+        self.assertEqual(self.index.autocomplete("cal"), [])
+
+
+class TestNameSearchBrowsing(unittest.TestCase):
+    """
+    Integration tests for name search through RestaurantBrowsing on both database backends.
+    """
+
+    def test_search_by_name_and_autocomplete(self):
+        """
+        Test fuzzy search and autocomplete, including after updates, on both backends.
+        """
+        for database in (RestaurantDatabase(), ColumnarRestaurantDatabase(RestaurantDatabase().get_restaurants())):
+            browsing = RestaurantBrowsing(database)
+            results = browsing.search_by_name("itallian bistro")
+            self.assertEqual(results[0]["name"], "Italian Bistro")
+            self.assertEqual(results[0]["matched_text"], "Italian Bistro")
+            self.assertEqual([r["name"] for r in browsing.autocomplete("t")], ["Taco Town"])
+
+            database.update_restaurant(3, name="Burrito Barn", menu=["Carnitas Burrito"])
+            self.assertEqual(browsing.autocomplete("ta"), [])
+            self.assertEqual([r["name"] for r in browsing.autocomplete("b")],
+                             ["Burger King", "Burrito Barn", "Italian Bistro"])
+            self.assertEqual(browsing.search_by_name("carnitas")[0]["id"], 3)
+            database.remove_restaurant(3)
+            self.assertEqual([r["name"] for r in browsing.autocomplete("bur")], ["Burger King"])
+
+    def test_rating_updates_leave_the_text_and_geo_indexes_alone(self):
+        """
+        Test that an update that does not touch the name, menu or coordinates does not re-index them.
+        """
+        database = RestaurantDatabase()
+        with mock.patch.object(database.text_index, "add") as add, \
+                mock.patch.object(database.geo_index, "insert") as insert:
+            database.update_restaurant(0, rating=4.9, name="Italian Bistro")
+        add.assert_not_called()
+        insert.assert_not_called()
+        self.assertEqual(RestaurantBrowsing(database).top_rated(1)[0]["name"], "Italian Bistro")
+        database.update_restaurant(0, latitude=40.7831, longitude=-73.9712)
+        self.assertEqual({r["name"] for r in RestaurantBrowsing(database).search_nearby(40.7831, -73.9712, limit=2)},
+                         {"Italian Bistro", "Pizza Palace"})
+
+    def test_invalid_arguments(self):
+        """
+        Test that empty queries and invalid limits are rejected.
+        """
+        browsing = RestaurantBrowsing(RestaurantDatabase())
+        with self.assertRaises(ValueError):
+            browsing.search_by_name("")
+        with self.assertRaises(ValueError):
+            browsing.autocomplete("pi", limit=0)
+        self.assertEqual(browsing.autocomplete(""), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from Restaurant_Browsing import RestaurantBrowsing, RestaurantDatabase
+from Restaurant_Snapshot import SnapshotRestaurantDatabase, write_snapshot
+
+
+class TestRestaurantSnapshot(unittest.TestCase):
+    """
+    Unit tests checking that a memory-mapped snapshot answers queries like the database it was written from.
+    """
+
+    def setUp(self):
+        """
+        Set up a database with a deleted row and a menu, and map a snapshot of it.
+        """
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "restaurants.snap")
+        self.database = RestaurantDatabase()
+        self.database.remove_restaurant(2)
+        self.database.add_restaurant({"name": "Ramen Bar", "cuisine": "japanese", "location": "Downtown",
+                                      "rating": 4.5, "price_range": "$$", "delivery": True,
+                                      "menu": ["Tonkotsu Ramen"]})
+        self.assertEqual(write_snapshot(self.database, self.path), 5)
+        self.snapshot = SnapshotRestaurantDatabase(self.path)
+
+    def tearDown(self):
+        """
+        Unmap the snapshot and remove the temporary directory.
+        """
+        self.snapshot.close()
+        shutil.rmtree(self.directory)
+
+    def test_rows_round_trip(self):
+        """
+        Test that every row, including extra fields and missing coordinates, decodes unchanged.
+        """
+        self.assertEqual(self.snapshot.get_restaurants(), self.database.get_restaurants())
+        self.assertEqual(self.snapshot.get_restaurant(5)["menu"], ["Tonkotsu Ramen"])
+        self.assertNotIn("latitude", self.snapshot.get_restaurant(5))
+        with self.assertRaises(KeyError):
+            self.snapshot.get_restaurant(2)
+        self.assertEqual(len(self.snapshot), 5)
+        self.assertEqual(self.snapshot.version, self.database.version)
+
+    def test_queries_match_database(self):
+        """
+        Test filters, rating ranges, top-k and facets against the source database.
+        """
+        for filters in ({"cuisine": "Japanese"}, {"cuisine": "italian", "min_rating": 4.0},
+                        {"location": "Downtown", "max_rating": 4.4}, {"min_rating": 4.2, "max_rating": 4.6},
+                        {"cuisine": "Korean"}, {"near": (40.71, -74.0), "radius_km": 2}):
+            self.assertEqual(self.snapshot.find(**filters), self.database.find(**filters))
+        for filters in ({}, {"location": "Downtown"}, {"cuisine": "Japanese"}):
+            self.assertEqual(self.snapshot.top_rated(2, **filters), self.database.top_rated(2, **filters))
+        self.assertEqual(self.snapshot.count_by_rating(4.0, 4.5), self.database.count_by_rating(4.0, 4.5))
+        self.assertEqual(self.snapshot.facets(), self.database.facets())
+
+    def test_browsing_over_snapshot(self):
+        """
+        Test that RestaurantBrowsing works unchanged on a snapshot, including lazily built indexes.
+        """
+        expected, browsing = RestaurantBrowsing(self.database), RestaurantBrowsing(self.snapshot)
+        first = browsing.search_page(limit=2)
+        self.assertEqual(first, expected.search_page(limit=2))
+        self.assertEqual(browsing.search_page(limit=2, after=first["next_cursor"]),
+                         expected.search_page(limit=2, after=first["next_cursor"]))
+        self.assertEqual(browsing.search_by_filters(cuisine_type="Japanese", min_rating=4.6),
+                         expected.search_by_filters(cuisine_type="Japanese", min_rating=4.6))
+        self.assertEqual(browsing.search_nearby(40.75, -73.98, limit=2),
+                         expected.search_nearby(40.75, -73.98, limit=2))
+        self.assertEqual(browsing.search_by_name("tonkotsu")[0]["name"], "Ramen Bar")
+        with self.assertRaises(ValueError):
+            browsing.search_by_filters(cuisine_type="Korean")
+
+    def test_rejects_other_files(self):
+        """
+        Test that a file without the snapshot header is refused.
+        """
+        path = os.path.join(self.directory, "not_a_snapshot")
+        with open(path, "wb") as handle:
+            handle.write(b"x" * 64)
+        with self.assertRaises(ValueError):
+            SnapshotRestaurantDatabase(path)
+
+
+if __name__ == "__main__":
+    unittest.main()